@@ -6,6 +6,8 @@ from schlange.schlange import (
     DEFAULT_SCHEDULE_DATABASE_PATH,
     DEFAULT_TASK_DATABASE_PATH,
     DEFAULT_VISIBILITY_TIMEOUT,
+    MessagingBackend,
+    NewTask,
     Schlange,
     new,
 )
@@ -31,6 +33,8 @@ __all__ = [
     "DEFAULT_TASK_DATABASE_PATH",
     "DEFAULT_VISIBILITY_TIMEOUT",
     "DTO",
+    "MessagingBackend",
+    "NewTask",
     "RetryPolicy",
     "Schedule",
     "ScheduleFiring",
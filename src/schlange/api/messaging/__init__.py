@@ -1,21 +1,51 @@
 from .ack_message_request import AckMessageRequest
+from .ack_messages_request import AckMessagesRequest
+from .ack_messages_response import AckMessagesResponse
+from .change_message_visibility_request import ChangeMessageVisibilityRequest
 from .claim_message_request import ClaimMessageRequest
 from .claim_message_response import ClaimMessageResponse
+from .claim_messages_request import ClaimMessagesRequest
+from .claim_messages_response import ClaimMessagesResponse
 from .declare_queue_request import DeclareQueueRequest
+from .get_queue_stats_request import GetQueueStatsRequest
+from .get_queue_stats_response import GetQueueStatsResponse
 from .message import Message
 from .publish_message_request import PublishMessageRequest
 from .publish_message_response import PublishMessageResponse
+from .publish_messages_request import PublishMessagesRequest
+from .publish_messages_response import PublishMessagesResponse
+from .purge_queue_request import PurgeQueueRequest
+from .purge_queue_response import PurgeQueueResponse
+from .redrive_messages_request import RedriveMessagesRequest
+from .redrive_messages_response import RedriveMessagesResponse
 from .requeue_message_request import RequeueMessageRequest
+from .requeue_messages_request import RequeueMessagesRequest
+from .requeue_messages_response import RequeueMessagesResponse
 from .server import Server
 
 __all__ = [
     "AckMessageRequest",
+    "AckMessagesRequest",
+    "AckMessagesResponse",
+    "ChangeMessageVisibilityRequest",
     "ClaimMessageRequest",
     "ClaimMessageResponse",
+    "ClaimMessagesRequest",
+    "ClaimMessagesResponse",
     "DeclareQueueRequest",
+    "GetQueueStatsRequest",
+    "GetQueueStatsResponse",
     "Message",
     "PublishMessageRequest",
     "PublishMessageResponse",
+    "PublishMessagesRequest",
+    "PublishMessagesResponse",
+    "PurgeQueueRequest",
+    "PurgeQueueResponse",
+    "RedriveMessagesRequest",
+    "RedriveMessagesResponse",
     "RequeueMessageRequest",
+    "RequeueMessagesRequest",
+    "RequeueMessagesResponse",
     "Server",
 ]
@@ -0,0 +1,9 @@
+import dataclasses
+from typing import List
+
+from .ack_message_request import AckMessageRequest
+
+
+@dataclasses.dataclass
+class AckMessagesRequest:
+    requests: List[AckMessageRequest]
@@ -0,0 +1,9 @@
+import dataclasses
+from typing import List
+
+
+@dataclasses.dataclass
+class AckMessagesResponse:
+    """``acked[i]`` is False when request ``i`` hit a version conflict."""
+
+    acked: List[bool]
@@ -0,0 +1,8 @@
+import dataclasses
+
+
+@dataclasses.dataclass
+class ChangeMessageVisibilityRequest:
+    message_id: str
+    version: int
+    visibility_timeout: float
@@ -4,3 +4,4 @@ import dataclasses
 @dataclasses.dataclass
 class ClaimMessageRequest:
     queue: str
+    wait_time: float = 0.0
@@ -0,0 +1,8 @@
+import dataclasses
+
+
+@dataclasses.dataclass
+class ClaimMessagesRequest:
+    queue: str
+    max_count: int
+    wait_time: float = 0.0
@@ -0,0 +1,9 @@
+import dataclasses
+from typing import List
+
+from .message import Message
+
+
+@dataclasses.dataclass
+class ClaimMessagesResponse:
+    messages: List[Message]
@@ -0,0 +1,6 @@
+import dataclasses
+
+
+@dataclasses.dataclass
+class GetQueueStatsRequest:
+    queue: str
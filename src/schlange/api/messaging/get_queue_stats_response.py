@@ -0,0 +1,13 @@
+import dataclasses
+
+
+@dataclasses.dataclass
+class GetQueueStatsResponse:
+    visible: int
+    in_flight: int
+    delayed: int
+    published: int
+    acked: int
+    requeued: int
+    dead_lettered: int
+    expired: int
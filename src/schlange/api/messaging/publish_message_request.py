@@ -1,4 +1,5 @@
 import dataclasses
+import datetime
 
 
 @dataclasses.dataclass
@@ -6,3 +7,12 @@ class PublishMessageRequest:
     queue: str
     payload: bytes
     visibility_timeout: float
+    delay: float = 0.0
+    # Higher priorities are claimed first; equal ones in publish order.
+    priority: int = 0
+    # A message with a group_id is claimable only once every message
+    # published to its group before it has been acked or dead-lettered.
+    group_id: str | None = None
+    # An expired message is never claimed and is deleted by a
+    # background sweep, claimed or not.
+    expires_at: datetime.datetime | None = None
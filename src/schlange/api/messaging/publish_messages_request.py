@@ -0,0 +1,9 @@
+import dataclasses
+from typing import List
+
+from .publish_message_request import PublishMessageRequest
+
+
+@dataclasses.dataclass
+class PublishMessagesRequest:
+    requests: List[PublishMessageRequest]
@@ -0,0 +1,7 @@
+import dataclasses
+from typing import List
+
+
+@dataclasses.dataclass
+class PublishMessagesResponse:
+    message_ids: List[str]
@@ -0,0 +1,13 @@
+import dataclasses
+from typing import Optional
+
+
+@dataclasses.dataclass
+class PurgeQueueRequest:
+    """
+    Deletes the queue's messages published more than ``older_than``
+    seconds ago, or all of them if None, in flight or not.
+    """
+
+    queue: str
+    older_than: Optional[float] = None
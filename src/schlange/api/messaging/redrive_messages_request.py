@@ -0,0 +1,14 @@
+import dataclasses
+from typing import Optional
+
+
+@dataclasses.dataclass
+class RedriveMessagesRequest:
+    """
+    Moves up to ``limit`` (all if None) visible messages out of a
+    dead-letter queue.
+    """
+
+    dead_letter_queue: str
+    target_queue: str
+    limit: Optional[int] = None
@@ -0,0 +1,6 @@
+import dataclasses
+
+
+@dataclasses.dataclass
+class RedriveMessagesResponse:
+    redriven: int
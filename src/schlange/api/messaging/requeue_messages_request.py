@@ -0,0 +1,9 @@
+import dataclasses
+from typing import List
+
+from .requeue_message_request import RequeueMessageRequest
+
+
+@dataclasses.dataclass
+class RequeueMessagesRequest:
+    requests: List[RequeueMessageRequest]
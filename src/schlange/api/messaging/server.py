@@ -1,20 +1,39 @@
 from typing import Protocol
 
 from .ack_message_request import AckMessageRequest
+from .ack_messages_request import AckMessagesRequest
+from .ack_messages_response import AckMessagesResponse
+from .change_message_visibility_request import ChangeMessageVisibilityRequest
 from .claim_message_request import ClaimMessageRequest
 from .claim_message_response import ClaimMessageResponse
+from .claim_messages_request import ClaimMessagesRequest
+from .claim_messages_response import ClaimMessagesResponse
 from .declare_queue_request import DeclareQueueRequest
+from .get_queue_stats_request import GetQueueStatsRequest
+from .get_queue_stats_response import GetQueueStatsResponse
 from .publish_message_request import PublishMessageRequest
 from .publish_message_response import PublishMessageResponse
+from .publish_messages_request import PublishMessagesRequest
+from .publish_messages_response import PublishMessagesResponse
+from .purge_queue_request import PurgeQueueRequest
+from .purge_queue_response import PurgeQueueResponse
+from .redrive_messages_request import RedriveMessagesRequest
+from .redrive_messages_response import RedriveMessagesResponse
 from .requeue_message_request import RequeueMessageRequest
+from .requeue_messages_request import RequeueMessagesRequest
+from .requeue_messages_response import RequeueMessagesResponse
 
 
 class Server(Protocol):
     """
     Public messaging API, gRPC-style: each method takes a single
     request dataclass and returns a single response dataclass
-    (``ack_message``, ``requeue_message`` and ``declare_queue`` are
-    fire-and-forget).
+    (``ack_message``, ``requeue_message``, ``change_message_visibility``
+    and ``declare_queue`` are fire-and-forget). Batch variants settle
+    all their messages in one transaction and report version conflicts
+    per item. Bulk operations (``redrive_messages``, ``purge_queue``)
+    instead run one transaction per bounded chunk, so they never hold
+    the write lock for long.
     """
 
     def declare_queue(self, request: DeclareQueueRequest) -> None: ...
@@ -23,8 +42,39 @@ class Server(Protocol):
         self, request: PublishMessageRequest
     ) -> PublishMessageResponse: ...
 
+    def publish_messages(
+        self, request: PublishMessagesRequest
+    ) -> PublishMessagesResponse: ...
+
     def claim_message(self, request: ClaimMessageRequest) -> ClaimMessageResponse: ...
 
+    def claim_messages(
+        self, request: ClaimMessagesRequest
+    ) -> ClaimMessagesResponse: ...
+
     def ack_message(self, request: AckMessageRequest) -> None: ...
 
+    def ack_messages(self, request: AckMessagesRequest) -> AckMessagesResponse: ...
+
     def requeue_message(self, request: RequeueMessageRequest) -> None: ...
+
+    def requeue_messages(
+        self, request: RequeueMessagesRequest
+    ) -> RequeueMessagesResponse: ...
+
+    def change_message_visibility(
+        self, request: ChangeMessageVisibilityRequest
+    ) -> None: ...
+
+    def get_queue_stats(self, request: GetQueueStatsRequest) -> GetQueueStatsResponse:
+        """
+        Returns the queue's depth by state and its cumulative counters
+        without counting the visible backlog.
+        """
+        ...
+
+    def redrive_messages(
+        self, request: RedriveMessagesRequest
+    ) -> RedriveMessagesResponse: ...
+
+    def purge_queue(self, request: PurgeQueueRequest) -> PurgeQueueResponse: ...
@@ -1,5 +1,7 @@
 from .create_task_request import CreateTaskRequest
 from .create_task_response import CreateTaskResponse
+from .create_tasks_request import CreateTasksRequest
+from .create_tasks_response import CreateTasksResponse
 from .delete_task_request import DeleteTaskRequest
 from .end_execution_request import EndExecutionRequest
 from .errors import (
@@ -9,6 +11,8 @@ from .errors import (
     FailedPreconditionError,
     NotFoundError,
 )
+from .get_execution_request import GetExecutionRequest
+from .get_execution_response import GetExecutionResponse
 from .get_task_request import GetTaskRequest
 from .get_task_response import GetTaskResponse
 from .list_tasks_request import ListTasksRequest
@@ -25,10 +29,14 @@ __all__ = [
     "ConflictError",
     "CreateTaskRequest",
     "CreateTaskResponse",
+    "CreateTasksRequest",
+    "CreateTasksResponse",
     "DeleteTaskRequest",
     "EndExecutionRequest",
     "Error",
     "FailedPreconditionError",
+    "GetExecutionRequest",
+    "GetExecutionResponse",
     "GetTaskRequest",
     "GetTaskResponse",
     "ListTasksRequest",
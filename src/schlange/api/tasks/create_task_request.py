@@ -13,3 +13,8 @@ class CreateTaskRequest:
     visibility_timeout: float
     id: Optional[str] = None
     schedule_id: Optional[str] = None
+    # Higher priorities are dispatched and claimed first.
+    priority: int = 0
+    # Tasks of a group execute one at a time, in dispatch order. A
+    # failed execution retries behind the executions dispatched since.
+    group_id: Optional[str] = None
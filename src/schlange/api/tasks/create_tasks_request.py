@@ -0,0 +1,9 @@
+import dataclasses
+from typing import List
+
+from .create_task_request import CreateTaskRequest
+
+
+@dataclasses.dataclass
+class CreateTasksRequest:
+    requests: List[CreateTaskRequest]
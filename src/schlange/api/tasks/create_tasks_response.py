@@ -0,0 +1,11 @@
+import dataclasses
+from typing import List, Optional
+
+from .task import Task
+
+
+@dataclasses.dataclass
+class CreateTasksResponse:
+    """``tasks[i]`` is None when request ``i`` named an existing task's id."""
+
+    tasks: List[Optional[Task]]
@@ -0,0 +1,7 @@
+import dataclasses
+
+
+@dataclasses.dataclass
+class GetExecutionRequest:
+    task_id: str
+    seq_num: int
@@ -0,0 +1,8 @@
+import dataclasses
+from typing import Any, Dict
+
+
+@dataclasses.dataclass
+class GetExecutionResponse:
+    args: Dict[str, Any]
+    ended: bool
@@ -2,8 +2,12 @@ from typing import Protocol
 
 from .create_task_request import CreateTaskRequest
 from .create_task_response import CreateTaskResponse
+from .create_tasks_request import CreateTasksRequest
+from .create_tasks_response import CreateTasksResponse
 from .delete_task_request import DeleteTaskRequest
 from .end_execution_request import EndExecutionRequest
+from .get_execution_request import GetExecutionRequest
+from .get_execution_response import GetExecutionResponse
 from .get_task_request import GetTaskRequest
 from .get_task_response import GetTaskResponse
 from .list_tasks_request import ListTasksRequest
@@ -17,10 +21,14 @@ class Server(Protocol):
     Public tasks API, gRPC-style: each method takes a single
     request dataclass and returns a single response dataclass
     (`delete_task` and `end_execution` are void-return).
+    `create_tasks` creates its tasks in one transaction and reports
+    existing ids per item instead of raising.
     """
 
     def create_task(self, request: CreateTaskRequest) -> CreateTaskResponse: ...
 
+    def create_tasks(self, request: CreateTasksRequest) -> CreateTasksResponse: ...
+
     def get_task(self, request: GetTaskRequest) -> GetTaskResponse: ...
 
     def list_tasks(self, request: ListTasksRequest) -> ListTasksResponse: ...
@@ -31,4 +39,6 @@ class Server(Protocol):
         self, request: ReactivateTaskRequest
     ) -> ReactivateTaskResponse: ...
 
+    def get_execution(self, request: GetExecutionRequest) -> GetExecutionResponse: ...
+
     def end_execution(self, request: EndExecutionRequest) -> None: ...
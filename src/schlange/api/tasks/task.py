@@ -1,5 +1,5 @@
 import dataclasses
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 from .task_state import TaskState
 
@@ -11,3 +11,5 @@ class Task:
     args: Dict[str, Any]
     state: TaskState
     visibility_timeout: float
+    priority: int = 0
+    group_id: Optional[str] = None
@@ -5,7 +5,9 @@ import time
 import schlange
 
 from .bench_command import BenchCommand
+from .bench_dispatch_command import BenchDispatchCommand
 from .bench_messaging_command import BenchMessagingCommand
+from .queue_command import QueueCommand
 from .schedule_command import ScheduleCommand
 from .stress_command import StressCommand
 from .task_command import TaskCommand
@@ -33,7 +35,9 @@ class App:
         for command in [
             TaskCommand,
             ScheduleCommand,
+            QueueCommand,
             BenchCommand,
+            BenchDispatchCommand,
             BenchMessagingCommand,
             StressCommand,
         ]:
@@ -47,8 +51,12 @@ class App:
                 TaskCommand.run(self.args)
             case "schedule":
                 ScheduleCommand.run(self.args)
+            case "queue":
+                QueueCommand.run(self.args)
             case "bench":
                 BenchCommand.run(self.args)
+            case "bench-dispatch":
+                BenchDispatchCommand.run(self.args)
             case "bench-messaging":
                 BenchMessagingCommand.run(self.args)
             case "stress":
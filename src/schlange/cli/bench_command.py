@@ -19,6 +19,13 @@ class BenchCommand(Command):
         bench_parser.add_argument(
             "-t", "--tasks", type=int, default=5000, help="number of tasks to create"
         )
+        bench_parser.add_argument(
+            "-b",
+            "--batch-size",
+            type=int,
+            default=1,
+            help="tasks created per transaction; above 1 uses create_tasks",
+        )
         bench_parser.add_argument(
             "-w",
             "--workers",
@@ -26,6 +33,25 @@ class BenchCommand(Command):
             default=4,
             help="number of concurrent consumers per kind",
         )
+        bench_parser.add_argument(
+            "--messaging-backend",
+            type=schlange.MessagingBackend,
+            choices=list(schlange.MessagingBackend),
+            default=schlange.MessagingBackend.SQLITE,
+            help="broker storage; memory gives a zero-I/O baseline",
+        )
+        bench_parser.add_argument(
+            "--messaging-shards",
+            type=int,
+            default=1,
+            help="number of SQLite files the messaging queues are spread over",
+        )
+        bench_parser.add_argument(
+            "--group-commit-window",
+            type=float,
+            default=None,
+            help="seconds durable writes wait to commit together",
+        )
 
     @staticmethod
     def run(args: argparse.Namespace) -> None:
@@ -45,10 +71,18 @@ class BenchCommand(Command):
             schedule_database_path=args.schedule_database_path,
             handlers={"bench": handle_bench},
             consumers_per_kind=args.workers,
+            messaging_backend=args.messaging_backend,
+            messaging_shards=args.messaging_shards,
+            group_commit_window=args.group_commit_window,
         ) as sch:
             started_creating_tasks_at = time.time()
-            for i in range(args.tasks):
-                sch.create_task(args={}, kind="bench", delay=0)
+            if args.batch_size > 1:
+                for i in range(0, args.tasks, args.batch_size):
+                    count = min(args.batch_size, args.tasks - i)
+                    sch.create_tasks([schlange.NewTask(args={}, kind="bench")] * count)
+            else:
+                for i in range(args.tasks):
+                    sch.create_task(args={}, kind="bench", delay=0)
             finished_creating_tasks_at = time.time()
             creating_tasks_took = finished_creating_tasks_at - started_creating_tasks_at
 
@@ -59,7 +93,7 @@ class BenchCommand(Command):
             handling_tasks_took = finished_handling_tasks_at - started_handling_tasks_at
 
         print(
-            f"creating {args.tasks} tasks using 1 workers took {creating_tasks_took:.2f} seconds, rate is {args.tasks/creating_tasks_took:.2f} tasks per second"
+            f"creating {args.tasks} tasks in batches of {args.batch_size} took {creating_tasks_took:.2f} seconds, rate is {args.tasks/creating_tasks_took:.2f} tasks per second"
         )
         print(
             f"handling {args.tasks} tasks using {args.workers} consumers took {handling_tasks_took:.2f} seconds, rate is {args.tasks/handling_tasks_took:.2f} tasks per second"
@@ -0,0 +1,84 @@
+import argparse
+import pathlib
+import tempfile
+import time
+
+import schlange
+from schlange.schlange import DEFAULT_DISPATCHER_BATCH_SIZE
+from schlange.services.tasks import core as tasks_core
+
+from .command import Command
+from .subparsers import Subparsers
+
+KIND = "bench"
+
+
+class BenchDispatchCommand(Command):
+    """
+    Times dispatching a backlog of ready tasks, once with the per-task
+    loop (a read, a publish and an update per task) and once in batches
+    as the Dispatcher does. Each run uses fresh databases.
+    """
+
+    @staticmethod
+    def register(subparsers: Subparsers) -> None:
+        parser = subparsers.add_parser(
+            "bench-dispatch",
+            formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+        )
+        parser.add_argument(
+            "-t",
+            "--tasks",
+            type=int,
+            default=10000,
+            help="number of ready tasks to dispatch",
+        )
+        parser.add_argument(
+            "-b",
+            "--batch-size",
+            type=int,
+            default=DEFAULT_DISPATCHER_BATCH_SIZE,
+            help="number of tasks begun per transaction in the batched run",
+        )
+
+    @staticmethod
+    def run(args: argparse.Namespace) -> None:
+        for name, dispatch in [
+            ("per-task", _dispatch_per_task),
+            (f"batched (batch size {args.batch_size})", _dispatch_batched),
+        ]:
+            with tempfile.TemporaryDirectory(dir=".") as dir:
+                took = _run(pathlib.Path(dir), args, dispatch)
+            print(
+                f"dispatching {args.tasks} tasks {name} took {took:.2f} seconds,"
+                f" rate is {args.tasks / took:.2f} tasks per second"
+            )
+
+
+def _run(dir: pathlib.Path, args: argparse.Namespace, dispatch) -> float:
+    # Consumers are never started; the handler sizes the write pools.
+    with schlange.new(
+        handlers={KIND: lambda execution: None},
+        task_database_path=dir / "tasks.db",
+        schedule_database_path=dir / "schedules.db",
+        lease_database_path=dir / "leases.db",
+        messaging_database_path=dir / "messaging.db",
+    ) as sch:
+        sch.create_tasks([schlange.NewTask(args={}, kind=KIND)] * args.tasks)
+        t0 = time.time()
+        dispatch(sch.task_service, args.batch_size)
+        return time.time() - t0
+
+
+def _dispatch_per_task(service: tasks_core.TaskService, batch_size: int) -> None:
+    for task in service.executable_tasks():
+        service.begin_execution(task.id)
+
+
+def _dispatch_batched(service: tasks_core.TaskService, batch_size: int) -> None:
+    while True:
+        tasks = service.executable_tasks(limit=batch_size)
+        if tasks:
+            service.begin_executions(tasks)
+        if len(tasks) < batch_size:
+            return
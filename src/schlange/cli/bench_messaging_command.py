@@ -1,20 +1,22 @@
 import argparse
 import datetime
 import pathlib
+import sqlite3
+import statistics
 import tempfile
 import threading
 import time
 import uuid
 
-from schlange.internal import sqlite
+from schlange.schlange import MessagingBackend, open_messaging_store
 from schlange.services.messaging import core
-from schlange.services.messaging.sqlite import migrations as messaging_migrations
-from schlange.services.messaging.sqlite.store import Store
 
 from .command import Command
 from .subparsers import Subparsers
 
 QUEUE = "bench"
+PREFILL_QUEUE = "bench.prefill"
+PREFILL_BATCH_SIZE = 10000
 
 
 class BenchMessagingCommand(Command):
@@ -39,6 +41,13 @@ class BenchMessagingCommand(Command):
             default=4,
             help="number of competing consumer threads",
         )
+        parser.add_argument(
+            "-b",
+            "--batch-size",
+            type=int,
+            default=1,
+            help="number of messages published and claimed per transaction",
+        )
         parser.add_argument(
             "--payload-size",
             type=int,
@@ -51,6 +60,31 @@ class BenchMessagingCommand(Command):
             default=300.0,
             help="visibility timeout in seconds",
         )
+        parser.add_argument(
+            "--backend",
+            type=MessagingBackend,
+            choices=list(MessagingBackend),
+            default=MessagingBackend.SQLITE,
+            help="messaging store; memory gives a zero-I/O baseline",
+        )
+        parser.add_argument(
+            "--group-commit-window",
+            type=float,
+            default=None,
+            help="seconds durable writes wait to commit together",
+        )
+        parser.add_argument(
+            "--payload-offload-threshold",
+            type=int,
+            default=None,
+            help="store payloads above this many bytes out of line",
+        )
+        parser.add_argument(
+            "--prefill",
+            type=int,
+            default=0,
+            help="messages parked in another queue first, to measure at table size",
+        )
         parser.add_argument(
             "--db-path",
             type=pathlib.Path,
@@ -62,50 +96,119 @@ class BenchMessagingCommand(Command):
     def run(args: argparse.Namespace) -> None:
         db_path = args.db_path or pathlib.Path(tempfile.mktemp(suffix=".db", dir="."))
         try:
-            with sqlite.Database.open(
+            with open_messaging_store(
+                backend=args.backend,
                 path=db_path,
                 read_pool_capacity=max(args.consumers + 1, 4),
                 write_pool_capacity=args.consumers,
-            ) as db:
-                db.migrate(migrations=messaging_migrations.MIGRATIONS)
-                store = Store(db)
+                group_commit_window=args.group_commit_window,
+                payload_offload_threshold=args.payload_offload_threshold,
+            ) as store:
                 store.create_queue(
                     QUEUE,
                     None,
                     5,
                     datetime.datetime.now(datetime.UTC),
                 )
+                if args.prefill:
+                    _prefill(store, args.prefill, args.payload_size)
                 pub_time = _publish(
-                    store, args.messages, args.payload_size, args.visibility_timeout
+                    store,
+                    args.messages,
+                    args.payload_size,
+                    args.visibility_timeout,
+                    args.batch_size,
+                )
+                results, con_time, claim_latencies = _consume(
+                    store, args.consumers, args.batch_size
                 )
-                results, con_time = _consume(store, args.consumers)
                 _report(args.messages, pub_time, results, con_time, args.consumers)
+                _report_claim_latencies(claim_latencies)
+            if args.backend is MessagingBackend.SQLITE:
+                _report_sizes(db_path)
         finally:
             _cleanup(db_path)
 
 
 def _publish(
-    store: Store, count: int, payload_size: int, visibility_timeout: float
+    store: core.Store,
+    count: int,
+    payload_size: int,
+    visibility_timeout: float,
+    batch_size: int,
 ) -> float:
     payload = b"x" * payload_size
     t0 = time.time()
-    for _ in range(count):
-        store.publish_message(
-            str(uuid.uuid4()),
-            QUEUE,
-            payload,
-            visibility_timeout,
-            datetime.datetime.now(datetime.UTC),
+    if batch_size == 1:
+        for _ in range(count):
+            store.publish_message(
+                str(uuid.uuid4()),
+                QUEUE,
+                payload,
+                visibility_timeout,
+                datetime.datetime.now(datetime.UTC),
+            )
+        return time.time() - t0
+    for start in range(0, count, batch_size):
+        now = datetime.datetime.now(datetime.UTC)
+        store.publish_messages(
+            [
+                core.Message(
+                    id=str(uuid.uuid4()),
+                    queue=QUEUE,
+                    payload=payload,
+                    visibility_timeout=visibility_timeout,
+                    delivery_count=0,
+                    visible_at=now,
+                    created_at=now,
+                    version=0,
+                )
+                for _ in range(min(batch_size, count - start))
+            ]
         )
     return time.time() - t0
 
 
-def _consume(store: Store, num_workers: int) -> tuple[dict[int, int], float]:
+def _prefill(store: core.Store, count: int, payload_size: int) -> None:
+    store.create_queue(PREFILL_QUEUE, None, 5, datetime.datetime.now(datetime.UTC))
+    payload = b"x" * payload_size
+    t0 = time.time()
+    for start in range(0, count, PREFILL_BATCH_SIZE):
+        now = datetime.datetime.now(datetime.UTC)
+        store.publish_messages(
+            [
+                core.Message(
+                    id=str(uuid.uuid4()),
+                    queue=PREFILL_QUEUE,
+                    payload=payload,
+                    visibility_timeout=30.0,
+                    delivery_count=0,
+                    visible_at=now,
+                    created_at=now,
+                    version=0,
+                )
+                for _ in range(min(PREFILL_BATCH_SIZE, count - start))
+            ]
+        )
+    print(f"prefill: {count} messages in {time.time() - t0:.2f}s")
+
+
+def _consume(
+    store: core.Store, num_workers: int, batch_size: int
+) -> tuple[dict[int, int], float, list[float]]:
     results: dict[int, int] = {}
+    claim_latencies: list[float] = []
     threads = [
-        threading.Thread(
-            target=_consume_worker,
-            args=(store, i, results),
+        (
+            threading.Thread(
+                target=_consume_worker,
+                args=(store, i, results, claim_latencies),
+            )
+            if batch_size == 1
+            else threading.Thread(
+                target=_consume_batch_worker,
+                args=(store, i, results, batch_size, claim_latencies),
+            )
         )
         for i in range(num_workers)
     ]
@@ -114,16 +217,18 @@ def _consume(store: Store, num_workers: int) -> tuple[dict[int, int], float]:
         t.start()
     for t in threads:
         t.join()
-    return results, time.time() - t0
+    return results, time.time() - t0, claim_latencies
 
 
 def _consume_worker(
-    store: Store,
+    store: core.Store,
     worker_id: int,
     results: dict[int, int],
+    claim_latencies: list[float],
 ) -> None:
     count = 0
     while True:
+        t0 = time.perf_counter()
         try:
             msg = store.claim_message(
                 QUEUE,
@@ -131,11 +236,35 @@ def _consume_worker(
             )
         except core.NoMessagesAvailable:
             break
+        claim_latencies.append(time.perf_counter() - t0)
         store.delete_message(msg.id, msg.version)
         count += 1
     results[worker_id] = count
 
 
+def _consume_batch_worker(
+    store: core.Store,
+    worker_id: int,
+    results: dict[int, int],
+    batch_size: int,
+    claim_latencies: list[float],
+) -> None:
+    count = 0
+    while True:
+        t0 = time.perf_counter()
+        msgs = store.claim_messages(
+            QUEUE,
+            batch_size,
+            datetime.datetime.now(datetime.UTC),
+        )
+        if not msgs:
+            break
+        claim_latencies.append(time.perf_counter() - t0)
+        store.delete_messages([(msg.id, msg.version) for msg in msgs])
+        count += len(msgs)
+    results[worker_id] = count
+
+
 def _report(
     total_published: int,
     pub_time: float,
@@ -156,6 +285,29 @@ def _report(
         print(f"  consumer {wid}: {results[wid]} messages")
 
 
+def _report_claim_latencies(claim_latencies: list[float]) -> None:
+    if len(claim_latencies) < 2:
+        return
+    percentiles = statistics.quantiles(claim_latencies, n=100)
+    print(
+        f"claim latency: p50 {percentiles[49] * 1e6:.0f}us,"
+        f" p99 {percentiles[98] * 1e6:.0f}us"
+    )
+
+
+def _report_sizes(db_path: pathlib.Path) -> None:
+    conn = sqlite3.connect(db_path)
+    try:
+        rows = conn.execute(
+            "SELECT name, sum(pgsize) FROM dbstat GROUP BY name ORDER BY name"
+        ).fetchall()
+    finally:
+        conn.close()
+    print("sizes:")
+    for name, size in rows:
+        print(f"  {name}: {size / 1024 / 1024:.1f} MiB")
+
+
 def _cleanup(db_path: pathlib.Path) -> None:
     db_path.unlink(missing_ok=True)
     for suffix in ["-wal", "-shm"]:
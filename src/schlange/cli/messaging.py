@@ -0,0 +1,22 @@
+import argparse
+import contextlib
+from typing import Generator
+
+from schlange.api import messaging as messaging_api
+from schlange.schlange import MessagingBackend, open_messaging_store
+from schlange.services.messaging import api as messaging_server
+from schlange.services.messaging import core as messaging_core
+
+
+@contextlib.contextmanager
+def open_messaging_server(
+    args: argparse.Namespace,
+) -> Generator[messaging_api.Server, None, None]:
+    with open_messaging_store(
+        backend=MessagingBackend.SQLITE,
+        path=args.messaging_database_path,
+        read_pool_capacity=1,
+        write_pool_capacity=1,
+        shards=args.messaging_shards,
+    ) as store:
+        yield messaging_server.Server(service=messaging_core.Service(store=store))
@@ -0,0 +1,45 @@
+import argparse
+
+from schlange.schlange import DEFAULT_MESSAGING_DATABASE_PATH, DEFAULT_MESSAGING_SHARDS
+
+from .command import Command
+from .queue_purge_command import QueuePurgeCommand
+from .queue_redrive_command import QueueRedriveCommand
+from .queue_stats_command import QueueStatsCommand
+from .subparsers import Subparsers
+
+
+class QueueCommand(Command):
+
+    @staticmethod
+    def register(subparsers: Subparsers) -> None:
+        queue_parser = subparsers.add_parser(
+            "queue", formatter_class=argparse.ArgumentDefaultsHelpFormatter
+        )
+        queue_parser.add_argument(
+            "--messaging-database-path", default=DEFAULT_MESSAGING_DATABASE_PATH
+        )
+        queue_parser.add_argument(
+            "--messaging-shards", type=int, default=DEFAULT_MESSAGING_SHARDS
+        )
+        queue_subparsers = queue_parser.add_subparsers(
+            dest="queue_command", required=True
+        )
+        for command in [
+            QueueStatsCommand,
+            QueueRedriveCommand,
+            QueuePurgeCommand,
+        ]:
+            command.register(queue_subparsers)
+
+    @staticmethod
+    def run(args: argparse.Namespace) -> None:
+        match args.queue_command:
+            case "stats":
+                QueueStatsCommand.run(args)
+            case "redrive":
+                QueueRedriveCommand.run(args)
+            case "purge":
+                QueuePurgeCommand.run(args)
+            case _:
+                raise NotImplementedError(args.queue_command)
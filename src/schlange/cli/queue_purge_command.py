@@ -0,0 +1,33 @@
+import argparse
+
+from schlange.api import messaging as messaging_api
+
+from .command import Command
+from .messaging import open_messaging_server
+from .subparsers import Subparsers
+
+
+class QueuePurgeCommand(Command):
+
+    @staticmethod
+    def register(queue_subparsers: Subparsers) -> None:
+        queue_purge_parser = queue_subparsers.add_parser(
+            "purge", formatter_class=argparse.ArgumentDefaultsHelpFormatter
+        )
+        queue_purge_parser.add_argument("queue")
+        queue_purge_parser.add_argument(
+            "--older-than",
+            type=float,
+            help="only delete messages published this many seconds ago or earlier,"
+            " all if not given",
+        )
+
+    @staticmethod
+    def run(args: argparse.Namespace) -> None:
+        with open_messaging_server(args) as server:
+            response = server.purge_queue(
+                messaging_api.PurgeQueueRequest(
+                    queue=args.queue, older_than=args.older_than
+                )
+            )
+            print(f"purged {response.purged} messages")
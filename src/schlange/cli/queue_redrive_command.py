@@ -0,0 +1,33 @@
+import argparse
+
+from schlange.api import messaging as messaging_api
+
+from .command import Command
+from .messaging import open_messaging_server
+from .subparsers import Subparsers
+
+
+class QueueRedriveCommand(Command):
+
+    @staticmethod
+    def register(queue_subparsers: Subparsers) -> None:
+        queue_redrive_parser = queue_subparsers.add_parser(
+            "redrive", formatter_class=argparse.ArgumentDefaultsHelpFormatter
+        )
+        queue_redrive_parser.add_argument("dead_letter_queue")
+        queue_redrive_parser.add_argument("target_queue")
+        queue_redrive_parser.add_argument(
+            "-l", "--limit", type=int, help="messages to move, all if not given"
+        )
+
+    @staticmethod
+    def run(args: argparse.Namespace) -> None:
+        with open_messaging_server(args) as server:
+            response = server.redrive_messages(
+                messaging_api.RedriveMessagesRequest(
+                    dead_letter_queue=args.dead_letter_queue,
+                    target_queue=args.target_queue,
+                    limit=args.limit,
+                )
+            )
+            print(f"redrove {response.redriven} messages")
@@ -0,0 +1,27 @@
+import argparse
+import dataclasses
+import json
+
+from schlange.api import messaging as messaging_api
+
+from .command import Command
+from .messaging import open_messaging_server
+from .subparsers import Subparsers
+
+
+class QueueStatsCommand(Command):
+
+    @staticmethod
+    def register(queue_subparsers: Subparsers) -> None:
+        queue_stats_parser = queue_subparsers.add_parser(
+            "stats", formatter_class=argparse.ArgumentDefaultsHelpFormatter
+        )
+        queue_stats_parser.add_argument("queue")
+
+    @staticmethod
+    def run(args: argparse.Namespace) -> None:
+        with open_messaging_server(args) as server:
+            stats = server.get_queue_stats(
+                messaging_api.GetQueueStatsRequest(queue=args.queue)
+            )
+            print(json.dumps(dataclasses.asdict(stats), indent=4))
@@ -1,3 +1,4 @@
+from .deadlines import Deadlines
 from .worker import Worker
 
-__all__ = ["Worker"]
+__all__ = ["Deadlines", "Worker"]
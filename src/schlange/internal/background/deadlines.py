@@ -0,0 +1,50 @@
+import datetime
+import threading
+
+
+class Deadlines:
+    """
+    Thread-safe earliest time a worker next has work to do, so it can
+    sleep until then instead of polling. Deadlines are pushed as they
+    are learned, from the worker's store or from local writes; stale
+    ones, e.g. for deleted rows, only cost a wakeup.
+
+    Only the earliest deadline is kept. The worker reads the next one
+    from its store on every tick, so later deadlines need no memory,
+    and pushing the same one tick after tick does not grow anything.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.deadline: datetime.datetime | None = None
+
+    def push(self, deadline: datetime.datetime) -> bool:
+        """Adds ``deadline``; True if it is now the earliest one."""
+        with self.lock:
+            if self.deadline is not None and self.deadline <= deadline:
+                return False
+            self.deadline = deadline
+            return True
+
+    def earliest(self) -> datetime.datetime | None:
+        with self.lock:
+            return self.deadline
+
+    def pop_due(self, now: datetime.datetime) -> bool:
+        """Drops the deadline if it is at or before ``now``; True if so."""
+        with self.lock:
+            if self.deadline is None or self.deadline > now:
+                return False
+            self.deadline = None
+            return True
+
+    def clear(self) -> None:
+        with self.lock:
+            self.deadline = None
+
+    def sleep_time(self, now: datetime.datetime, maximum: float) -> float:
+        """Seconds until the earliest deadline, at most ``maximum``."""
+        earliest = self.earliest()
+        if earliest is None:
+            return maximum
+        return min(maximum, max(0.0, (earliest - now).total_seconds()))
@@ -11,6 +11,7 @@ class Worker(threading.Thread):
         self.error: Exception | None = None
         self.stopping = threading.Event()
         self.stopped = threading.Event()
+        self.woken = threading.Event()
 
     def __enter__(self) -> "Worker":
         self.start()
@@ -25,6 +26,11 @@ class Worker(threading.Thread):
 
     def cancel(self) -> None:
         self.stopping.set()
+        self.woken.set()
+
+    def wake(self) -> None:
+        """Cuts the current sleep short so the next ``work`` runs now."""
+        self.woken.set()
 
     def wait(self) -> None:
         self.stopped.wait()
@@ -43,7 +49,12 @@ class Worker(threading.Thread):
     def loop(self) -> None:
         while not self.stopping.is_set():
             self.work()
-            self.stopping.wait(self.interval)
+            self.woken.wait(self.sleep_time())
+            self.woken.clear()
+
+    def sleep_time(self) -> float:
+        """Seconds to sleep after ``work`` unless woken."""
+        return self.interval
 
     def work(self) -> None:
         raise NotImplementedError
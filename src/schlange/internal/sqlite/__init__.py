@@ -1,16 +1,24 @@
+from .change_notifier import ChangeNotifier
 from .connection import Connection
 from .connection_pool import ConnectionPool
 from .data_mapper import DataMapper
 from .database import Database
 from .errors import NoRowsError
+from .group_commit import GroupCommitter
+from .local_commits import LOCAL_COMMITS, CommitObserver, LocalCommits
 from .migration import Migration
 from .transaction import Transaction
 
 __all__ = [
+    "ChangeNotifier",
+    "CommitObserver",
     "Connection",
     "ConnectionPool",
     "DataMapper",
     "Database",
+    "GroupCommitter",
+    "LOCAL_COMMITS",
+    "LocalCommits",
     "Migration",
     "NoRowsError",
     "Transaction",
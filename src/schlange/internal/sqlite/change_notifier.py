@@ -0,0 +1,90 @@
+import contextlib
+import pathlib
+import threading
+from typing import Callable, Generator, List, Optional
+
+from schlange.internal import background
+
+from .connection import Connection
+from .local_commits import LOCAL_COMMITS, LocalCommits
+
+
+class ChangeNotifier(background.Worker):
+    """
+    Detects commits to a database made by other processes and calls the
+    subscribed listeners.
+
+    Polls ``PRAGMA data_version`` on a dedicated connection. In WAL
+    mode this reads only the shared-memory WAL index, so an idle
+    database costs no page reads. Listeners run on the notifier thread
+    and must not block.
+
+    ``data_version`` also changes on this process's own commits, which
+    its workers already know about. The notifier observes them through
+    ``commits``: right before a local COMMIT, under the write lock, it
+    reads ``data_version`` to catch foreign commits since it last
+    looked, and right after, it takes the new value as seen. A poll
+    then only reports changes made outside those local commits, however
+    busy this process is. A foreign commit landing between a local
+    COMMIT and the read after it is taken for local; the workers' own
+    polling picks it up.
+    """
+
+    def __init__(
+        self,
+        path: pathlib.Path,
+        interval: float,
+        commits: LocalCommits = LOCAL_COMMITS,
+    ) -> None:
+        super().__init__(name=f"schlange.ChangeNotifier[{path}]", interval=interval)
+        self.path = path
+        self.commits = commits
+        self.listeners: List[Callable[[], None]] = []
+        # Guards conn and the fields below, shared with local commits.
+        self.lock = threading.Lock()
+        self.conn: Optional[Connection] = None
+        self.data_version: Optional[int] = None
+        # A local commit found a foreign one since the last poll.
+        self.foreign_commits = False
+
+    def subscribe(self, listener: Callable[[], None]) -> None:
+        self.listeners.append(listener)
+
+    def loop(self) -> None:
+        with Connection.open(path=self.path, synchronous_full=False) as conn:
+            with self.lock:
+                self.conn = conn
+            self.commits.subscribe(self.path, self)
+            try:
+                super().loop()
+            finally:
+                self.commits.unsubscribe(self.path, self)
+                with self.lock:
+                    self.conn = None
+
+    @contextlib.contextmanager
+    def local_commit(self) -> Generator[None, None, None]:
+        # Held across the COMMIT, so local commits on other connections
+        # cannot run between the two reads.
+        with self.lock:
+            if self.conn is None:
+                yield
+                return
+            before = self.conn.data_version()
+            if self.data_version is not None and before != self.data_version:
+                self.foreign_commits = True
+            yield
+            self.data_version = self.conn.data_version()
+
+    def work(self) -> None:
+        with self.lock:
+            assert self.conn is not None
+            data_version = self.conn.data_version()
+            changed = self.foreign_commits or (
+                self.data_version is not None and data_version != self.data_version
+            )
+            self.data_version = data_version
+            self.foreign_commits = False
+        if changed:
+            for listener in self.listeners:
+                listener()
@@ -1,7 +1,7 @@
 import contextlib
 import pathlib
 import sqlite3
-from typing import ContextManager, Generator
+from typing import Callable, ContextManager, Generator, Optional
 
 from .transaction import Transaction
 
@@ -28,5 +28,15 @@ class Connection:
     def __init__(self, conn: sqlite3.Connection) -> None:
         self.conn = conn
 
-    def transaction(self, read_only: bool = False) -> ContextManager[Transaction]:
-        return Transaction.begin(conn=self.conn, read_only=read_only)
+    def transaction(
+        self,
+        read_only: bool = False,
+        around_commit: Optional[Callable[[], ContextManager[None]]] = None,
+    ) -> ContextManager[Transaction]:
+        return Transaction.begin(
+            conn=self.conn, read_only=read_only, around_commit=around_commit
+        )
+
+    def data_version(self) -> int:
+        # See: https://www.sqlite.org/pragma.html#pragma_data_version
+        return self.conn.execute("PRAGMA data_version").fetchone()[0]
@@ -2,6 +2,9 @@ import datetime
 
 from schlange.internal import core
 
+EPOCH = datetime.datetime.fromtimestamp(0, tz=datetime.UTC)
+MICROSECOND = datetime.timedelta(microseconds=1)
+
 
 class DataMapper:
 
@@ -11,6 +14,14 @@ class DataMapper:
     def load_timestamp(self, s: float) -> datetime.datetime:
         return datetime.datetime.fromtimestamp(s, tz=datetime.UTC)
 
+    # Exact integer microseconds since the epoch: no float rounding, and
+    # SQLite packs the integer into fewer bytes than a REAL.
+    def dump_timestamp_micros(self, timestamp: datetime.datetime) -> int:
+        return (timestamp - EPOCH) // MICROSECOND
+
+    def load_timestamp_micros(self, micros: int) -> datetime.datetime:
+        return EPOCH + datetime.timedelta(microseconds=micros)
+
     def dump_retry_policy(self, policy: core.RetryPolicy) -> core.DTO:
         return {
             "initial_delay": policy.initial_delay,
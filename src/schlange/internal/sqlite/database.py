@@ -1,10 +1,13 @@
 import contextlib
+import functools
 import logging
 import pathlib
-from typing import Generator
+from typing import Callable, ContextManager, Generator, Optional
 
 from .connection import Connection
 from .connection_pool import ConnectionPool
+from .group_commit import GroupCommitter
+from .local_commits import LOCAL_COMMITS
 from .migration import Migration
 from .transaction import Transaction
 
@@ -45,7 +48,14 @@ class Database:
         read_pool_capacity: int,
         write_pool_capacity: int = 1,
         sync_write_pool_capacity: int = 1,
+        group_commit_window: Optional[float] = None,
     ) -> Generator["Database", None, None]:
+        """
+        With ``group_commit_window`` set, synchronous write transactions
+        share one connection and commit in groups, see GroupCommitter.
+        """
+        # Lets ChangeNotifiers tell this process's commits apart.
+        around_commit = functools.partial(LOCAL_COMMITS.commit, path.resolve())
         with contextlib.ExitStack() as stack:
             read_pool = stack.enter_context(
                 ConnectionPool.new(
@@ -68,10 +78,21 @@ class Database:
                     capacity=sync_write_pool_capacity,
                 )
             )
+            group_committer = None
+            if group_commit_window is not None:
+                group_committer = GroupCommitter(
+                    conn=stack.enter_context(
+                        Connection.open(path=path, synchronous_full=True)
+                    ),
+                    window=group_commit_window,
+                    around_commit=around_commit,
+                )
             yield cls(
                 read_pool=read_pool,
                 write_pool=write_pool,
                 sync_write_pool=sync_write_pool,
+                group_committer=group_committer,
+                around_commit=around_commit,
             )
 
     def __init__(
@@ -79,22 +100,34 @@ class Database:
         read_pool: ConnectionPool,
         write_pool: ConnectionPool,
         sync_write_pool: ConnectionPool,
+        group_committer: Optional[GroupCommitter] = None,
+        around_commit: Optional[Callable[[], ContextManager[None]]] = None,
     ) -> None:
         self.read_pool = read_pool
         self.write_pool = write_pool
         self.sync_write_pool = sync_write_pool
+        self.group_committer = group_committer
+        # Wraps every COMMIT of a write transaction.
+        self.around_commit = around_commit
 
     @contextlib.contextmanager
     def transaction(
         self, read_only: bool = False, synchronous: bool = True
     ) -> Generator[Transaction, None, None]:
+        if not read_only and synchronous and self.group_committer is not None:
+            with self.group_committer.transaction() as tx:
+                yield tx
+            return
         pool = (
             self.read_pool
             if read_only
             else self.sync_write_pool if synchronous else self.write_pool
         )
         with pool.acquire() as conn:
-            with conn.transaction(read_only=read_only) as tx:
+            with conn.transaction(
+                read_only=read_only,
+                around_commit=None if read_only else self.around_commit,
+            ) as tx:
                 yield tx
 
     def migrate(self, migrations: list[Migration]) -> None:
@@ -0,0 +1,98 @@
+import contextlib
+import threading
+import time
+from typing import Callable, ContextManager, Generator, Optional
+
+from .connection import Connection
+from .transaction import Transaction
+
+
+class Batch:
+
+    def __init__(self) -> None:
+        self.committed = threading.Event()
+        self.error: Optional[Exception] = None
+
+
+class GroupCommitter:
+    """
+    Runs concurrent write transactions inside one shared transaction on
+    a synchronous=FULL connection, so a batch of callers pays for one
+    fsync instead of one each.
+
+    The first caller to find no open batch begins one and becomes its
+    leader. Every caller runs its body in a savepoint, so a body that
+    raises rolls back only its own writes. The leader then waits
+    ``window`` seconds for others to join and commits the batch. No
+    caller returns before the batch is durable; if the commit fails,
+    every caller in the batch raises the commit error.
+    """
+
+    def __init__(
+        self,
+        conn: Connection,
+        window: float,
+        around_commit: Optional[Callable[[], ContextManager[None]]] = None,
+    ) -> None:
+        self.conn = conn
+        self.window = window
+        self.around_commit = around_commit
+        self.lock = threading.Lock()
+        self.batch: Optional[Batch] = None
+
+    @contextlib.contextmanager
+    def transaction(self) -> Generator[Transaction, None, None]:
+        conn = self.conn.conn
+        error: Optional[BaseException] = None
+        with self.lock:
+            batch = self.batch
+            leader = batch is None
+            if batch is None:
+                conn.execute("BEGIN IMMEDIATE")
+                batch = self.batch = Batch()
+            conn.execute("SAVEPOINT group_commit")
+            try:
+                yield Transaction(cursor=conn.cursor())
+            except BaseException as e:
+                error = e
+                self._rollback_savepoint(batch)
+            else:
+                conn.execute("RELEASE group_commit")
+        if leader:
+            time.sleep(self.window)
+            self._commit(batch)
+        batch.committed.wait()
+        if error is not None:
+            raise error
+        if batch.error is not None:
+            raise batch.error
+
+    def _rollback_savepoint(self, batch: Batch) -> None:
+        conn = self.conn.conn
+        if conn.in_transaction:
+            conn.execute("ROLLBACK TO group_commit")
+            conn.execute("RELEASE group_commit")
+            return
+        # SQLite rolled back the whole transaction (e.g. on SQLITE_FULL),
+        # taking the other callers' writes with it.
+        batch.error = IOError("group commit transaction rolled back")
+        self.batch = None
+        batch.committed.set()
+
+    def _commit(self, batch: Batch) -> None:
+        with self.lock:
+            if self.batch is not batch:
+                return
+            self.batch = None
+            try:
+                if self.around_commit is None:
+                    self.conn.conn.execute("COMMIT")
+                else:
+                    with self.around_commit():
+                        self.conn.conn.execute("COMMIT")
+            except Exception as e:
+                batch.error = e
+                if self.conn.conn.in_transaction:
+                    self.conn.conn.execute("ROLLBACK")
+            finally:
+                batch.committed.set()
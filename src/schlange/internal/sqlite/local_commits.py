@@ -0,0 +1,49 @@
+import contextlib
+import pathlib
+import threading
+from typing import ContextManager, Generator, Protocol
+
+
+class CommitObserver(Protocol):
+
+    def local_commit(self) -> ContextManager[None]:
+        """Wraps a COMMIT made by this process, under the write lock."""
+        ...
+
+
+class LocalCommits:
+    """
+    Thread-safe registry of observers of the write transactions this
+    process commits, per database file. Paths are resolved, so
+    different spellings of one file share their observers.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.observers: dict[pathlib.Path, list[CommitObserver]] = {}
+
+    def subscribe(self, path: pathlib.Path, observer: CommitObserver) -> None:
+        with self.lock:
+            self.observers.setdefault(path.resolve(), []).append(observer)
+
+    def unsubscribe(self, path: pathlib.Path, observer: CommitObserver) -> None:
+        with self.lock:
+            self.observers[path.resolve()].remove(observer)
+
+    @contextlib.contextmanager
+    def commit(self, path: pathlib.Path) -> Generator[None, None, None]:
+        """
+        Runs a COMMIT to the resolved ``path`` inside its observers'
+        ``local_commit``.
+        """
+        with self.lock:
+            observers = list(self.observers.get(path, []))
+        with contextlib.ExitStack() as stack:
+            for observer in observers:
+                stack.enter_context(observer.local_commit())
+            yield
+
+
+# Commits made through this process's Databases. A ChangeNotifier
+# observes them to tell them apart from commits by other processes.
+LOCAL_COMMITS = LocalCommits()
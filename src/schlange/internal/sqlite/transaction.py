@@ -1,6 +1,6 @@
 import contextlib
 import sqlite3
-from typing import Generator
+from typing import Callable, ContextManager, Generator, Optional
 
 from .errors import NoRowsError
 
@@ -10,7 +10,10 @@ class Transaction:
     @classmethod
     @contextlib.contextmanager
     def begin(
-        cls, conn: sqlite3.Connection, read_only: bool
+        cls,
+        conn: sqlite3.Connection,
+        read_only: bool,
+        around_commit: Optional[Callable[[], ContextManager[None]]] = None,
     ) -> Generator["Transaction", None, None]:
         mode = "IMMEDIATE"
         if read_only:
@@ -22,7 +25,11 @@ class Transaction:
             conn.rollback()
             raise
         else:
-            conn.commit()
+            if around_commit is None:
+                conn.commit()
+            else:
+                with around_commit():
+                    conn.commit()
 
     def __init__(self, cursor: sqlite3.Cursor) -> None:
         self.cursor = cursor
@@ -31,6 +38,10 @@ class Transaction:
         self.cursor.execute(sql, *args, **kwargs)
         return self.cursor.rowcount
 
+    def execute_many(self, sql: str, *args, **kwargs) -> int:
+        self.cursor.executemany(sql, *args, **kwargs)
+        return self.cursor.rowcount
+
     def query_row(self, sql: str, *args, **kwargs) -> sqlite3.Row:
         self.cursor.execute(sql, *args, **kwargs)
         row = self.cursor.fetchone()
@@ -1,8 +1,10 @@
 import contextlib
 import dataclasses
+import enum
 import logging
 import pathlib
 import uuid
+import warnings
 from typing import Generator, List, Optional
 
 from schlange.internal import core, sqlite
@@ -14,7 +16,9 @@ from schlange.services.leases import background as leases_background
 from schlange.services.leases import core as leases_core
 from schlange.services.leases import sqlite as leases_sqlite
 from schlange.services.messaging import api as messaging_api
+from schlange.services.messaging import background as messaging_background
 from schlange.services.messaging import core as messaging_core
+from schlange.services.messaging import memory as messaging_memory
 from schlange.services.messaging import sqlite as messaging_sqlite
 from schlange.services.schedules import api as schedules_api
 from schlange.services.schedules import background as schedules_background
@@ -31,6 +35,22 @@ DEFAULT_TASK_DATABASE_PATH = pathlib.Path("tasks.db")
 DEFAULT_SCHEDULE_DATABASE_PATH = pathlib.Path("schedules.db")
 DEFAULT_LEASE_DATABASE_PATH = pathlib.Path("leases.db")
 DEFAULT_MESSAGING_DATABASE_PATH = pathlib.Path("messaging.db")
+
+
+class MessagingBackend(enum.StrEnum):
+    SQLITE = "sqlite"
+    # Zero I/O and not durable: messages in flight are lost with the
+    # process. For single-process deployments and benchmarks.
+    MEMORY = "memory"
+
+
+DEFAULT_MESSAGING_BACKEND = MessagingBackend.SQLITE
+# Number of SQLite files the messaging queues are spread over. Queues in
+# different shards do not contend on the same write lock.
+DEFAULT_MESSAGING_SHARDS = 1
+# Message payloads longer than this many bytes are stored out of line,
+# once per distinct content, keeping the messages table pages small.
+DEFAULT_MESSAGING_PAYLOAD_OFFLOAD_THRESHOLD = 2048
 DEFAULT_RETRY_POLICY = tasks_core.RetryPolicy(
     initial_delay=1,
     backoff_factor=2.0,
@@ -40,7 +60,7 @@ DEFAULT_RETRY_POLICY = tasks_core.RetryPolicy(
 
 DEFAULT_VISIBILITY_TIMEOUT = 30.0
 DEFAULT_MAX_DELIVERY_COUNT = 5
-DEFAULT_CONSUMER_INTERVAL = 1
+DEFAULT_CONSUMER_WAIT_TIME = 1.0
 DEFAULT_CONSUMERS_PER_KIND = 1
 
 DEFAULT_CLEANUP_POLICY = tasks_core.CleanupPolicy(
@@ -48,14 +68,40 @@ DEFAULT_CLEANUP_POLICY = tasks_core.CleanupPolicy(
     delete_failed_after=60 * 60 * 24 * 7,
 )
 DEFAULT_CLEANUP_WORKER_INTERVAL = 60
+# Tasks deleted per cleanup transaction.
+DEFAULT_CLEANUP_WORKER_CHUNK_SIZE = 1000
 
 DEFAULT_SCHEDULE_WORKER_INTERVAL = 1
 DEFAULT_SCHEDULE_WORKER_LEASE_TTL = 5.0
 
 DEFAULT_DISPATCHER_INTERVAL = 1
 DEFAULT_DISPATCHER_LEASE_TTL = 5.0
+DEFAULT_DISPATCHER_LOOKAHEAD = DEFAULT_DISPATCHER_INTERVAL
+# Tasks begun per tasks-DB transaction and published per broker
+# transaction by the Dispatcher.
+DEFAULT_DISPATCHER_BATCH_SIZE = 100
 
 DEFAULT_LEASE_REAPER_INTERVAL = 60
+DEFAULT_MESSAGING_REAPER_INTERVAL = 60
+
+DEFAULT_CHANGE_NOTIFIER_INTERVAL = 0.1
+
+
+@dataclasses.dataclass
+class NewTask:
+    """
+    A task for ``Schlange.create_tasks``, with the options of
+    ``Schlange.create_task``; unset ones take the defaults.
+    """
+
+    args: core.DTO
+    kind: str
+    delay: float = 0.0
+    visibility_timeout: Optional[float] = None
+    retry_policy: Optional[tasks_core.RetryPolicy] = None
+    id: Optional[str] = None
+    priority: int = 0
+    group_id: Optional[str] = None
 
 
 @dataclasses.dataclass
@@ -70,6 +116,8 @@ class Schlange:
     cleanup_worker: tasks_background.CleanupWorker
     schedule_worker: schedules_background.ScheduleWorker
     leases_reaper: leases_background.Reaper
+    messaging_reaper: messaging_background.Reaper
+    change_notifiers: List[sqlite.ChangeNotifier]
 
     def __enter__(self) -> "Schlange":
         self.start()
@@ -79,12 +127,15 @@ class Schlange:
         self.stop()
 
     def start(self) -> None:
+        for notifier in self.change_notifiers:
+            notifier.start()
         for consumer in self.consumers:
             consumer.start()
         self.dispatcher.start()
         self.cleanup_worker.start()
         self.schedule_worker.start()
         self.leases_reaper.start()
+        self.messaging_reaper.start()
 
     def stop(self) -> None:
         workers: list = [
@@ -93,6 +144,8 @@ class Schlange:
             self.dispatcher,
             self.schedule_worker,
             self.leases_reaper,
+            self.messaging_reaper,
+            *self.change_notifiers,
         ]
         for w in workers:
             w.cancel()
@@ -114,19 +167,39 @@ class Schlange:
         schedule_database_path: pathlib.Path = DEFAULT_SCHEDULE_DATABASE_PATH,
         lease_database_path: pathlib.Path = DEFAULT_LEASE_DATABASE_PATH,
         messaging_database_path: pathlib.Path = DEFAULT_MESSAGING_DATABASE_PATH,
+        messaging_backend: MessagingBackend = DEFAULT_MESSAGING_BACKEND,
+        messaging_shards: int = DEFAULT_MESSAGING_SHARDS,
+        messaging_payload_offload_threshold: Optional[
+            int
+        ] = DEFAULT_MESSAGING_PAYLOAD_OFFLOAD_THRESHOLD,
         default_retry_policy: tasks_core.RetryPolicy = DEFAULT_RETRY_POLICY,
         default_visibility_timeout: float = DEFAULT_VISIBILITY_TIMEOUT,
         max_delivery_count: int = DEFAULT_MAX_DELIVERY_COUNT,
-        consumer_interval: float = DEFAULT_CONSUMER_INTERVAL,
+        consumer_wait_time: float = DEFAULT_CONSUMER_WAIT_TIME,
         consumers_per_kind: int = DEFAULT_CONSUMERS_PER_KIND,
         cleanup_policy: tasks_core.CleanupPolicy = DEFAULT_CLEANUP_POLICY,
         cleanup_worker_interval: float = DEFAULT_CLEANUP_WORKER_INTERVAL,
+        cleanup_worker_chunk_size: int = DEFAULT_CLEANUP_WORKER_CHUNK_SIZE,
         schedule_worker_interval: float = DEFAULT_SCHEDULE_WORKER_INTERVAL,
         schedule_worker_lease_ttl: float = DEFAULT_SCHEDULE_WORKER_LEASE_TTL,
         dispatcher_interval: float = DEFAULT_DISPATCHER_INTERVAL,
         dispatcher_lease_ttl: float = DEFAULT_DISPATCHER_LEASE_TTL,
+        dispatcher_lookahead: float = DEFAULT_DISPATCHER_LOOKAHEAD,
+        dispatcher_batch_size: int = DEFAULT_DISPATCHER_BATCH_SIZE,
         lease_reaper_interval: float = DEFAULT_LEASE_REAPER_INTERVAL,
+        messaging_reaper_interval: float = DEFAULT_MESSAGING_REAPER_INTERVAL,
+        change_notifier_interval: float = DEFAULT_CHANGE_NOTIFIER_INTERVAL,
+        group_commit_window: Optional[float] = None,
+        consumer_interval: Optional[float] = None,
     ) -> Generator["Schlange", None, None]:
+        if consumer_interval is not None:
+            # Consumers long-poll instead of sleeping between claims.
+            warnings.warn(
+                "consumer_interval is deprecated, use consumer_wait_time",
+                DeprecationWarning,
+                stacklevel=3,
+            )
+            consumer_wait_time = consumer_interval
         write_pool_capacity = consumers_per_kind * len(handlers)
         read_pool_capacity = calculate_optimal_database_read_pool_capacity(
             consumers_per_kind, len(handlers)
@@ -137,6 +210,7 @@ class Schlange:
                 read_pool_capacity=read_pool_capacity,
                 write_pool_capacity=write_pool_capacity,
                 sync_write_pool_capacity=write_pool_capacity,
+                group_commit_window=group_commit_window,
             ) as task_db,
             sqlite.Database.open(
                 path=schedule_database_path,
@@ -146,20 +220,21 @@ class Schlange:
                 path=lease_database_path,
                 read_pool_capacity=read_pool_capacity,
             ) as lease_db,
-            sqlite.Database.open(
+            open_messaging_store(
+                backend=messaging_backend,
                 path=messaging_database_path,
                 read_pool_capacity=read_pool_capacity,
                 write_pool_capacity=write_pool_capacity,
-                sync_write_pool_capacity=write_pool_capacity,
-            ) as messaging_db,
+                group_commit_window=group_commit_window,
+                shards=messaging_shards,
+                payload_offload_threshold=messaging_payload_offload_threshold,
+            ) as messaging_store,
         ):
             task_db.migrate(migrations=tasks_sqlite.MIGRATIONS)
             schedule_db.migrate(migrations=schedules_sqlite.MIGRATIONS)
             lease_db.migrate(migrations=leases_sqlite.MIGRATIONS)
-            messaging_db.migrate(migrations=messaging_sqlite.MIGRATIONS)
             task_repository = tasks_sqlite.TaskRepository(db=task_db)
             lease_store = leases_sqlite.Store(db=lease_db)
-            messaging_store = messaging_sqlite.Store(db=messaging_db)
             lease_service = leases_core.Service(store=lease_store)
             messaging_service = messaging_core.Service(
                 store=messaging_store,
@@ -202,7 +277,7 @@ class Schlange:
                 for _ in range(consumers_per_kind):
                     consumer = execution_background.Consumer(
                         queue=kind,
-                        interval=consumer_interval,
+                        wait_time=consumer_wait_time,
                         messaging_server=messaging_server,
                         execution_service=execution_service,
                     )
@@ -213,11 +288,14 @@ class Schlange:
                 key="tasks-dispatcher",
                 ttl=dispatcher_lease_ttl,
                 interval=dispatcher_interval,
+                lookahead=dispatcher_lookahead,
+                batch_size=dispatcher_batch_size,
             )
             cleanup_worker = tasks_background.CleanupWorker(
                 interval=cleanup_worker_interval,
                 task_service=task_service,
                 cleanup_policy=cleanup_policy,
+                chunk_size=cleanup_worker_chunk_size,
             )
             schedule_worker = schedules_background.ScheduleWorker(
                 schedule_service=schedule_service,
@@ -230,6 +308,34 @@ class Schlange:
                 service=lease_service,
                 interval=lease_reaper_interval,
             )
+            messaging_reaper = messaging_background.Reaper(
+                service=messaging_service,
+                interval=messaging_reaper_interval,
+            )
+            # Tasks and schedules made ready in this process wake their
+            # workers directly.
+            task_service.subscribe_ready(dispatcher.notify_ready)
+            schedule_service.subscribe_ready(schedule_worker.notify_ready)
+            # Commits by other processes wake the workers that would
+            # otherwise only notice them on their next poll.
+            task_change_notifier = sqlite.ChangeNotifier(
+                path=task_database_path, interval=change_notifier_interval
+            )
+            task_change_notifier.subscribe(dispatcher.wake)
+            schedule_change_notifier = sqlite.ChangeNotifier(
+                path=schedule_database_path, interval=change_notifier_interval
+            )
+            schedule_change_notifier.subscribe(schedule_worker.wake)
+            change_notifiers = [task_change_notifier, schedule_change_notifier]
+            if messaging_backend is MessagingBackend.SQLITE:
+                for path in messaging_database_paths(
+                    messaging_database_path, messaging_shards
+                ):
+                    messaging_change_notifier = sqlite.ChangeNotifier(
+                        path=path, interval=change_notifier_interval
+                    )
+                    messaging_change_notifier.subscribe(messaging_service.wake_claimers)
+                    change_notifiers.append(messaging_change_notifier)
             yield cls(
                 task_service=task_service,
                 default_retry_policy=default_retry_policy,
@@ -240,6 +346,8 @@ class Schlange:
                 cleanup_worker=cleanup_worker,
                 schedule_worker=schedule_worker,
                 leases_reaper=leases_reaper,
+                messaging_reaper=messaging_reaper,
+                change_notifiers=change_notifiers,
             )
 
     def create_task(
@@ -250,6 +358,8 @@ class Schlange:
         visibility_timeout: Optional[float] = None,
         retry_policy: Optional[tasks_core.RetryPolicy] = None,
         id: Optional[str] = None,
+        priority: int = 0,
+        group_id: Optional[str] = None,
     ) -> tasks_core.Task:
         if retry_policy is None:
             retry_policy = self.default_retry_policy
@@ -268,10 +378,49 @@ class Schlange:
             visibility_timeout=visibility_timeout,
             retry_policy=retry_policy,
             id=id,
+            priority=priority,
+            group_id=group_id,
         )
         LOGGER.info("task created: task=%r", task)
         return task
 
+    def create_tasks(self, tasks: List[NewTask]) -> List[Optional[tasks_core.Task]]:
+        """
+        Creates the tasks in one transaction, much faster than calling
+        ``create_task`` for each. Returns the created tasks in order,
+        with None for each task whose id already exists.
+        """
+        LOGGER.debug("creating tasks: count=%d", len(tasks))
+        created = self.task_service.create_tasks(
+            [
+                tasks_core.NewTask(
+                    args=task.args,
+                    kind=task.kind,
+                    delay=task.delay,
+                    visibility_timeout=(
+                        task.visibility_timeout
+                        if task.visibility_timeout is not None
+                        else self.default_visibility_timeout
+                    ),
+                    retry_policy=(
+                        task.retry_policy
+                        if task.retry_policy is not None
+                        else self.default_retry_policy
+                    ),
+                    id=task.id,
+                    priority=task.priority,
+                    group_id=task.group_id,
+                )
+                for task in tasks
+            ]
+        )
+        LOGGER.info(
+            "tasks created: count=%d, existing=%d",
+            len(created) - created.count(None),
+            created.count(None),
+        )
+        return created
+
     def task(self, task_id: str) -> tasks_core.Task:
         return self.task_service.task(task_id)
 
@@ -338,6 +487,56 @@ class Schlange:
 new = Schlange.new
 
 
+@contextlib.contextmanager
+def open_messaging_store(
+    backend: MessagingBackend,
+    path: pathlib.Path,
+    read_pool_capacity: int,
+    write_pool_capacity: int,
+    group_commit_window: Optional[float] = None,
+    shards: int = DEFAULT_MESSAGING_SHARDS,
+    payload_offload_threshold: Optional[int] = None,
+) -> Generator[messaging_core.Store, None, None]:
+    if backend is MessagingBackend.MEMORY:
+        yield messaging_memory.Store()
+        return
+    with contextlib.ExitStack() as stack:
+        stores = []
+        for shard_path in messaging_database_paths(path, shards):
+            db = stack.enter_context(
+                sqlite.Database.open(
+                    path=shard_path,
+                    read_pool_capacity=read_pool_capacity,
+                    write_pool_capacity=write_pool_capacity,
+                    sync_write_pool_capacity=write_pool_capacity,
+                    group_commit_window=group_commit_window,
+                )
+            )
+            db.migrate(migrations=messaging_sqlite.MIGRATIONS)
+            stores.append(
+                messaging_sqlite.Store(
+                    db=db, payload_offload_threshold=payload_offload_threshold
+                )
+            )
+        if len(stores) == 1:
+            yield stores[0]
+        else:
+            yield messaging_sqlite.ShardedStore(shards=stores)
+
+
+def messaging_database_paths(path: pathlib.Path, shards: int) -> List[pathlib.Path]:
+    """
+    Returns the database file of each messaging shard: ``path`` itself
+    for a single shard, else ``messaging.0.db``, ``messaging.1.db``, ...
+    next to it.
+    """
+    if shards < 1:
+        raise ValueError(f"messaging shards must be at least 1, got {shards}")
+    if shards == 1:
+        return [path]
+    return [path.with_name(f"{path.stem}.{i}{path.suffix}") for i in range(shards)]
+
+
 def calculate_optimal_database_read_pool_capacity(
     consumers_per_kind: int, num_kinds: int
 ) -> int:
@@ -10,6 +10,23 @@ class TaskServiceAdapter:
     def __init__(self, task_server: tasks.Server) -> None:
         self.task_server = task_server
 
+    def get_execution(
+        self, task_id: str, seq_num: int
+    ) -> typing.Optional[core.TaskExecution]:
+        try:
+            response = self.task_server.get_execution(
+                tasks.GetExecutionRequest(task_id=task_id, seq_num=seq_num)
+            )
+        except tasks.ConflictError:
+            raise core.AbortedError() from None
+        except tasks.NotFoundError:
+            raise core.NotFoundError() from None
+        except tasks.FailedPreconditionError:
+            raise core.FailedPreconditionError() from None
+        if response.ended:
+            return None
+        return core.TaskExecution(task_id=task_id, seq_num=seq_num, args=response.args)
+
     def end_execution(
         self, task_id: str, seq_num: int, error: typing.Optional[str]
     ) -> None:
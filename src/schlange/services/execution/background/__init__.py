@@ -1,5 +1,7 @@
 from .consumer import Consumer
+from .heartbeat import Heartbeat
 
 __all__ = [
     "Consumer",
+    "Heartbeat",
 ]
@@ -6,33 +6,47 @@ from schlange.internal import background
 from schlange.services.execution import core
 from schlange.services.messaging import core as messaging_core
 
+from .heartbeat import Heartbeat
+
 LOGGER = logging.getLogger(__name__)
 
 
 class Consumer(background.Worker):
     """Claims and processes messages from a single queue.
 
-    Each call of ``work`` claims at most one message, hands it to the
-    execution service, then acks or requeues based on the outcome.
+    Each call of ``work`` drains the queue one message at a time,
+    handing each to the execution service, then acking or requeueing
+    based on the outcome. An empty queue is long-polled for up to
+    ``wait_time`` seconds instead of sleeping between claims, so new
+    work is picked up as soon as it is published. While a handler runs,
+    a Heartbeat keeps extending the message's visibility.
     """
 
     def __init__(
         self,
         queue: str,
-        interval: float,
+        wait_time: float,
         messaging_server: messaging_api.Server,
         execution_service: core.ExecutionService,
     ) -> None:
-        super().__init__(name=f"schlange.Consumer[{queue}]", interval=interval)
+        super().__init__(name=f"schlange.Consumer[{queue}]", interval=0)
         self.queue = queue
+        self.wait_time = wait_time
         self.messaging_server = messaging_server
         self.execution_service = execution_service
+        self.heartbeat = Heartbeat(queue, messaging_server)
+
+    def loop(self) -> None:
+        with self.heartbeat:
+            super().loop()
 
     def work(self) -> None:
         while True:
             try:
                 response = self.messaging_server.claim_message(
-                    messaging_api.ClaimMessageRequest(queue=self.queue)
+                    messaging_api.ClaimMessageRequest(
+                        queue=self.queue, wait_time=self.wait_time
+                    )
                 )
             except messaging_core.NoMessagesAvailable:
                 return
@@ -41,12 +55,12 @@ class Consumer(background.Worker):
             payload = json.loads(message.payload)
 
             try:
-                self.execution_service.execute(
-                    task_id=payload["task_id"],
-                    seq_num=payload["seq_num"],
-                    kind=payload["kind"],
-                    args=payload["args"],
-                )
+                with self.heartbeat.tracking(message):
+                    self.execution_service.execute(
+                        task_id=payload["task_id"],
+                        seq_num=payload["seq_num"],
+                        kind=payload["kind"],
+                    )
             except core.AbortedError:
                 LOGGER.debug("requeueing message: id=%s", message.id)
                 self.messaging_server.requeue_message(
@@ -0,0 +1,71 @@
+import contextlib
+import logging
+import threading
+from typing import Generator, Optional
+
+from schlange.api import messaging as messaging_api
+from schlange.internal import background
+
+LOGGER = logging.getLogger(__name__)
+
+
+class Heartbeat(background.Worker):
+    """Keeps the message a Consumer is handling invisible.
+
+    While a message is tracked, its visibility is extended by a full
+    ``visibility_timeout`` every half timeout, so a handler that runs
+    longer than the timeout does not get its message redelivered, and
+    a crashed consumer's message still reappears within one timeout.
+    """
+
+    def __init__(self, queue: str, messaging_server: messaging_api.Server) -> None:
+        super().__init__(name=f"schlange.Heartbeat[{queue}]", interval=0)
+        self.messaging_server = messaging_server
+        self.condition = threading.Condition()
+        self.message: Optional[messaging_api.Message] = None
+
+    @contextlib.contextmanager
+    def tracking(self, message: messaging_api.Message) -> Generator[None, None, None]:
+        with self.condition:
+            self.message = message
+            self.condition.notify()
+        try:
+            yield
+        finally:
+            with self.condition:
+                self.message = None
+                self.condition.notify()
+
+    def cancel(self) -> None:
+        super().cancel()
+        with self.condition:
+            self.condition.notify()
+
+    def work(self) -> None:
+        with self.condition:
+            self.condition.wait_for(
+                lambda: self.message is not None or self.stopping.is_set()
+            )
+            message = self.message
+            if message is None:
+                return
+            if self.condition.wait_for(
+                lambda: self.message is not message or self.stopping.is_set(),
+                message.visibility_timeout / 2,
+            ):
+                return
+        # A settle racing this extension is harmless: ack deletes the
+        # message and requeue bumps its version, so the update no-ops.
+        try:
+            self.messaging_server.change_message_visibility(
+                messaging_api.ChangeMessageVisibilityRequest(
+                    message_id=message.id,
+                    version=message.version,
+                    visibility_timeout=message.visibility_timeout,
+                )
+            )
+            LOGGER.debug("extended message visibility: id=%s", message.id)
+        except IOError as err:
+            LOGGER.error(
+                "failed to extend message visibility: id=%s, err=%r", message.id, err
+            )
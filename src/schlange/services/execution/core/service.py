@@ -1,9 +1,13 @@
 import dataclasses
+import time
+from typing import Callable, TypeVar
 
-from .errors import NotFoundError
-from .handler import Handler, TaskExecution
+from .errors import AbortedError, NotFoundError
+from .handler import Handler
 from .task_service import TaskService
 
+T = TypeVar("T")
+
 
 @dataclasses.dataclass
 class ExecutionService:
@@ -11,32 +15,63 @@ class ExecutionService:
 
     handlers: dict[str, Handler]
     task_service: TaskService
+    # The Dispatcher publishes an execution before it commits it, so a
+    # consumer woken by the publish can claim it before the execution
+    # exists. The execution is loaded before the handler runs; while
+    # it is not committed, loading raises AbortedError and is retried
+    # with doubling backoff, about 0.6 s in total, then the AbortedError
+    # propagates and the message is requeued without running the
+    # handler. end_execution is retried the same way on conflicts.
+    retry_attempts: int = 7
+    retry_backoff: float = 0.01
 
     def execute(
         self,
         task_id: str,
         seq_num: int,
         kind: str,
-        args: dict,
     ) -> None:
         """Execute a task handler and record the result.
 
-        Looks up the handler by kind, runs it, then calls end_execution.
-        Handler exceptions are caught and recorded as the execution error.
-        end_execution exceptions propagate to the caller.
+        Looks up the handler by kind, loads the execution with the
+        task's args once it is committed, runs the handler, then calls
+        end_execution. A delivery of an ended execution is a duplicate
+        and returns without running the handler. Handler exceptions are
+        caught and recorded as the execution error. Task service
+        exceptions propagate to the caller.
 
         Raises:
-            NotFoundError: No handler registered for the kind.
-            AbortedError: Concurrent modification (from end_execution).
-            FailedPreconditionError: Task in wrong state (from end_execution).
+            NotFoundError: No handler registered for the kind, or no such
+                task.
+            AbortedError: Concurrent modification, or the execution is not
+                committed yet (after retries).
+            FailedPreconditionError: No such execution.
         """
         handler = self.handlers.get(kind)
         if handler is None:
             raise NotFoundError(f"no handler registered for kind: {kind}")
-        execution = TaskExecution(task_id=task_id, seq_num=seq_num, args=args)
+        execution = self._retry(
+            lambda: self.task_service.get_execution(task_id, seq_num)
+        )
+        if execution is None:
+            return
         error: str | None = None
         try:
             handler(execution)
         except Exception as exc:
             error = str(exc)
-        self.task_service.end_execution(task_id, seq_num, error)
+        self._retry(lambda: self.task_service.end_execution(task_id, seq_num, error))
+
+    def _retry(self, call: Callable[[], T]) -> T:
+        """Calls ``call``, retrying on AbortedError with doubling backoff."""
+        backoff = self.retry_backoff
+        attempt = 1
+        while True:
+            try:
+                return call()
+            except AbortedError:
+                if attempt >= self.retry_attempts:
+                    raise
+            time.sleep(backoff)
+            backoff *= 2
+            attempt += 1
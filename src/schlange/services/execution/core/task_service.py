@@ -1,9 +1,17 @@
 import typing
 
+from .handler import TaskExecution
+
 
 class TaskService(typing.Protocol):
     """Driven port for task lifecycle operations."""
 
+    def get_execution(
+        self, task_id: str, seq_num: int
+    ) -> typing.Optional[TaskExecution]:
+        """Returns the execution to run, or None if it has already ended."""
+        ...
+
     def end_execution(
         self, task_id: str, seq_num: int, error: typing.Optional[str]
     ) -> None: ...
@@ -23,26 +23,112 @@ class Server:
             queue=request.queue,
             payload=request.payload,
             visibility_timeout=request.visibility_timeout,
+            delay=request.delay,
+            priority=request.priority,
+            group_id=request.group_id,
+            expires_at=request.expires_at,
         )
         return messaging.PublishMessageResponse(message_id=message_id)
 
+    def publish_messages(
+        self, request: messaging.PublishMessagesRequest
+    ) -> messaging.PublishMessagesResponse:
+        message_ids = self.service.publish_messages(
+            [
+                core.NewMessage(
+                    queue=r.queue,
+                    payload=r.payload,
+                    visibility_timeout=r.visibility_timeout,
+                    delay=r.delay,
+                    priority=r.priority,
+                    group_id=r.group_id,
+                    expires_at=r.expires_at,
+                )
+                for r in request.requests
+            ]
+        )
+        return messaging.PublishMessagesResponse(message_ids=message_ids)
+
     def claim_message(
         self, request: messaging.ClaimMessageRequest
     ) -> messaging.ClaimMessageResponse:
-        result = self.service.claim_message(request.queue)
-        return messaging.ClaimMessageResponse(
-            message=messaging.Message(
-                id=result.id,
-                queue=result.queue,
-                payload=result.payload,
-                visibility_timeout=result.visibility_timeout,
-                delivery_count=result.delivery_count,
-                version=result.version,
-            )
+        result = self.service.claim_message(request.queue, request.wait_time)
+        return messaging.ClaimMessageResponse(message=self._dump_message(result))
+
+    def claim_messages(
+        self, request: messaging.ClaimMessagesRequest
+    ) -> messaging.ClaimMessagesResponse:
+        result = self.service.claim_messages(
+            request.queue, request.max_count, request.wait_time
+        )
+        return messaging.ClaimMessagesResponse(
+            messages=[self._dump_message(message) for message in result]
         )
 
     def ack_message(self, request: messaging.AckMessageRequest) -> None:
         self.service.ack_message(request.message_id, request.version)
 
+    def ack_messages(
+        self, request: messaging.AckMessagesRequest
+    ) -> messaging.AckMessagesResponse:
+        acked = self.service.ack_messages(
+            [(r.message_id, r.version) for r in request.requests]
+        )
+        return messaging.AckMessagesResponse(acked=acked)
+
     def requeue_message(self, request: messaging.RequeueMessageRequest) -> None:
         self.service.requeue_message(request.message_id, request.version)
+
+    def requeue_messages(
+        self, request: messaging.RequeueMessagesRequest
+    ) -> messaging.RequeueMessagesResponse:
+        requeued = self.service.requeue_messages(
+            [(r.message_id, r.version) for r in request.requests]
+        )
+        return messaging.RequeueMessagesResponse(requeued=requeued)
+
+    def change_message_visibility(
+        self, request: messaging.ChangeMessageVisibilityRequest
+    ) -> None:
+        self.service.change_message_visibility(
+            request.message_id, request.version, request.visibility_timeout
+        )
+
+    def get_queue_stats(
+        self, request: messaging.GetQueueStatsRequest
+    ) -> messaging.GetQueueStatsResponse:
+        stats = self.service.get_queue_stats(request.queue)
+        return messaging.GetQueueStatsResponse(
+            visible=stats.visible,
+            in_flight=stats.in_flight,
+            delayed=stats.delayed,
+            published=stats.published,
+            acked=stats.acked,
+            requeued=stats.requeued,
+            dead_lettered=stats.dead_lettered,
+            expired=stats.expired,
+        )
+
+    def redrive_messages(
+        self, request: messaging.RedriveMessagesRequest
+    ) -> messaging.RedriveMessagesResponse:
+        redriven = self.service.redrive_messages(
+            request.dead_letter_queue, request.target_queue, request.limit
+        )
+        return messaging.RedriveMessagesResponse(redriven=redriven)
+
+    def purge_queue(
+        self, request: messaging.PurgeQueueRequest
+    ) -> messaging.PurgeQueueResponse:
+        purged = self.service.purge_queue(request.queue, request.older_than)
+        return messaging.PurgeQueueResponse(purged=purged)
+
+    def _dump_message(self, message: core.Message) -> messaging.Message:
+        return messaging.Message(
+            id=message.id,
+            queue=message.queue,
+            payload=message.payload,
+            visibility_timeout=message.visibility_timeout,
+            delivery_count=message.delivery_count,
+            version=message.version,
+        )
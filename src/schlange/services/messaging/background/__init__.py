@@ -0,0 +1,5 @@
+from .reaper import Reaper
+
+__all__ = [
+    "Reaper",
+]
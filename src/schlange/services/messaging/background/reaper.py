@@ -0,0 +1,13 @@
+from schlange.internal import background
+from schlange.services.messaging import core
+
+
+class Reaper(background.Worker):
+    """Periodically deletes expired messages."""
+
+    def __init__(self, service: core.Service, interval: float) -> None:
+        super().__init__(name="MessagingReaper", interval=interval)
+        self.service = service
+
+    def work(self) -> None:
+        self.service.delete_expired_messages()
@@ -1,23 +1,29 @@
 from .errors import (
     Error,
+    InvalidArgumentError,
     MessageNotFoundError,
     NoMessagesAvailable,
     QueueAlreadyExistsError,
     QueueNotFoundError,
 )
 from .message import Message
+from .new_message import NewMessage
 from .queue import Queue
+from .queue_stats import QueueStats
 from .service import Service
 from .store import Store
 
 __all__ = [
     "Error",
+    "InvalidArgumentError",
     "Message",
     "MessageNotFoundError",
+    "NewMessage",
     "NoMessagesAvailable",
     "Queue",
     "QueueAlreadyExistsError",
     "QueueNotFoundError",
+    "QueueStats",
     "Service",
     "Store",
 ]
@@ -16,3 +16,7 @@ class MessageNotFoundError(Error):
 
 class NoMessagesAvailable(Error):
     pass
+
+
+class InvalidArgumentError(Error):
+    pass
@@ -9,5 +9,12 @@ class Message:
     payload: bytes
     visibility_timeout: float
     delivery_count: int
+    visible_at: datetime.datetime
     created_at: datetime.datetime
     version: int
+    # Higher priorities are claimed first.
+    priority: int = 0
+    # Messages of a group are claimed one at a time, in publish order.
+    group_id: str | None = None
+    # Expired messages are not claimed and are eventually deleted.
+    expires_at: datetime.datetime | None = None
@@ -0,0 +1,15 @@
+import dataclasses
+import datetime
+
+
+@dataclasses.dataclass
+class NewMessage:
+    """A message to be published; the service assigns id and timestamps."""
+
+    queue: str
+    payload: bytes
+    visibility_timeout: float
+    delay: float = 0.0
+    priority: int = 0
+    group_id: str | None = None
+    expires_at: datetime.datetime | None = None
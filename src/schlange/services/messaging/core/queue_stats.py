@@ -0,0 +1,25 @@
+import dataclasses
+
+
+@dataclasses.dataclass
+class QueueStats:
+    """
+    A queue's depth split by state as of ``now``, plus cumulative
+    counters since the queue was declared.
+
+    ``in_flight`` counts claimed messages whose visibility timeout has
+    not lapsed; ``delayed`` counts never-claimed messages published with
+    a delay that has not passed. ``dead_lettered`` counts messages that
+    reached the delivery limit, whether moved to the DLQ or dropped;
+    ``expired`` counts messages deleted by the expiry sweep.
+    """
+
+    queue: str
+    visible: int
+    in_flight: int
+    delayed: int
+    published: int
+    acked: int
+    requeued: int
+    dead_lettered: int
+    expired: int
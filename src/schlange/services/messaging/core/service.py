@@ -1,15 +1,28 @@
 import dataclasses
 import datetime
+import time
 import uuid
 
+from .errors import InvalidArgumentError, NoMessagesAvailable
 from .message import Message
+from .new_message import NewMessage
+from .queue import Queue
+from .queue_stats import QueueStats
 from .store import Store
+from .wakeups import Wakeups
 
 
 @dataclasses.dataclass
 class Service:
 
     store: Store
+    wakeups: Wakeups = dataclasses.field(default_factory=Wakeups)
+    # Queues are immutable once declared, so cached entries never go
+    # stale.
+    queues: dict[str, Queue] = dataclasses.field(default_factory=dict)
+    # Messages moved or deleted per transaction by bulk operations;
+    # bounds how long each holds the write lock.
+    bulk_chunk_size: int = 1000
 
     def declare_queue(
         self,
@@ -17,46 +30,258 @@ class Service:
         dead_letter_queue: str | None,
         max_delivery_count: int,
     ) -> None:
-        self.store.create_queue(
-            name, dead_letter_queue, max_delivery_count, self._now()
+        now = self._now()
+        self.store.create_queue(name, dead_letter_queue, max_delivery_count, now)
+        self.queues[name] = Queue(
+            name=name,
+            dead_letter_queue=dead_letter_queue,
+            max_delivery_count=max_delivery_count,
+            created_at=now,
         )
 
-    def find_queue(self, name: str):
-        return self.store.find_queue(name)
+    def find_queue(self, name: str) -> Queue:
+        queue = self.queues.get(name)
+        if queue is None:
+            queue = self.queues[name] = self.store.find_queue(name)
+        return queue
 
     def publish_message(
         self,
         queue: str,
         payload: bytes,
         visibility_timeout: float,
+        delay: float = 0.0,
+        priority: int = 0,
+        group_id: str | None = None,
+        expires_at: datetime.datetime | None = None,
     ) -> str:
+        """
+        Publishes a message that becomes claimable after ``delay``
+        seconds, ahead of visible messages of lower ``priority``. A
+        message with a ``group_id`` waits until the messages published
+        to the group before it are acked or dead-lettered. Once
+        ``expires_at`` passes, the message is no longer claimed.
+        """
         message_id = str(uuid.uuid4())
+        now = self._now()
         self.store.publish_message(
-            message_id, queue, payload, visibility_timeout, self._now()
+            message_id,
+            queue,
+            payload,
+            visibility_timeout,
+            now,
+            now + datetime.timedelta(seconds=delay),
+            priority,
+            group_id,
+            expires_at,
         )
+        self._notify(queue, delay)
         return message_id
 
-    def claim_message(self, queue: str) -> Message:
-        return self.store.claim_message(queue, self._now())
+    def publish_messages(self, messages: list[NewMessage]) -> list[str]:
+        """Publishes all messages in one transaction, all or nothing."""
+        if not messages:
+            return []
+        now = self._now()
+        batch = [
+            Message(
+                id=str(uuid.uuid4()),
+                queue=m.queue,
+                payload=m.payload,
+                visibility_timeout=m.visibility_timeout,
+                delivery_count=0,
+                visible_at=now + datetime.timedelta(seconds=m.delay),
+                created_at=now,
+                version=0,
+                priority=m.priority,
+                group_id=m.group_id,
+                expires_at=m.expires_at,
+            )
+            for m in messages
+        ]
+        self.store.publish_messages(batch)
+        for queue in {m.queue for m in messages if m.delay <= 0}:
+            self.wakeups.notify(queue)
+        for m in messages:
+            if m.delay > 0:
+                self.wakeups.schedule(m.queue, m.delay)
+        return [m.id for m in batch]
+
+    def claim_message(self, queue: str, wait_time: float = 0.0) -> Message:
+        """
+        Claims one message. If none is available, blocks for up to
+        ``wait_time`` seconds until a publish to ``queue`` in this
+        process makes one available, then raises NoMessagesAvailable.
+        """
+        deadline = time.monotonic() + wait_time
+        while True:
+            generation = self.wakeups.generation(queue)
+            try:
+                return self.store.claim_message(queue, self._now())
+            except NoMessagesAvailable:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    raise
+            self.wakeups.wait(queue, generation, timeout)
+
+    def claim_messages(
+        self, queue: str, max_count: int, wait_time: float = 0.0
+    ) -> list[Message]:
+        """
+        Claims up to ``max_count`` messages, long-polling like
+        ``claim_message``. Returns an empty list once ``wait_time``
+        elapses without a message.
+        """
+        if max_count <= 0:
+            return []
+        deadline = time.monotonic() + wait_time
+        while True:
+            generation = self.wakeups.generation(queue)
+            messages = self.store.claim_messages(queue, max_count, self._now())
+            timeout = deadline - time.monotonic()
+            if messages or timeout <= 0:
+                return messages
+            self.wakeups.wait(queue, generation, timeout)
+
+    def wake_claimers(self) -> None:
+        """
+        Wakes every long-polling claimer so it retries its claim.
+        Called when the store may have changed behind the service's
+        back, e.g. a publish committed by another process.
+        """
+        self.wakeups.notify_all()
 
     def ack_message(self, message_id: str, version: int) -> None:
         self.store.delete_message(message_id, version)
 
+    def ack_messages(self, messages: list[tuple[str, int]]) -> list[bool]:
+        """
+        Acks (message_id, version) pairs in one transaction. Returns,
+        per pair, whether the ack took effect (False on version
+        conflict).
+        """
+        if not messages:
+            return []
+        return self.store.delete_messages(messages)
+
+    def requeue_messages(self, messages: list[tuple[str, int]]) -> list[bool]:
+        """
+        Requeues (message_id, version) pairs in one transaction,
+        routing each message past its queue's max_delivery_count to
+        the DLQ (or dropping it). Returns, per pair, whether the
+        requeue took effect (False on version conflict).
+        """
+        if not messages:
+            return []
+        return self.store.requeue_messages(messages, self._now())
+
     def requeue_message(self, message_id: str, version: int) -> None:
-        message = self.store.find_message(message_id)
-        queue = self.store.find_queue(message.queue)
-        if message.delivery_count >= queue.max_delivery_count:
-            if queue.dead_letter_queue is not None:
-                self.store.move_message_to_dlq(
-                    message_id, version, queue.dead_letter_queue, self._now()
-                )
-            else:
-                self.store.delete_message(message_id, version)
-        else:
-            self.store.requeue_message(message_id, version, self._now())
+        """
+        Requeues a message, or moves it to the DLQ (or drops it) once
+        it reached max_delivery_count. The check and the routing run
+        in one store transaction.
+        """
+        self.store.requeue_message(message_id, version, self._now())
+
+    def change_message_visibility(
+        self, message_id: str, version: int, visibility_timeout: float
+    ) -> None:
+        """
+        Makes a claimed message invisible for ``visibility_timeout``
+        seconds from now, e.g. to keep a long-running handler from
+        having its message redelivered. The version is left as is, so
+        the claimer can still ack or requeue it.
+        """
+        self.store.change_message_visibility(
+            message_id,
+            version,
+            self._now() + datetime.timedelta(seconds=visibility_timeout),
+        )
 
     def find_message(self, message_id: str) -> Message:
         return self.store.find_message(message_id)
 
+    def get_queue_stats(self, queue: str) -> QueueStats:
+        return self.store.get_queue_stats(queue, self._now())
+
+    def redrive_messages(
+        self,
+        dead_letter_queue: str,
+        target_queue: str,
+        limit: int | None = None,
+    ) -> int:
+        """
+        Moves up to ``limit`` (all if None) visible messages from
+        ``dead_letter_queue`` to ``target_queue``, one transaction per
+        chunk, so consumers keep claiming in between. Returns how many
+        moved.
+
+        At most the messages in ``dead_letter_queue`` at the start are
+        moved, so a queue that keeps being refilled does not keep the
+        redrive running.
+
+        Raises:
+            InvalidArgumentError: Both queues are the same.
+        """
+        if dead_letter_queue == target_queue:
+            raise InvalidArgumentError(
+                f"cannot redrive queue {dead_letter_queue!r} into itself"
+            )
+        self.find_queue(dead_letter_queue)
+        self.find_queue(target_queue)
+        stats = self.store.get_queue_stats(dead_letter_queue, self._now())
+        backlog = stats.visible + stats.in_flight + stats.delayed
+        limit = backlog if limit is None else min(limit, backlog)
+        redriven = 0
+        while redriven < limit:
+            max_count = min(self.bulk_chunk_size, limit - redriven)
+            moved = self.store.redrive_messages(
+                dead_letter_queue, target_queue, max_count, self._now()
+            )
+            redriven += moved
+            if moved:
+                self.wakeups.notify(target_queue)
+            if moved < max_count:
+                break
+        return redriven
+
+    def purge_queue(self, queue: str, older_than: float | None = None) -> int:
+        """
+        Deletes the queue's messages published more than ``older_than``
+        seconds ago (all if None), including in-flight ones, one
+        transaction per chunk. Returns how many were deleted.
+        """
+        self.find_queue(queue)
+        created_before = None
+        if older_than is not None:
+            created_before = self._now() - datetime.timedelta(seconds=older_than)
+        purged = 0
+        while True:
+            deleted = self.store.purge_messages(
+                queue, created_before, self.bulk_chunk_size
+            )
+            purged += deleted
+            if deleted < self.bulk_chunk_size:
+                return purged
+
+    def delete_expired_messages(self) -> int:
+        """
+        Deletes messages whose ``expires_at`` has passed, one
+        transaction per chunk. Returns how many were deleted.
+        """
+        now = self._now()
+        expired = 0
+        while True:
+            deleted = self.store.delete_expired_messages(now, self.bulk_chunk_size)
+            expired += deleted
+            if deleted < self.bulk_chunk_size:
+                return expired
+
+    def _notify(self, queue: str, delay: float) -> None:
+        if delay > 0:
+            self.wakeups.schedule(queue, delay)
+        else:
+            self.wakeups.notify(queue)
+
     def _now(self) -> datetime.datetime:
         return datetime.datetime.now(datetime.UTC)
@@ -3,6 +3,7 @@ from typing import Protocol
 
 from .message import Message
 from .queue import Queue
+from .queue_stats import QueueStats
 
 
 class Store(Protocol):
@@ -34,7 +35,21 @@ class Store(Protocol):
         payload: bytes,
         visibility_timeout: float,
         created_at: datetime.datetime,
-    ) -> None: ...
+        visible_at: datetime.datetime | None = None,
+        priority: int = 0,
+        group_id: str | None = None,
+        expires_at: datetime.datetime | None = None,
+    ) -> None:
+        """
+        Publishes a message that becomes claimable at ``visible_at``,
+        or immediately if it is None. A message with a ``group_id`` is
+        claimable only while it is the oldest of its group in the
+        queue, so a group is delivered one message at a time, in
+        order. Claims skip the message once ``expires_at`` has passed.
+        """
+        ...
+
+    def publish_messages(self, messages: list[Message]) -> None: ...
 
     def claim_message(
         self,
@@ -42,21 +57,103 @@ class Store(Protocol):
         now: datetime.datetime,
     ) -> Message: ...
 
+    def claim_messages(
+        self,
+        queue: str,
+        max_count: int,
+        now: datetime.datetime,
+    ) -> list[Message]:
+        """
+        Claims up to ``max_count`` visible messages, highest priority
+        first, then earliest visible first.
+        Returns an empty list instead of raising when none are
+        available.
+        """
+        ...
+
     def delete_message(self, message_id: str, version: int) -> None: ...
 
+    def delete_messages(self, messages: list[tuple[str, int]]) -> list[bool]:
+        """
+        Deletes (message_id, version) pairs. Returns, per pair,
+        whether a message was deleted.
+        """
+        ...
+
     def requeue_message(
         self,
         message_id: str,
         version: int,
         now: datetime.datetime,
-    ) -> None: ...
+    ) -> None:
+        """
+        Requeues a message, applying its queue's delivery limit like
+        ``requeue_messages``.
+        """
+        ...
+
+    def requeue_messages(
+        self,
+        messages: list[tuple[str, int]],
+        now: datetime.datetime,
+    ) -> list[bool]:
+        """
+        Requeues (message_id, version) pairs, applying the queue's
+        delivery limit: a message whose delivery_count reached
+        max_delivery_count moves to the dead-letter queue, or is
+        deleted if the queue has none. Returns, per pair, whether the
+        message was settled.
+        """
+        ...
 
-    def move_message_to_dlq(
+    def change_message_visibility(
         self,
         message_id: str,
         version: int,
-        dlq_queue: str,
-        now: datetime.datetime,
+        visible_at: datetime.datetime,
     ) -> None: ...
 
     def find_message(self, message_id: str) -> Message: ...
+
+    def get_queue_stats(self, queue: str, now: datetime.datetime) -> QueueStats:
+        """
+        Returns the queue's stats without counting its backlog: only
+        messages not yet visible at ``now`` are visited.
+        """
+        ...
+
+    def redrive_messages(
+        self,
+        dead_letter_queue: str,
+        target_queue: str,
+        max_count: int,
+        now: datetime.datetime,
+    ) -> int:
+        """
+        Moves up to ``max_count`` messages visible at ``now`` from
+        ``dead_letter_queue`` to ``target_queue`` as fresh deliveries
+        (delivery_count reset, visible at ``now``). Returns how many
+        moved.
+        """
+        ...
+
+    def delete_expired_messages(self, now: datetime.datetime, max_count: int) -> int:
+        """
+        Deletes up to ``max_count`` messages, in any queue and claimed
+        or not, whose ``expires_at`` is at or before ``now``. Returns
+        how many were deleted.
+        """
+        ...
+
+    def purge_messages(
+        self,
+        queue: str,
+        created_before: datetime.datetime | None,
+        max_count: int,
+    ) -> int:
+        """
+        Deletes up to ``max_count`` of the queue's messages created
+        before ``created_before`` (any if None). Returns how many were
+        deleted.
+        """
+        ...
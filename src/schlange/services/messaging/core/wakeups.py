@@ -0,0 +1,72 @@
+import heapq
+import threading
+import time
+
+
+class Wakeups:
+    """
+    Per-queue condition variables that let claimers block until a
+    message is published to their queue in this process.
+
+    Each queue has a generation counter bumped on every notify. A
+    claimer reads the generation before trying to claim and, on a miss,
+    waits for it to change, so a publish that lands between the failed
+    claim and the wait is not lost.
+
+    Delayed publishes are scheduled instead: waiters cut their wait
+    short at the earliest pending due time of their queue, when the
+    delayed message becomes claimable.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.conditions: dict[str, threading.Condition] = {}
+        self.generations: dict[str, int] = {}
+        self.due: dict[str, list[float]] = {}
+
+    def generation(self, queue: str) -> int:
+        with self.lock:
+            return self.generations.get(queue, 0)
+
+    def wait(self, queue: str, generation: int, timeout: float) -> None:
+        with self.lock:
+            condition = self._condition(queue)
+            due = self._pending_due(queue)
+            if due:
+                timeout = min(timeout, due[0] - time.monotonic())
+            condition.wait_for(
+                lambda: self.generations.get(queue, 0) != generation, timeout
+            )
+
+    def notify(self, queue: str) -> None:
+        with self.lock:
+            self.generations[queue] = self.generations.get(queue, 0) + 1
+            self._condition(queue).notify_all()
+
+    def schedule(self, queue: str, delay: float) -> None:
+        """Wakes waiters on ``queue`` now and again in ``delay`` seconds."""
+        with self.lock:
+            heapq.heappush(self.due.setdefault(queue, []), time.monotonic() + delay)
+            self._pending_due(queue)
+            self.generations[queue] = self.generations.get(queue, 0) + 1
+            self._condition(queue).notify_all()
+
+    def notify_all(self) -> None:
+        with self.lock:
+            for queue, condition in self.conditions.items():
+                self.generations[queue] = self.generations.get(queue, 0) + 1
+                condition.notify_all()
+
+    def _condition(self, queue: str) -> threading.Condition:
+        condition = self.conditions.get(queue)
+        if condition is None:
+            condition = threading.Condition(self.lock)
+            self.conditions[queue] = condition
+        return condition
+
+    def _pending_due(self, queue: str) -> list[float]:
+        due = self.due.get(queue, [])
+        now = time.monotonic()
+        while due and due[0] <= now:
+            heapq.heappop(due)
+        return due
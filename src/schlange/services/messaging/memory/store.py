@@ -0,0 +1,393 @@
+import collections
+import dataclasses
+import datetime
+import heapq
+import itertools
+import threading
+
+from schlange.services.messaging import core
+
+# (visible_at, created_at, seq, message_id); seq breaks ties and
+# identifies the entry, so superseded entries can be skipped lazily.
+HeapEntry = tuple[datetime.datetime, datetime.datetime, int, str]
+
+
+class Store:
+    """
+    In-memory messaging store for single-process deployments and
+    benchmarks. Nothing survives the process.
+
+    Each queue keeps a heap of its messages per priority, ordered by
+    ``visible_at``, then ``created_at``; claims drain the heaps highest
+    priority first, matching the SQLite store's claim order. Every
+    change of a message's ``visible_at`` or queue pushes a new heap
+    entry and supersedes the old one, which is dropped when it reaches
+    the top. Only a group's head is on a heap; the rest of the group
+    waits in ``groups`` until the head leaves the queue. A single lock
+    makes every method atomic, standing in for the SQLite store's
+    transactions. ``get_queue_stats`` keeps the
+    SQLite store's counters but splits depth by state with a scan.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.queues: dict[str, core.Queue] = {}
+        self.messages: dict[str, core.Message] = {}
+        self.heaps: dict[str, dict[int, list[HeapEntry]]] = {}
+        self.entries: dict[str, int] = {}
+        # Message ids per (queue, group_id), oldest first.
+        self.groups: dict[tuple[str, str], list[str]] = {}
+        self.seq = itertools.count()
+        self.stats: dict[str, collections.Counter[str]] = {}
+
+    def create_queue(
+        self,
+        name: str,
+        dead_letter_queue: str | None,
+        max_delivery_count: int,
+        created_at: datetime.datetime,
+    ) -> None:
+        with self.lock:
+            if name in self.queues:
+                raise core.QueueAlreadyExistsError(name)
+            if dead_letter_queue is not None and dead_letter_queue not in self.queues:
+                raise core.QueueNotFoundError(dead_letter_queue)
+            self.queues[name] = core.Queue(
+                name=name,
+                dead_letter_queue=dead_letter_queue,
+                max_delivery_count=max_delivery_count,
+                created_at=created_at,
+            )
+            self.heaps[name] = {}
+            self.stats[name] = collections.Counter()
+
+    def find_queue(self, name: str) -> core.Queue:
+        with self.lock:
+            try:
+                return dataclasses.replace(self.queues[name])
+            except KeyError:
+                raise core.QueueNotFoundError(name) from None
+
+    def publish_message(
+        self,
+        message_id: str,
+        queue: str,
+        payload: bytes,
+        visibility_timeout: float,
+        created_at: datetime.datetime,
+        visible_at: datetime.datetime | None = None,
+        priority: int = 0,
+        group_id: str | None = None,
+        expires_at: datetime.datetime | None = None,
+    ) -> None:
+        with self.lock:
+            if queue not in self.queues:
+                raise core.QueueNotFoundError(queue)
+            self._insert(
+                core.Message(
+                    id=message_id,
+                    queue=queue,
+                    payload=payload,
+                    visibility_timeout=visibility_timeout,
+                    delivery_count=0,
+                    visible_at=visible_at if visible_at is not None else created_at,
+                    created_at=created_at,
+                    version=0,
+                    priority=priority,
+                    group_id=group_id,
+                    expires_at=expires_at,
+                )
+            )
+
+    def publish_messages(self, messages: list[core.Message]) -> None:
+        with self.lock:
+            unknown = {m.queue for m in messages} - self.queues.keys()
+            if unknown:
+                raise core.QueueNotFoundError(", ".join(sorted(unknown)))
+            for message in messages:
+                self._insert(dataclasses.replace(message))
+
+    def claim_message(
+        self,
+        queue: str,
+        now: datetime.datetime,
+    ) -> core.Message:
+        messages = self.claim_messages(queue, 1, now)
+        if not messages:
+            raise core.NoMessagesAvailable(queue)
+        return messages[0]
+
+    def claim_messages(
+        self,
+        queue: str,
+        max_count: int,
+        now: datetime.datetime,
+    ) -> list[core.Message]:
+        claimed: list[core.Message] = []
+        with self.lock:
+            for message in self._visible(queue, max_count, now):
+                message.visible_at = now + datetime.timedelta(
+                    seconds=message.visibility_timeout
+                )
+                message.delivery_count += 1
+                message.version += 1
+                self._push(message)
+                claimed.append(dataclasses.replace(message))
+        return claimed
+
+    def delete_message(self, message_id: str, version: int) -> None:
+        with self.lock:
+            self._ack(message_id, version)
+
+    def delete_messages(self, messages: list[tuple[str, int]]) -> list[bool]:
+        with self.lock:
+            return [self._ack(message_id, version) for message_id, version in messages]
+
+    def requeue_message(
+        self,
+        message_id: str,
+        version: int,
+        now: datetime.datetime,
+    ) -> None:
+        with self.lock:
+            self._requeue(message_id, version, now)
+
+    def requeue_messages(
+        self,
+        messages: list[tuple[str, int]],
+        now: datetime.datetime,
+    ) -> list[bool]:
+        with self.lock:
+            return [
+                self._requeue(message_id, version, now)
+                for message_id, version in messages
+            ]
+
+    def change_message_visibility(
+        self,
+        message_id: str,
+        version: int,
+        visible_at: datetime.datetime,
+    ) -> None:
+        with self.lock:
+            message = self._find(message_id, version)
+            if message is None:
+                return
+            message.visible_at = visible_at
+            if not self._parked(message):
+                self._push(message)
+
+    def find_message(self, message_id: str) -> core.Message:
+        with self.lock:
+            try:
+                return dataclasses.replace(self.messages[message_id])
+            except KeyError:
+                raise core.MessageNotFoundError(message_id) from None
+
+    def get_queue_stats(self, queue: str, now: datetime.datetime) -> core.QueueStats:
+        with self.lock:
+            stats = self.stats.get(queue)
+            if stats is None:
+                raise core.QueueNotFoundError(queue)
+            not_visible = [
+                m
+                for m in self.messages.values()
+                if m.queue == queue and (m.visible_at > now or self._parked(m))
+            ]
+            delayed = sum(
+                1 for m in not_visible if m.delivery_count == 0 or self._parked(m)
+            )
+            return core.QueueStats(
+                queue=queue,
+                visible=stats["messages"] - len(not_visible),
+                in_flight=len(not_visible) - delayed,
+                delayed=delayed,
+                published=stats["published"],
+                acked=stats["acked"],
+                requeued=stats["requeued"],
+                dead_lettered=stats["dead_lettered"],
+                expired=stats["expired"],
+            )
+
+    def redrive_messages(
+        self,
+        dead_letter_queue: str,
+        target_queue: str,
+        max_count: int,
+        now: datetime.datetime,
+    ) -> int:
+        with self.lock:
+            if target_queue not in self.queues:
+                raise core.QueueNotFoundError(target_queue)
+            moved = 0
+            # Moving a group's head promotes the next message, so
+            # repeat until nothing is visible.
+            while moved < max_count:
+                messages = self._visible(dead_letter_queue, max_count - moved, now)
+                if not messages:
+                    break
+                for message in messages:
+                    self.stats[dead_letter_queue]["messages"] -= 1
+                    self.stats[target_queue]["messages"] += 1
+                    self._dequeue(message)
+                    message.queue = target_queue
+                    message.delivery_count = 0
+                    message.visible_at = now
+                    message.version += 1
+                    self._enqueue(message)
+                    moved += 1
+            return moved
+
+    def delete_expired_messages(self, now: datetime.datetime, max_count: int) -> int:
+        with self.lock:
+            expired = sorted(
+                (
+                    m
+                    for m in self.messages.values()
+                    if m.expires_at is not None and m.expires_at <= now
+                ),
+                key=lambda m: m.expires_at or now,
+            )[:max_count]
+            for message in expired:
+                self.stats[message.queue]["expired"] += 1
+                self._delete(message.id, message.version)
+            return len(expired)
+
+    def purge_messages(
+        self,
+        queue: str,
+        created_before: datetime.datetime | None,
+        max_count: int,
+    ) -> int:
+        with self.lock:
+            purged = [
+                m
+                for m in self.messages.values()
+                if m.queue == queue
+                and (created_before is None or m.created_at < created_before)
+            ][:max_count]
+            for message in purged:
+                self._delete(message.id, message.version)
+            return len(purged)
+
+    def _insert(self, message: core.Message) -> None:
+        self.messages[message.id] = message
+        self.stats[message.queue].update(messages=1, published=1)
+        self._enqueue(message)
+
+    def _enqueue(self, message: core.Message) -> None:
+        """Adds a message to its queue, parking it behind its group."""
+        if message.group_id is not None:
+            group = self.groups.setdefault((message.queue, message.group_id), [])
+            group.append(message.id)
+            if len(group) > 1:
+                return
+        self._push(message)
+
+    def _dequeue(self, message: core.Message) -> None:
+        """
+        Takes a message off its queue's heaps, promoting the next
+        message of its group if it was the head.
+        """
+        self.entries.pop(message.id, None)
+        if message.group_id is None:
+            return
+        key = (message.queue, message.group_id)
+        group = self.groups[key]
+        head = group[0] == message.id
+        group.remove(message.id)
+        if not group:
+            del self.groups[key]
+        elif head:
+            self._push(self.messages[group[0]])
+
+    def _parked(self, message: core.Message) -> bool:
+        if message.group_id is None:
+            return False
+        return self.groups[(message.queue, message.group_id)][0] != message.id
+
+    def _push(self, message: core.Message) -> None:
+        seq = next(self.seq)
+        self.entries[message.id] = seq
+        heapq.heappush(
+            self.heaps[message.queue].setdefault(message.priority, []),
+            (message.visible_at, message.created_at, seq, message.id),
+        )
+
+    def _visible(
+        self, queue: str, max_count: int, now: datetime.datetime
+    ) -> list[core.Message]:
+        """
+        Pops up to ``max_count`` messages visible at ``now``, highest
+        priority first. The caller must push each one back or delete it.
+        Expired messages are popped and left off the heaps until the
+        sweep deletes them.
+        """
+        messages: list[core.Message] = []
+        heaps = self.heaps.get(queue, {})
+        for priority in sorted(heaps, reverse=True):
+            heap = heaps[priority]
+            while heap and len(messages) < max_count and heap[0][0] <= now:
+                message = self._pop(heap)
+                if message is None:
+                    continue
+                if message.expires_at is not None and message.expires_at <= now:
+                    del self.entries[message.id]
+                    continue
+                messages.append(message)
+            if not heap:
+                del heaps[priority]
+        return messages
+
+    def _pop(self, heap: list[HeapEntry]) -> core.Message | None:
+        _, _, seq, message_id = heapq.heappop(heap)
+        if self.entries.get(message_id) != seq:
+            return None
+        return self.messages[message_id]
+
+    def _find(self, message_id: str, version: int) -> core.Message | None:
+        message = self.messages.get(message_id)
+        if message is None or message.version != version:
+            return None
+        return message
+
+    def _delete(self, message_id: str, version: int) -> bool:
+        message = self._find(message_id, version)
+        if message is None:
+            return False
+        del self.messages[message_id]
+        self._dequeue(message)
+        self.stats[message.queue]["messages"] -= 1
+        return True
+
+    def _ack(self, message_id: str, version: int) -> bool:
+        message = self._find(message_id, version)
+        if message is None:
+            return False
+        self.stats[message.queue]["acked"] += 1
+        return self._delete(message_id, version)
+
+    def _requeue(self, message_id: str, version: int, now: datetime.datetime) -> bool:
+        message = self._find(message_id, version)
+        if message is None:
+            return False
+        queue = self.queues[message.queue]
+        stats = self.stats[message.queue]
+        if message.delivery_count >= queue.max_delivery_count:
+            stats["dead_lettered"] += 1
+            if queue.dead_letter_queue is None:
+                return self._delete(message_id, version)
+            stats["messages"] -= 1
+            self.stats[queue.dead_letter_queue]["messages"] += 1
+            self._dequeue(message)
+            message.queue = queue.dead_letter_queue
+            message.delivery_count = 0
+            message.visible_at = now
+            message.version += 1
+            self._enqueue(message)
+            return True
+        stats["requeued"] += 1
+        message.visible_at = now
+        message.version += 1
+        self._push(message)
+        return True
@@ -1,7 +1,9 @@
 from .migrations import MIGRATIONS
+from .sharded_store import ShardedStore
 from .store import Store
 
 __all__ = [
     "MIGRATIONS",
+    "ShardedStore",
     "Store",
 ]
@@ -33,4 +33,411 @@ MIGRATIONS: list[Migration] = [
             """,
         ]
     ),
+    # Claims range-seek on (queue, visible_at) and read created_at from
+    # the index, so in-flight and delayed messages are never visited.
+    # The new index also serves the queue foreign key, which made the
+    # (queue, created_at) index redundant.
+    Migration(
+        statements=[
+            """
+            CREATE INDEX idx_messages_claim
+            ON messages(queue, visible_at, created_at)
+            """,
+            """
+            DROP INDEX idx_messages_queue_created
+            """,
+            """
+            DROP INDEX idx_messages_visible_at
+            """,
+        ]
+    ),
+    # Payloads above the store's offload threshold live in payloads,
+    # keyed by their SHA-256, so messages pages stay small. Identical
+    # payloads share one row, which goes with the last message using it.
+    Migration(
+        statements=[
+            """
+            CREATE TABLE payloads (
+                digest BLOB PRIMARY KEY,
+                data BLOB NOT NULL
+            )
+            """,
+            """
+            ALTER TABLE messages ADD COLUMN payload_digest BLOB
+            """,
+            """
+            CREATE INDEX idx_messages_payload_digest
+            ON messages(payload_digest)
+            WHERE payload_digest IS NOT NULL
+            """,
+            """
+            CREATE TRIGGER messages_release_payload
+            AFTER DELETE ON messages
+            WHEN OLD.payload_digest IS NOT NULL
+            BEGIN
+                DELETE FROM payloads
+                WHERE digest = OLD.payload_digest
+                  AND NOT EXISTS (
+                      SELECT 1
+                      FROM messages
+                      WHERE payload_digest = OLD.payload_digest
+                  );
+            END
+            """,
+        ]
+    ),
+    # Schema v2: an INTEGER PRIMARY KEY seq is the claim tie-breaker and
+    # the table key, so FIFO no longer rests on float created_at values,
+    # and the claim index shrinks to (queue, visible_at) with seq
+    # implied. Timestamps become integer microseconds. The message id
+    # stays as a unique secondary key for acks. Offloaded payloads are
+    # referenced by integer id rather than by their 32-byte digest.
+    Migration(
+        statements=[
+            """
+            DROP TRIGGER messages_release_payload
+            """,
+            """
+            CREATE TABLE payloads_v2 (
+                id INTEGER PRIMARY KEY,
+                digest BLOB NOT NULL,
+                data BLOB NOT NULL
+            )
+            """,
+            """
+            CREATE UNIQUE INDEX idx_payloads_digest ON payloads_v2(digest)
+            """,
+            """
+            INSERT INTO payloads_v2 (digest, data)
+            SELECT digest, data FROM payloads
+            """,
+            """
+            CREATE TABLE messages_v2 (
+                seq INTEGER PRIMARY KEY,
+                id TEXT NOT NULL,
+                queue TEXT NOT NULL,
+                payload BLOB NOT NULL,
+                payload_id INTEGER,
+                visibility_timeout REAL NOT NULL,
+                delivery_count INTEGER NOT NULL,
+                visible_at INTEGER NOT NULL,
+                created_at INTEGER NOT NULL,
+                version INTEGER NOT NULL,
+                FOREIGN KEY (queue) REFERENCES queues(name) ON DELETE CASCADE
+            )
+            """,
+            """
+            INSERT INTO messages_v2
+                (id, queue, payload, payload_id, visibility_timeout,
+                 delivery_count, visible_at, created_at, version)
+            SELECT id, queue, payload,
+                   (SELECT payloads_v2.id
+                    FROM payloads_v2
+                    WHERE payloads_v2.digest = messages.payload_digest),
+                   visibility_timeout, delivery_count,
+                   CAST(round(visible_at * 1000000) AS INTEGER),
+                   CAST(round(created_at * 1000000) AS INTEGER),
+                   version
+            FROM messages
+            ORDER BY created_at
+            """,
+            """
+            DROP TABLE messages
+            """,
+            """
+            DROP TABLE payloads
+            """,
+            """
+            ALTER TABLE messages_v2 RENAME TO messages
+            """,
+            """
+            ALTER TABLE payloads_v2 RENAME TO payloads
+            """,
+            """
+            CREATE UNIQUE INDEX idx_messages_id ON messages(id)
+            """,
+            """
+            CREATE INDEX idx_messages_claim ON messages(queue, visible_at)
+            """,
+            """
+            CREATE INDEX idx_messages_payload_id
+            ON messages(payload_id)
+            WHERE payload_id IS NOT NULL
+            """,
+            """
+            CREATE TRIGGER messages_release_payload
+            AFTER DELETE ON messages
+            WHEN OLD.payload_id IS NOT NULL
+            BEGIN
+                DELETE FROM payloads
+                WHERE id = OLD.payload_id
+                  AND NOT EXISTS (
+                      SELECT 1
+                      FROM messages
+                      WHERE payload_id = OLD.payload_id
+                  );
+            END
+            """,
+        ]
+    ),
+    # Per-queue stats, kept in the transactions that change them, so
+    # depth needs no count over the backlog. Triggers maintain what
+    # every write implies: depth, publishes, requeues and DLQ moves. A
+    # delete is an ack or a drop at the delivery limit, which only the
+    # statement knows, so the store counts those itself.
+    Migration(
+        statements=[
+            """
+            CREATE TABLE queue_stats (
+                queue TEXT PRIMARY KEY,
+                messages INTEGER NOT NULL DEFAULT 0,
+                published INTEGER NOT NULL DEFAULT 0,
+                acked INTEGER NOT NULL DEFAULT 0,
+                requeued INTEGER NOT NULL DEFAULT 0,
+                dead_lettered INTEGER NOT NULL DEFAULT 0,
+                FOREIGN KEY (queue) REFERENCES queues(name) ON DELETE CASCADE
+            ) WITHOUT ROWID
+            """,
+            """
+            INSERT INTO queue_stats (queue, messages, published)
+            SELECT name, count(messages.seq), count(messages.seq)
+            FROM queues
+            LEFT JOIN messages ON messages.queue = queues.name
+            GROUP BY name
+            """,
+            """
+            CREATE TRIGGER queues_insert_stats
+            AFTER INSERT ON queues
+            BEGIN
+                INSERT INTO queue_stats (queue) VALUES (NEW.name);
+            END
+            """,
+            """
+            CREATE TRIGGER messages_insert_stats
+            AFTER INSERT ON messages
+            BEGIN
+                UPDATE queue_stats
+                SET messages = messages + 1, published = published + 1
+                WHERE queue = NEW.queue;
+            END
+            """,
+            """
+            CREATE TRIGGER messages_delete_stats
+            AFTER DELETE ON messages
+            BEGIN
+                UPDATE queue_stats
+                SET messages = messages - 1
+                WHERE queue = OLD.queue;
+            END
+            """,
+            """
+            CREATE TRIGGER messages_move_stats
+            AFTER UPDATE OF queue ON messages
+            WHEN NEW.queue <> OLD.queue
+            BEGIN
+                UPDATE queue_stats
+                SET messages = messages - 1, dead_lettered = dead_lettered + 1
+                WHERE queue = OLD.queue;
+                UPDATE queue_stats
+                SET messages = messages + 1
+                WHERE queue = NEW.queue;
+            END
+            """,
+            # Claims bump delivery_count with the version; requeues only
+            # the version.
+            """
+            CREATE TRIGGER messages_requeue_stats
+            AFTER UPDATE OF version ON messages
+            WHEN NEW.queue = OLD.queue
+             AND NEW.delivery_count = OLD.delivery_count
+            BEGIN
+                UPDATE queue_stats
+                SET requeued = requeued + 1
+                WHERE queue = NEW.queue;
+            END
+            """,
+        ]
+    ),
+    # Redrive moves messages out of a DLQ, which is not dead-lettering:
+    # only count moves into the source queue's DLQ.
+    Migration(
+        statements=[
+            """
+            DROP TRIGGER messages_move_stats
+            """,
+            """
+            CREATE TRIGGER messages_move_stats
+            AFTER UPDATE OF queue ON messages
+            WHEN NEW.queue <> OLD.queue
+            BEGIN
+                UPDATE queue_stats
+                SET messages = messages - 1,
+                    dead_lettered = dead_lettered + (
+                        NEW.queue IS (
+                            SELECT dead_letter_queue
+                            FROM queues
+                            WHERE name = OLD.queue
+                        )
+                    )
+                WHERE queue = OLD.queue;
+                UPDATE queue_stats
+                SET messages = messages + 1
+                WHERE queue = NEW.queue;
+            END
+            """,
+        ]
+    ),
+    # Claims take the highest priority first. Each priority is a band
+    # of idx_messages_claim ordered by visible_at, so a claim seeks the
+    # visible head of one band at a time.
+    Migration(
+        statements=[
+            """
+            ALTER TABLE messages ADD COLUMN priority INTEGER NOT NULL DEFAULT 0
+            """,
+            """
+            DROP INDEX idx_messages_claim
+            """,
+            """
+            CREATE INDEX idx_messages_claim
+            ON messages (queue, priority DESC, visible_at)
+            """,
+        ]
+    ),
+    # Message groups. Only a group's head, its oldest message in the
+    # queue, is claimable; the rest are parked, and parked messages sit
+    # in their own range of idx_messages_claim, so claims never visit
+    # them. Publishing into a group that has messages parks the new
+    # message; the triggers promote the next message when the head is
+    # deleted or leaves the queue, and park a message that moves into a
+    # queue where its group already has one.
+    Migration(
+        statements=[
+            """
+            ALTER TABLE messages ADD COLUMN group_id TEXT
+            """,
+            """
+            ALTER TABLE messages ADD COLUMN parked INTEGER NOT NULL DEFAULT 0
+            """,
+            """
+            DROP INDEX idx_messages_claim
+            """,
+            """
+            CREATE INDEX idx_messages_claim
+            ON messages (queue, parked, priority DESC, visible_at)
+            """,
+            """
+            CREATE INDEX idx_messages_group
+            ON messages (queue, group_id)
+            WHERE group_id IS NOT NULL
+            """,
+            """
+            CREATE TRIGGER messages_delete_group
+            AFTER DELETE ON messages
+            WHEN OLD.group_id IS NOT NULL AND NOT OLD.parked
+            BEGIN
+                UPDATE messages
+                SET parked = 0
+                WHERE seq = (
+                    SELECT min(seq)
+                    FROM messages
+                    WHERE queue = OLD.queue AND group_id = OLD.group_id
+                );
+            END
+            """,
+            """
+            CREATE TRIGGER messages_move_group
+            AFTER UPDATE OF queue ON messages
+            WHEN NEW.queue <> OLD.queue AND NEW.group_id IS NOT NULL
+            BEGIN
+                UPDATE messages
+                SET parked = 0
+                WHERE NOT OLD.parked
+                  AND seq = (
+                      SELECT min(seq)
+                      FROM messages
+                      WHERE queue = OLD.queue AND group_id = OLD.group_id
+                  );
+                UPDATE messages
+                SET parked = EXISTS (
+                    SELECT 1
+                    FROM messages
+                    WHERE queue = NEW.queue
+                      AND group_id = NEW.group_id
+                      AND seq <> NEW.seq
+                )
+                WHERE seq = NEW.seq;
+            END
+            """,
+        ]
+    ),
+    # Message expiry. Claims skip expired messages and the reaper
+    # deletes them in expires_at order, walking the partial index.
+    Migration(
+        statements=[
+            """
+            ALTER TABLE messages ADD COLUMN expires_at INTEGER
+            """,
+            """
+            CREATE INDEX idx_messages_expires_at ON messages (expires_at)
+            WHERE expires_at IS NOT NULL
+            """,
+            """
+            ALTER TABLE queue_stats ADD COLUMN expired INTEGER NOT NULL DEFAULT 0
+            """,
+        ]
+    ),
+    # Parked messages per queue, so stats need no count over them.
+    # Triggers on the column itself cover every way a message is
+    # parked or leaves the count: publish, promotion by the group
+    # triggers, delete and moves between queues.
+    Migration(
+        statements=[
+            """
+            ALTER TABLE queue_stats ADD COLUMN parked INTEGER NOT NULL DEFAULT 0
+            """,
+            """
+            UPDATE queue_stats
+            SET parked = (
+                SELECT count(*)
+                FROM messages
+                WHERE queue = queue_stats.queue AND parked = 1
+            )
+            """,
+            """
+            CREATE TRIGGER messages_insert_parked_stats
+            AFTER INSERT ON messages
+            WHEN NEW.parked
+            BEGIN
+                UPDATE queue_stats
+                SET parked = parked + 1
+                WHERE queue = NEW.queue;
+            END
+            """,
+            """
+            CREATE TRIGGER messages_delete_parked_stats
+            AFTER DELETE ON messages
+            WHEN OLD.parked
+            BEGIN
+                UPDATE queue_stats
+                SET parked = parked - 1
+                WHERE queue = OLD.queue;
+            END
+            """,
+            """
+            CREATE TRIGGER messages_update_parked_stats
+            AFTER UPDATE OF queue, parked ON messages
+            WHEN NEW.parked <> OLD.parked
+              OR (OLD.parked AND NEW.queue <> OLD.queue)
+            BEGIN
+                UPDATE queue_stats
+                SET parked = parked - OLD.parked
+                WHERE queue = OLD.queue;
+                UPDATE queue_stats
+                SET parked = parked + NEW.parked
+                WHERE queue = NEW.queue;
+            END
+            """,
+        ]
+    ),
 ]
@@ -0,0 +1,274 @@
+import collections
+import datetime
+import itertools
+import threading
+import zlib
+from typing import Callable
+
+from schlange.services.messaging import core
+
+from .store import Store
+
+
+class ShardedStore:
+    """
+    Spreads queues over several SQLite stores, each with its own
+    database file, so claims and acks on unrelated queues do not
+    contend on one write lock.
+
+    A queue without a DLQ lives in the shard its name hashes to. A
+    queue with a DLQ lives in its DLQ's shard, because requeue moves
+    messages to the DLQ inside one transaction. Queue and message
+    locations are cached as they are learned; a miss, e.g. for a
+    queue declared or a message claimed by another process, probes
+    the shards with read-only lookups. Message locations are kept for
+    the ``message_cache_size`` most recently claimed or looked up
+    messages only: messages that expire, are purged or dead-lettered,
+    or fail a version check are never settled here, so an unbounded
+    cache would keep them forever.
+
+    Every operation stays atomic within its shard. ``publish_messages``
+    and the batch settles run one transaction per shard touched.
+    """
+
+    def __init__(self, shards: list[Store], message_cache_size: int = 10_000) -> None:
+        self.shards = shards
+        self.queue_shards: dict[str, Store] = {}
+        self.message_cache_size = message_cache_size
+        # Least recently used first; shared by all claiming threads.
+        self.message_shards: collections.OrderedDict[str, Store] = (
+            collections.OrderedDict()
+        )
+        self.message_shards_lock = threading.Lock()
+
+    def create_queue(
+        self,
+        name: str,
+        dead_letter_queue: str | None,
+        max_delivery_count: int,
+        created_at: datetime.datetime,
+    ) -> None:
+        try:
+            self._queue_shard(name)
+        except core.QueueNotFoundError:
+            pass
+        else:
+            raise core.QueueAlreadyExistsError(name)
+        if dead_letter_queue is None:
+            shard = self.shards[zlib.crc32(name.encode()) % len(self.shards)]
+        else:
+            shard = self._queue_shard(dead_letter_queue)
+        shard.create_queue(name, dead_letter_queue, max_delivery_count, created_at)
+        self.queue_shards[name] = shard
+
+    def find_queue(self, name: str) -> core.Queue:
+        return self._queue_shard(name).find_queue(name)
+
+    def publish_message(
+        self,
+        message_id: str,
+        queue: str,
+        payload: bytes,
+        visibility_timeout: float,
+        created_at: datetime.datetime,
+        visible_at: datetime.datetime | None = None,
+        priority: int = 0,
+        group_id: str | None = None,
+        expires_at: datetime.datetime | None = None,
+    ) -> None:
+        self._queue_shard(queue).publish_message(
+            message_id,
+            queue,
+            payload,
+            visibility_timeout,
+            created_at,
+            visible_at,
+            priority,
+            group_id,
+            expires_at,
+        )
+
+    def publish_messages(self, messages: list[core.Message]) -> None:
+        # Resolve every queue before writing, so an unknown queue
+        # publishes nothing.
+        shards = [self._queue_shard(m.queue) for m in messages]
+        for shard, group in itertools.groupby(
+            sorted(zip(shards, messages), key=lambda pair: id(pair[0])),
+            key=lambda pair: pair[0],
+        ):
+            shard.publish_messages([message for _, message in group])
+
+    def claim_message(
+        self,
+        queue: str,
+        now: datetime.datetime,
+    ) -> core.Message:
+        try:
+            shard = self._queue_shard(queue)
+        except core.QueueNotFoundError:
+            raise core.NoMessagesAvailable(queue) from None
+        message = shard.claim_message(queue, now)
+        self._remember_message_shard(message.id, shard)
+        return message
+
+    def claim_messages(
+        self,
+        queue: str,
+        max_count: int,
+        now: datetime.datetime,
+    ) -> list[core.Message]:
+        try:
+            shard = self._queue_shard(queue)
+        except core.QueueNotFoundError:
+            return []
+        messages = shard.claim_messages(queue, max_count, now)
+        for message in messages:
+            self._remember_message_shard(message.id, shard)
+        return messages
+
+    def delete_message(self, message_id: str, version: int) -> None:
+        self.delete_messages([(message_id, version)])
+
+    def delete_messages(self, messages: list[tuple[str, int]]) -> list[bool]:
+        results = self._per_shard(
+            messages, lambda shard, batch: shard.delete_messages(batch)
+        )
+        for (message_id, _), deleted in zip(messages, results):
+            if deleted:
+                self._forget_message_shard(message_id)
+        return results
+
+    def requeue_message(
+        self,
+        message_id: str,
+        version: int,
+        now: datetime.datetime,
+    ) -> None:
+        self.requeue_messages([(message_id, version)], now)
+
+    def requeue_messages(
+        self,
+        messages: list[tuple[str, int]],
+        now: datetime.datetime,
+    ) -> list[bool]:
+        results = self._per_shard(
+            messages, lambda shard, batch: shard.requeue_messages(batch, now)
+        )
+        # A requeued message may have been dropped at its delivery
+        # limit; forget it either way, the next claim records it again.
+        for (message_id, _), requeued in zip(messages, results):
+            if requeued:
+                self._forget_message_shard(message_id)
+        return results
+
+    def change_message_visibility(
+        self,
+        message_id: str,
+        version: int,
+        visible_at: datetime.datetime,
+    ) -> None:
+        shard = self._message_shard(message_id)
+        if shard is not None:
+            shard.change_message_visibility(message_id, version, visible_at)
+
+    def find_message(self, message_id: str) -> core.Message:
+        shard = self._message_shard(message_id)
+        if shard is None:
+            raise core.MessageNotFoundError(message_id)
+        return shard.find_message(message_id)
+
+    def get_queue_stats(self, queue: str, now: datetime.datetime) -> core.QueueStats:
+        return self._queue_shard(queue).get_queue_stats(queue, now)
+
+    def redrive_messages(
+        self,
+        dead_letter_queue: str,
+        target_queue: str,
+        max_count: int,
+        now: datetime.datetime,
+    ) -> int:
+        shard = self._queue_shard(dead_letter_queue)
+        if self._queue_shard(target_queue) is not shard:
+            # A queue shares its DLQ's shard, so this only happens when
+            # redriving into a queue the DLQ does not serve.
+            raise core.Error(
+                f"cannot redrive {dead_letter_queue} to {target_queue}:"
+                " the queues are in different shards"
+            )
+        return shard.redrive_messages(dead_letter_queue, target_queue, max_count, now)
+
+    def delete_expired_messages(self, now: datetime.datetime, max_count: int) -> int:
+        deleted = 0
+        for shard in self.shards:
+            if deleted < max_count:
+                deleted += shard.delete_expired_messages(now, max_count - deleted)
+        return deleted
+
+    def purge_messages(
+        self,
+        queue: str,
+        created_before: datetime.datetime | None,
+        max_count: int,
+    ) -> int:
+        return self._queue_shard(queue).purge_messages(queue, created_before, max_count)
+
+    def _queue_shard(self, name: str) -> Store:
+        shard = self.queue_shards.get(name)
+        if shard is not None:
+            return shard
+        for shard in self.shards:
+            try:
+                shard.find_queue(name)
+            except core.QueueNotFoundError:
+                continue
+            self.queue_shards[name] = shard
+            return shard
+        raise core.QueueNotFoundError(name)
+
+    def _message_shard(self, message_id: str) -> Store | None:
+        with self.message_shards_lock:
+            shard = self.message_shards.get(message_id)
+            if shard is not None:
+                self.message_shards.move_to_end(message_id)
+                return shard
+        for shard in self.shards:
+            try:
+                shard.find_message(message_id)
+            except core.MessageNotFoundError:
+                continue
+            self._remember_message_shard(message_id, shard)
+            return shard
+        return None
+
+    def _remember_message_shard(self, message_id: str, shard: Store) -> None:
+        with self.message_shards_lock:
+            self.message_shards[message_id] = shard
+            self.message_shards.move_to_end(message_id)
+            while len(self.message_shards) > self.message_cache_size:
+                self.message_shards.popitem(last=False)
+
+    def _forget_message_shard(self, message_id: str) -> None:
+        with self.message_shards_lock:
+            self.message_shards.pop(message_id, None)
+
+    def _per_shard(
+        self,
+        messages: list[tuple[str, int]],
+        settle: Callable[[Store, list[tuple[str, int]]], list[bool]],
+    ) -> list[bool]:
+        """
+        Settles (message_id, version) pairs with one ``settle`` call per
+        shard and returns the results in input order. Messages found in
+        no shard settle as False.
+        """
+        results = [False] * len(messages)
+        batches: dict[int, tuple[Store, list[int]]] = {}
+        for i, (message_id, _) in enumerate(messages):
+            shard = self._message_shard(message_id)
+            if shard is not None:
+                batches.setdefault(id(shard), (shard, []))[1].append(i)
+        for shard, indexes in batches.values():
+            settled = settle(shard, [messages[i] for i in indexes])
+            for i, result in zip(indexes, settled):
+                results[i] = result
+        return results
@@ -1,4 +1,6 @@
+import collections
 import datetime
+import hashlib
 import sqlite3
 
 from schlange.internal import sqlite
@@ -15,65 +17,288 @@ SQL_FIND_QUEUE = """
     WHERE name = :name
 """
 
+# A message published into a group that already has messages in the
+# queue is parked behind them.
 SQL_PUBLISH = """
     INSERT INTO messages
-        (id, queue, payload, visibility_timeout, delivery_count,
-         visible_at, created_at, version)
+        (id, queue, payload, payload_id, visibility_timeout,
+         delivery_count, visible_at, created_at, version, priority,
+         group_id, parked, expires_at)
     VALUES
-        (:id, :queue, :payload, :visibility_timeout, 0,
-         :created_at, :created_at, 0)
+        (:id, :queue, :payload,
+         (SELECT id FROM payloads WHERE digest = :payload_digest),
+         :visibility_timeout, 0, :visible_at, :created_at, 0, :priority,
+         :group_id,
+         :group_id IS NOT NULL AND EXISTS (
+             SELECT 1
+             FROM messages
+             WHERE queue = :queue AND group_id = :group_id
+         ),
+         :expires_at)
 """
 
-SQL_CLAIM = """
+SQL_INSERT_PAYLOAD = """
+    INSERT INTO payloads (digest, data)
+    VALUES (:payload_digest, :data)
+    ON CONFLICT (digest) DO NOTHING
+"""
+
+# An offloaded message keeps an empty payload and the id of its payload
+# row, which is only visited for those.
+SQL_PAYLOAD = """
+    CASE
+        WHEN payload_id IS NULL THEN payload
+        ELSE (
+            SELECT data
+            FROM payloads
+            WHERE payloads.id = messages.payload_id
+        )
+    END
+"""
+
+# The priorities of the queue's claimable (unparked) messages, highest
+# first and ending in NULL, found with one seek per distinct priority
+# on idx_messages_claim instead of a pass over the backlog.
+SQL_PRIORITY_BANDS = """
+    bands(priority) AS (
+        SELECT max(priority)
+        FROM messages
+        WHERE queue = :queue AND parked = 0
+        UNION ALL
+        SELECT (
+            SELECT max(priority)
+            FROM messages
+            WHERE queue = :queue AND parked = 0 AND priority < bands.priority
+        )
+        FROM bands
+        WHERE bands.priority IS NOT NULL
+    )
+"""
+
+SQL_FIND_PRIORITIES = f"""
+    WITH RECURSIVE {SQL_PRIORITY_BANDS}
+    SELECT priority
+    FROM bands
+    WHERE priority IS NOT NULL
+"""
+
+# Claims run per priority, highest first, and take the message of that
+# priority that became visible first, walking its band of
+# idx_messages_claim, whose entries end in seq. A fresh message becomes
+# visible when it is published, so a band is FIFO until messages are
+# requeued or time out; seq breaks visible_at ties in publish order.
+# Ordering across bands in SQL would sort every visible message.
+# Expired messages are skipped, which reads each candidate's row; the
+# claim writes that row anyway.
+SQL_CLAIM = f"""
     UPDATE messages
-    SET visible_at = :now + messages.visibility_timeout,
+    SET visible_at = :now + CAST(messages.visibility_timeout * 1000000 AS INTEGER),
         delivery_count = delivery_count + 1,
         version = version + 1
-    WHERE id = (
-        SELECT id
+    WHERE rowid = (
+        SELECT rowid
         FROM messages
-        WHERE queue = :queue AND visible_at <= :now
-        ORDER BY created_at
+        WHERE queue = :queue
+          AND parked = 0
+          AND priority = :priority
+          AND visible_at <= :now
+          AND (expires_at IS NULL OR expires_at > :now)
+        ORDER BY visible_at, seq
         LIMIT 1
     )
-    RETURNING id, queue, payload, visibility_timeout, delivery_count,
-              created_at, version
+    RETURNING id, queue, {SQL_PAYLOAD}, visibility_timeout,
+              delivery_count, created_at, version, visible_at, priority,
+              group_id, expires_at, seq
+"""
+
+SQL_CLAIM_MANY = f"""
+    UPDATE messages
+    SET visible_at = :now + CAST(messages.visibility_timeout * 1000000 AS INTEGER),
+        delivery_count = delivery_count + 1,
+        version = version + 1
+    WHERE rowid IN (
+        SELECT rowid
+        FROM messages
+        WHERE queue = :queue
+          AND parked = 0
+          AND priority = :priority
+          AND visible_at <= :now
+          AND (expires_at IS NULL OR expires_at > :now)
+        ORDER BY visible_at, seq
+        LIMIT :max_count
+    )
+    RETURNING id, queue, {SQL_PAYLOAD}, visibility_timeout,
+              delivery_count, created_at, version, visible_at, priority,
+              group_id, expires_at, seq
 """
 
 SQL_DELETE_MESSAGE = """
     DELETE FROM messages
     WHERE id = :message_id AND version = :version
+    RETURNING queue
+"""
+
+# Routed requeue: the delivery limit check and DLQ routing run inside
+# SQLite, against the queue row, so no read round trip precedes the
+# write. The DELETE only matches a message at its limit whose queue has
+# no DLQ; the UPDATE then matches whatever is left, either moving it to
+# the DLQ or making it visible again.
+SQL_DROP_AT_DELIVERY_LIMIT = """
+    DELETE FROM messages
+    WHERE id = :message_id AND version = :version
+      AND EXISTS (
+          SELECT 1
+          FROM queues
+          WHERE queues.name = messages.queue
+            AND queues.dead_letter_queue IS NULL
+            AND messages.delivery_count >= queues.max_delivery_count
+      )
+    RETURNING queue
 """
 
-SQL_REQUEUE = """
+SQL_REQUEUE_OR_MOVE_TO_DLQ = """
     UPDATE messages
-    SET visible_at = :now,
-        version = version + 1
+    SET queue = CASE
+            WHEN messages.delivery_count >= queues.max_delivery_count
+            THEN queues.dead_letter_queue
+            ELSE messages.queue
+        END,
+        delivery_count = CASE
+            WHEN messages.delivery_count >= queues.max_delivery_count
+            THEN 0
+            ELSE messages.delivery_count
+        END,
+        visible_at = :now,
+        version = messages.version + 1
+    FROM queues
+    WHERE queues.name = messages.queue
+      AND messages.id = :message_id AND messages.version = :version
+"""
+
+SQL_CHANGE_VISIBILITY = """
+    UPDATE messages
+    SET visible_at = :visible_at
     WHERE id = :message_id AND version = :version
 """
 
-SQL_MOVE_TO_DLQ = """
+# Redrive and purge work in chunks in claim order, so each chunk starts
+# where the previous one left off on idx_messages_claim. Redrive runs
+# per priority like claims, and moves only group heads; purge takes
+# every message, parked ones last, so it walks the index in one
+# statement.
+SQL_REDRIVE = """
     UPDATE messages
-    SET queue = :dlq_queue,
+    SET queue = :target_queue,
         delivery_count = 0,
         visible_at = :now,
         version = version + 1
-    WHERE id = :message_id AND version = :version
+    WHERE rowid IN (
+        SELECT rowid
+        FROM messages
+        WHERE queue = :queue
+          AND parked = 0
+          AND priority = :priority
+          AND visible_at <= :now
+          AND (expires_at IS NULL OR expires_at > :now)
+        ORDER BY visible_at, seq
+        LIMIT :max_count
+    )
+"""
+
+SQL_PURGE = """
+    DELETE FROM messages
+    WHERE rowid IN (
+        SELECT rowid
+        FROM messages
+        WHERE queue = :queue
+          AND (:created_before IS NULL OR created_at < :created_before)
+        ORDER BY parked, priority DESC, visible_at, seq
+        LIMIT :max_count
+    )
+"""
+
+# The stats triggers cannot tell an ack from a drop at the delivery
+# limit; both are deletes. The store counts those in the same
+# transaction.
+SQL_COUNT_ACKED = """
+    UPDATE queue_stats
+    SET acked = acked + :count
+    WHERE queue = :queue
+"""
+
+# Deletes expired messages, claimed or not, oldest expiry first.
+SQL_DELETE_EXPIRED = """
+    DELETE FROM messages
+    WHERE rowid IN (
+        SELECT rowid
+        FROM messages
+        WHERE expires_at <= :now
+        ORDER BY expires_at
+        LIMIT :max_count
+    )
+    RETURNING queue
 """
 
-SQL_FIND_MESSAGE = """
-    SELECT id, queue, payload, visibility_timeout, delivery_count,
-           created_at, version
+SQL_COUNT_EXPIRED = """
+    UPDATE queue_stats
+    SET expired = expired + :count
+    WHERE queue = :queue
+"""
+
+SQL_COUNT_DROPPED = """
+    UPDATE queue_stats
+    SET dead_lettered = dead_lettered + 1
+    WHERE queue = :queue
+"""
+
+SQL_FIND_QUEUE_STATS = """
+    SELECT messages, published, acked, requeued, dead_lettered, expired, parked
+    FROM queue_stats
+    WHERE queue = :queue
+"""
+
+# Splits off the messages not visible at :now, a range at the end of
+# each priority's band of idx_messages_claim that holds in-flight and
+# delayed messages only, so the visible backlog is never counted.
+# Delayed messages have never been claimed; requeues and DLQ moves
+# make a message visible at once. Parked messages wait for their group
+# and count as delayed; queue_stats keeps their number.
+SQL_COUNT_NOT_VISIBLE = f"""
+    WITH RECURSIVE {SQL_PRIORITY_BANDS}
+    SELECT count(*), coalesce(sum(messages.delivery_count = 0), 0)
+    FROM bands
+    JOIN messages
+      ON messages.queue = :queue
+     AND messages.parked = 0
+     AND messages.priority = bands.priority
+     AND messages.visible_at > :now
+"""
+
+SQL_FIND_MESSAGE = f"""
+    SELECT id, queue, {SQL_PAYLOAD}, visibility_timeout,
+           delivery_count, created_at, version, visible_at, priority, group_id,
+           expires_at
     FROM messages
     WHERE id = :id
 """
 
 
 class Store:
+    """
+    Payloads longer than ``payload_offload_threshold`` bytes are stored
+    once per distinct content in the payloads table, so large payloads
+    do not spread the messages table, and the claim path through it,
+    over overflow pages. None keeps every payload inline.
+    """
 
-    def __init__(self, db: sqlite.Database) -> None:
+    def __init__(
+        self,
+        db: sqlite.Database,
+        payload_offload_threshold: int | None = None,
+    ) -> None:
         self.db = db
         self.dm = sqlite.DataMapper()
+        self.payload_offload_threshold = payload_offload_threshold
 
     def create_queue(
         self,
@@ -115,49 +340,126 @@ class Store:
         payload: bytes,
         visibility_timeout: float,
         created_at: datetime.datetime,
+        visible_at: datetime.datetime | None = None,
+        priority: int = 0,
+        group_id: str | None = None,
+        expires_at: datetime.datetime | None = None,
     ) -> None:
-        epoch = self.dm.dump_timestamp(created_at)
+        micros = self.dm.dump_timestamp_micros(created_at)
+        params = {
+            "id": message_id,
+            "queue": queue,
+            "visibility_timeout": visibility_timeout,
+            "priority": priority,
+            "group_id": group_id,
+            "expires_at": self._dump_expires_at(expires_at),
+            "created_at": micros,
+            "visible_at": (
+                self.dm.dump_timestamp_micros(visible_at)
+                if visible_at is not None
+                else micros
+            ),
+            **self._dump_payload(payload),
+        }
         with self.db.transaction() as tx:
             try:
-                tx.execute(
-                    SQL_PUBLISH,
-                    {
-                        "id": message_id,
-                        "queue": queue,
-                        "payload": payload,
-                        "visibility_timeout": visibility_timeout,
-                        "created_at": epoch,
-                    },
-                )
+                if params["payload_digest"] is not None:
+                    tx.execute(SQL_INSERT_PAYLOAD, params)
+                tx.execute(SQL_PUBLISH, params)
             except sqlite3.IntegrityError as e:
                 if e.sqlite_errorname == "SQLITE_CONSTRAINT_FOREIGNKEY":
                     raise core.QueueNotFoundError(queue) from None
                 raise
 
+    def publish_messages(self, messages: list[core.Message]) -> None:
+        params = [
+            {
+                "id": m.id,
+                "queue": m.queue,
+                "visibility_timeout": m.visibility_timeout,
+                "priority": m.priority,
+                "group_id": m.group_id,
+                "expires_at": self._dump_expires_at(m.expires_at),
+                "created_at": self.dm.dump_timestamp_micros(m.created_at),
+                "visible_at": self.dm.dump_timestamp_micros(m.visible_at),
+                **self._dump_payload(m.payload),
+            }
+            for m in messages
+        ]
+        offloaded = [p for p in params if p["payload_digest"] is not None]
+        with self.db.transaction() as tx:
+            try:
+                if offloaded:
+                    tx.execute_many(SQL_INSERT_PAYLOAD, offloaded)
+                tx.execute_many(SQL_PUBLISH, params)
+            except sqlite3.IntegrityError as e:
+                if e.sqlite_errorname == "SQLITE_CONSTRAINT_FOREIGNKEY":
+                    queues = sorted({m.queue for m in messages})
+                    raise core.QueueNotFoundError(", ".join(queues)) from None
+                raise
+
     def claim_message(
         self,
         queue: str,
         now: datetime.datetime,
     ) -> core.Message:
+        params = {"queue": queue, "now": self.dm.dump_timestamp_micros(now)}
         with self.db.transaction(synchronous=False) as tx:
-            try:
-                row = tx.query_row(
-                    SQL_CLAIM,
-                    {
-                        "queue": queue,
-                        "now": self.dm.dump_timestamp(now),
-                    },
+            for (priority,) in list(tx.query(SQL_FIND_PRIORITIES, params)):
+                try:
+                    row = tx.query_row(SQL_CLAIM, {**params, "priority": priority})
+                except sqlite.NoRowsError:
+                    continue
+                return self._collect_message(row)
+        raise core.NoMessagesAvailable(queue)
+
+    def claim_messages(
+        self,
+        queue: str,
+        max_count: int,
+        now: datetime.datetime,
+    ) -> list[core.Message]:
+        params = {"queue": queue, "now": self.dm.dump_timestamp_micros(now)}
+        rows: list = []
+        with self.db.transaction(synchronous=False) as tx:
+            for (priority,) in list(tx.query(SQL_FIND_PRIORITIES, params)):
+                if len(rows) >= max_count:
+                    break
+                rows.extend(
+                    tx.query(
+                        SQL_CLAIM_MANY,
+                        {
+                            **params,
+                            "priority": priority,
+                            "max_count": max_count - len(rows),
+                        },
+                    )
                 )
-            except sqlite.NoRowsError:
-                raise core.NoMessagesAvailable(queue) from None
-            return self._collect_message(row)
+        # RETURNING yields rows in no particular order.
+        rows.sort(key=lambda row: (-row[8], row[11]))
+        return [self._collect_message(row) for row in rows]
 
     def delete_message(self, message_id: str, version: int) -> None:
+        self.delete_messages([(message_id, version)])
+
+    def delete_messages(self, messages: list[tuple[str, int]]) -> list[bool]:
+        acked: collections.Counter[str] = collections.Counter()
+        results = []
         with self.db.transaction(synchronous=False) as tx:
-            tx.execute(
-                SQL_DELETE_MESSAGE,
-                {"message_id": message_id, "version": version},
+            for message_id, version in messages:
+                rows = list(
+                    tx.query(
+                        SQL_DELETE_MESSAGE,
+                        {"message_id": message_id, "version": version},
+                    )
+                )
+                acked.update(row[0] for row in rows)
+                results.append(bool(rows))
+            tx.execute_many(
+                SQL_COUNT_ACKED,
+                ({"queue": queue, "count": count} for queue, count in acked.items()),
             )
+        return results
 
     def requeue_message(
         self,
@@ -165,31 +467,40 @@ class Store:
         version: int,
         now: datetime.datetime,
     ) -> None:
+        params = {
+            "message_id": message_id,
+            "version": version,
+            "now": self.dm.dump_timestamp_micros(now),
+        }
         with self.db.transaction(synchronous=False) as tx:
-            tx.execute(
-                SQL_REQUEUE,
-                {
-                    "message_id": message_id,
-                    "version": version,
-                    "now": self.dm.dump_timestamp(now),
-                },
-            )
+            self._requeue(tx, params)
+
+    def requeue_messages(
+        self,
+        messages: list[tuple[str, int]],
+        now: datetime.datetime,
+    ) -> list[bool]:
+        micros = self.dm.dump_timestamp_micros(now)
+        results = []
+        with self.db.transaction(synchronous=False) as tx:
+            for message_id, version in messages:
+                params = {"message_id": message_id, "version": version, "now": micros}
+                results.append(self._requeue(tx, params))
+        return results
 
-    def move_message_to_dlq(
+    def change_message_visibility(
         self,
         message_id: str,
         version: int,
-        dlq_queue: str,
-        now: datetime.datetime,
+        visible_at: datetime.datetime,
     ) -> None:
         with self.db.transaction(synchronous=False) as tx:
             tx.execute(
-                SQL_MOVE_TO_DLQ,
+                SQL_CHANGE_VISIBILITY,
                 {
                     "message_id": message_id,
                     "version": version,
-                    "dlq_queue": dlq_queue,
-                    "now": self.dm.dump_timestamp(now),
+                    "visible_at": self.dm.dump_timestamp_micros(visible_at),
                 },
             )
 
@@ -201,6 +512,127 @@ class Store:
                 raise core.MessageNotFoundError(message_id) from None
             return self._collect_message(row)
 
+    def get_queue_stats(self, queue: str, now: datetime.datetime) -> core.QueueStats:
+        with self.db.transaction(read_only=True) as tx:
+            try:
+                row = tx.query_row(SQL_FIND_QUEUE_STATS, {"queue": queue})
+            except sqlite.NoRowsError:
+                raise core.QueueNotFoundError(queue) from None
+            not_visible, delayed = tx.query_row(
+                SQL_COUNT_NOT_VISIBLE,
+                {"queue": queue, "now": self.dm.dump_timestamp_micros(now)},
+            )
+        parked = row[6]
+        return core.QueueStats(
+            queue=queue,
+            visible=row[0] - not_visible - parked,
+            in_flight=not_visible - delayed,
+            delayed=delayed + parked,
+            published=row[1],
+            acked=row[2],
+            requeued=row[3],
+            dead_lettered=row[4],
+            expired=row[5],
+        )
+
+    def redrive_messages(
+        self,
+        dead_letter_queue: str,
+        target_queue: str,
+        max_count: int,
+        now: datetime.datetime,
+    ) -> int:
+        params = {
+            "queue": dead_letter_queue,
+            "target_queue": target_queue,
+            "now": self.dm.dump_timestamp_micros(now),
+        }
+        moved = 0
+        with self.db.transaction(synchronous=False) as tx:
+            # Moving a group's head promotes the next message, so
+            # repeat until a pass moves nothing.
+            while moved < max_count:
+                before = moved
+                for (priority,) in list(tx.query(SQL_FIND_PRIORITIES, params)):
+                    if moved >= max_count:
+                        break
+                    try:
+                        moved += tx.execute(
+                            SQL_REDRIVE,
+                            {
+                                **params,
+                                "priority": priority,
+                                "max_count": max_count - moved,
+                            },
+                        )
+                    except sqlite3.IntegrityError as e:
+                        if e.sqlite_errorname == "SQLITE_CONSTRAINT_FOREIGNKEY":
+                            raise core.QueueNotFoundError(target_queue) from None
+                        raise
+                if moved == before:
+                    break
+        return moved
+
+    def purge_messages(
+        self,
+        queue: str,
+        created_before: datetime.datetime | None,
+        max_count: int,
+    ) -> int:
+        with self.db.transaction(synchronous=False) as tx:
+            return tx.execute(
+                SQL_PURGE,
+                {
+                    "queue": queue,
+                    "created_before": (
+                        self.dm.dump_timestamp_micros(created_before)
+                        if created_before is not None
+                        else None
+                    ),
+                    "max_count": max_count,
+                },
+            )
+
+    def delete_expired_messages(self, now: datetime.datetime, max_count: int) -> int:
+        with self.db.transaction(synchronous=False) as tx:
+            rows = list(
+                tx.query(
+                    SQL_DELETE_EXPIRED,
+                    {
+                        "now": self.dm.dump_timestamp_micros(now),
+                        "max_count": max_count,
+                    },
+                )
+            )
+            expired = collections.Counter(row[0] for row in rows)
+            tx.execute_many(
+                SQL_COUNT_EXPIRED,
+                ({"queue": queue, "count": count} for queue, count in expired.items()),
+            )
+        return len(rows)
+
+    def _requeue(self, tx: sqlite.Transaction, params: dict) -> bool:
+        dropped = list(tx.query(SQL_DROP_AT_DELIVERY_LIMIT, params))
+        if dropped:
+            tx.execute(SQL_COUNT_DROPPED, {"queue": dropped[0][0]})
+            return True
+        return tx.execute(SQL_REQUEUE_OR_MOVE_TO_DLQ, params) > 0
+
+    def _dump_expires_at(self, expires_at: datetime.datetime | None) -> int | None:
+        if expires_at is None:
+            return None
+        return self.dm.dump_timestamp_micros(expires_at)
+
+    def _dump_payload(self, payload: bytes) -> dict[str, bytes | None]:
+        threshold = self.payload_offload_threshold
+        if threshold is None or len(payload) <= threshold:
+            return {"payload": payload, "payload_digest": None}
+        return {
+            "payload": b"",
+            "payload_digest": hashlib.sha256(payload).digest(),
+            "data": payload,
+        }
+
     def _collect_queue(self, row) -> core.Queue:
         return core.Queue(
             name=row[0],
@@ -216,6 +648,12 @@ class Store:
             payload=row[2],
             visibility_timeout=row[3],
             delivery_count=row[4],
-            created_at=self.dm.load_timestamp(row[5]),
+            visible_at=self.dm.load_timestamp_micros(row[7]),
+            created_at=self.dm.load_timestamp_micros(row[5]),
             version=row[6],
+            priority=row[8],
+            group_id=row[9],
+            expires_at=(
+                self.dm.load_timestamp_micros(row[10]) if row[10] is not None else None
+            ),
         )
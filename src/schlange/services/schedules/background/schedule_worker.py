@@ -1,3 +1,4 @@
+import datetime
 import logging
 
 from schlange.internal import background
@@ -7,7 +8,14 @@ LOGGER = logging.getLogger(__name__)
 
 
 class ScheduleWorker(background.Worker):
-    """Leader-gated worker that fires fireable schedules."""
+    """
+    Leader-gated worker that fires fireable schedules.
+
+    Like the Dispatcher, it sleeps until the earliest known schedule
+    ``ready_at``, read from the store each tick and pushed by
+    ``notify_ready`` for schedules created in this process, and only
+    lists schedules when one is due. ``interval`` bounds the sleep.
+    """
 
     def __init__(
         self,
@@ -22,12 +30,31 @@ class ScheduleWorker(background.Worker):
         self.holder = holder
         self.key = key
         self.ttl = ttl
+        self.deadlines = background.Deadlines()
+
+    def notify_ready(self, ready_at: datetime.datetime) -> None:
+        if self.deadlines.push(ready_at):
+            self.wake()
+
+    def sleep_time(self) -> float:
+        return self.deadlines.sleep_time(self._now(), self.interval)
 
     def work(self) -> None:
         if not self.schedule_service.acquire_lease(self.key, self.holder, self.ttl):
+            self.deadlines.clear()
+            return
+        self._seed()
+        if not self.deadlines.pop_due(self._now()):
             return
         for schedule in self.schedule_service.fireable_schedules():
             self._fire_schedule(schedule)
+        # Schedules that failed to fire wait for the next tick.
+        self._seed(after=self._now())
+
+    def _seed(self, after: datetime.datetime | None = None) -> None:
+        ready_at = self.schedule_service.next_ready_at()
+        if ready_at is not None and (after is None or ready_at > after):
+            self.deadlines.push(ready_at)
 
     def _fire_schedule(self, schedule: core.Schedule) -> None:
         try:
@@ -54,3 +81,6 @@ class ScheduleWorker(background.Worker):
             core.ScheduleUpdatedConcurrentlyError,
         ) as err:
             LOGGER.debug("failed to fire schedule: id=%s, err=%r", schedule.id, err)
+
+    def _now(self) -> datetime.datetime:
+        return datetime.datetime.now(datetime.UTC)
@@ -1,4 +1,5 @@
-from typing import List, Protocol
+import datetime
+from typing import List, Optional, Protocol
 
 from .schedule import Schedule
 from .schedule_specification import ScheduleSpecification
@@ -12,6 +13,13 @@ class ScheduleRepository(Protocol):
     def list_schedules(self, spec: ScheduleSpecification) -> List[Schedule]:
         pass
 
+    def next_ready_at(self) -> Optional[datetime.datetime]:
+        """
+        Returns the earliest ``ready_at`` of the enabled schedules, or
+        None if there are none.
+        """
+        pass
+
     def get_schedule(self, schedule_id: str) -> Schedule:
         pass
 
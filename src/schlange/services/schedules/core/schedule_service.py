@@ -2,7 +2,7 @@ import dataclasses
 import datetime
 import traceback
 import uuid
-from typing import List, Optional
+from typing import Callable, List, Optional
 
 from schlange.internal import core as internal_core
 
@@ -20,6 +20,14 @@ class ScheduleService:
     task_service: TaskService
     lease_service: LeaseService
     task_visibility_timeout: float
+    # Called with a schedule's ready_at whenever this process creates
+    # an enabled schedule.
+    ready_listeners: List[Callable[[datetime.datetime], None]] = dataclasses.field(
+        default_factory=list
+    )
+
+    def subscribe_ready(self, listener: Callable[[datetime.datetime], None]) -> None:
+        self.ready_listeners.append(listener)
 
     def acquire_lease(self, key: str, holder: str, ttl: float) -> bool:
         """Acquire or renew a lease via the lease service port."""
@@ -50,6 +58,9 @@ class ScheduleService:
             task_retry_policy=task_retry_policy,
         )
         self.schedule_repository.create_schedule(schedule)
+        if schedule.enabled:
+            for listener in self.ready_listeners:
+                listener(schedule.ready_at)
         return schedule
 
     def fireable_schedules(self) -> List[Schedule]:
@@ -60,6 +71,14 @@ class ScheduleService:
             )
         )
 
+    def next_ready_at(self) -> Optional[datetime.datetime]:
+        """
+        Returns when the earliest enabled schedule is ready, or None if
+        there is none. Unlike ``fireable_schedules``, this loads no
+        schedules.
+        """
+        return self.schedule_repository.next_ready_at()
+
     def list_schedules(self, spec: ScheduleSpecification) -> List[Schedule]:
         return self.schedule_repository.list_schedules(spec)
 
@@ -1,6 +1,7 @@
+import datetime
 import json
 import sqlite3
-from typing import List
+from typing import List, Optional
 
 from schlange.internal import sqlite
 from schlange.services.schedules import core
@@ -32,6 +33,12 @@ SQL_GET_SCHEDULES_BY_SPEC = """
         coalesce(ready_at <= :ready_as_of, true)
 """
 
+SQL_GET_NEXT_READY_AT = """
+    SELECT min(ready_at)
+    FROM schedules
+    WHERE enabled = 1
+"""
+
 SQL_DELETE_SCHEDULE_BY_ID = """
     DELETE
     FROM schedules
@@ -123,6 +130,13 @@ class ScheduleRepository:
             )
             return [self._collect_schedule(row) for row in rows]
 
+    def next_ready_at(self) -> Optional[datetime.datetime]:
+        with self.db.transaction(read_only=True) as tx:
+            ready_at = tx.query_row(SQL_GET_NEXT_READY_AT)[0]
+            if ready_at is None:
+                return None
+            return self.data_mapper.load_timestamp(ready_at)
+
     def _collect_schedule(self, row: sqlite3.Row) -> core.Schedule:
         return core.Schedule(
             id=row[0],
@@ -12,6 +12,8 @@ class DataMapper:
             args=task.args,
             state=tasks.TaskState(task.state.value),
             visibility_timeout=task.visibility_timeout,
+            priority=task.priority,
+            group_id=task.group_id,
         )
 
     def dump_retry_policy(self, policy: internal_core.RetryPolicy) -> tasks.RetryPolicy:
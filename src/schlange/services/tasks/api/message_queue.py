@@ -1,5 +1,6 @@
 import json
 import logging
+from typing import List
 
 from schlange.api import messaging as messaging_api
 from schlange.services.messaging import core as messaging_core
@@ -26,6 +27,20 @@ class MessageQueue:
         self._declared: set[str] = set()
 
     def publish(self, request: core.TaskExecutionRequest) -> None:
+        self.messaging_server.publish_message(self._publish_request(request))
+
+    def publish_many(self, requests: List[core.TaskExecutionRequest]) -> None:
+        if not requests:
+            return
+        self.messaging_server.publish_messages(
+            messaging_api.PublishMessagesRequest(
+                requests=[self._publish_request(request) for request in requests]
+            )
+        )
+
+    def _publish_request(
+        self, request: core.TaskExecutionRequest
+    ) -> messaging_api.PublishMessageRequest:
         if request.kind not in self._declared:
             self._ensure_queue(request.kind)
             self._declared.add(request.kind)
@@ -34,15 +49,15 @@ class MessageQueue:
                 "task_id": request.task_id,
                 "seq_num": request.seq_num,
                 "kind": request.kind,
-                "args": request.args,
             }
         ).encode()
-        self.messaging_server.publish_message(
-            messaging_api.PublishMessageRequest(
-                queue=request.kind,
-                payload=payload,
-                visibility_timeout=request.visibility_timeout,
-            )
+        return messaging_api.PublishMessageRequest(
+            queue=request.kind,
+            payload=payload,
+            visibility_timeout=request.visibility_timeout,
+            delay=request.delay,
+            priority=request.priority,
+            group_id=request.group_id,
         )
 
     def _ensure_queue(self, kind: str) -> None:
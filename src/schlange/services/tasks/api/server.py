@@ -26,11 +26,39 @@ class Server:
                 retry_policy=self.data_mapper.load_retry_policy(request.retry_policy),
                 id=request.id,
                 schedule_id=request.schedule_id,
+                priority=request.priority,
+                group_id=request.group_id,
             )
         except core.TaskAlreadyExistsError:
             raise tasks.AlreadyExistsError() from None
         return tasks.CreateTaskResponse(task=self.data_mapper.dump_task(task))
 
+    def create_tasks(
+        self, request: tasks.CreateTasksRequest
+    ) -> tasks.CreateTasksResponse:
+        created = self.service.create_tasks(
+            [
+                core.NewTask(
+                    args=r.args,
+                    kind=r.kind,
+                    delay=r.delay,
+                    visibility_timeout=r.visibility_timeout,
+                    retry_policy=self.data_mapper.load_retry_policy(r.retry_policy),
+                    id=r.id,
+                    schedule_id=r.schedule_id,
+                    priority=r.priority,
+                    group_id=r.group_id,
+                )
+                for r in request.requests
+            ]
+        )
+        return tasks.CreateTasksResponse(
+            tasks=[
+                self.data_mapper.dump_task(task) if task is not None else None
+                for task in created
+            ]
+        )
+
     def get_task(self, request: tasks.GetTaskRequest) -> tasks.GetTaskResponse:
         try:
             task = self.service.task(request.id)
@@ -70,6 +98,24 @@ class Server:
             raise tasks.FailedPreconditionError() from None
         return tasks.ReactivateTaskResponse(task=self.data_mapper.dump_task(task))
 
+    def get_execution(
+        self, request: tasks.GetExecutionRequest
+    ) -> tasks.GetExecutionResponse:
+        try:
+            task = self.service.execution_task(
+                task_id=request.task_id,
+                seq_num=request.seq_num,
+            )
+        except core.TaskExecutionNotBegunYetError:
+            raise tasks.ConflictError() from None
+        except core.TaskNotFoundError:
+            raise tasks.NotFoundError() from None
+        except core.TaskExecutionNotFoundError:
+            raise tasks.FailedPreconditionError() from None
+        return tasks.GetExecutionResponse(
+            args=task.args, ended=task.execution_ended(request.seq_num)
+        )
+
     def end_execution(self, request: tasks.EndExecutionRequest) -> None:
         try:
             self.service.end_execution(
@@ -77,7 +123,10 @@ class Server:
                 seq_num=request.seq_num,
                 error=request.error,
             )
-        except core.TaskUpdatedConcurrentlyError:
+        except (
+            core.TaskUpdatedConcurrentlyError,
+            core.TaskExecutionNotBegunYetError,
+        ):
             raise tasks.ConflictError() from None
         except core.TaskNotFoundError:
             raise tasks.NotFoundError() from None
@@ -5,29 +5,43 @@ from schlange.services.tasks import core
 
 LOGGER = logging.getLogger(__name__)
 
+# Seconds between chunks: enough for writers blocked on the write lock,
+# in this process or another, to take it.
+CHUNK_PAUSE = 0.01
+
 
 class CleanupWorker(background.Worker):
+    """
+    Deletes tasks the cleanup policy lets go, in chunks of up to
+    ``chunk_size``, each its own short transaction. Between chunks it
+    pauses so that dispatch and other writers get the write lock.
+    """
 
     def __init__(
         self,
         interval: float,
         task_service: core.TaskService,
         cleanup_policy: core.CleanupPolicy,
+        chunk_size: int = 1000,
     ) -> None:
         super().__init__(name="schlange.CleanupWorker", interval=interval)
         self.task_service = task_service
         self.cleanup_policy = cleanup_policy
+        self.chunk_size = chunk_size
 
     def work(self) -> None:
         self.cleanup_tasks()
 
     def cleanup_tasks(self) -> None:
-        for task in self.task_service.deletable_tasks(self.cleanup_policy):
-            LOGGER.debug("deleting task: id=%s", task.id)
+        while True:
             try:
-                self.task_service.delete_task(task.id)
-                LOGGER.info("deleted task: id=%s", task.id)
+                deleted = self.task_service.delete_deletable_tasks(
+                    self.cleanup_policy, self.chunk_size
+                )
             except IOError as err:
-                LOGGER.error("failed to delete task: id=%s, err=%r", task.id, err)
-            except core.TaskNotFoundError as err:
-                LOGGER.debug("failed to delete task: id=%s, err=%r", task.id, err)
+                LOGGER.error("failed to delete tasks: err=%r", err)
+                return
+            if deleted:
+                LOGGER.info("deleted tasks: count=%d", deleted)
+            if deleted < self.chunk_size or self.stopping.wait(CHUNK_PAUSE):
+                return
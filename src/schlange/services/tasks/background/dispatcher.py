@@ -1,3 +1,4 @@
+import datetime
 import logging
 
 from schlange.internal import background
@@ -7,7 +8,25 @@ LOGGER = logging.getLogger(__name__)
 
 
 class Dispatcher(background.Worker):
-    """Leader-gated worker that dispatches executable tasks."""
+    """
+    Leader-gated worker that dispatches executable tasks.
+
+    Tasks that become ready within ``lookahead`` seconds are dispatched
+    early as delayed messages, so they start at their ``ready_at``
+    rather than on the next tick. Tasks are dispatched in batches of
+    up to ``batch_size``, each listed with a LIMIT right before it is
+    published: one publish and one task transaction each. The lease is
+    renewed between batches.
+
+    The dispatcher sleeps until the earliest known ``ready_at`` minus
+    ``lookahead``. Each tick reads the earliest one from the store, and
+    ``notify_ready`` adds tasks made ready in this process, waking the
+    dispatcher when one is due before the earliest known. Tasks are
+    only listed when one is due, so an idle tick costs the lease
+    renewal and one index seek. ``interval`` bounds the sleep, so
+    leases are renewed and tasks created by other processes are still
+    picked up.
+    """
 
     def __init__(
         self,
@@ -16,28 +35,80 @@ class Dispatcher(background.Worker):
         key: str,
         ttl: float,
         interval: float,
+        lookahead: float,
+        batch_size: int = 100,
     ) -> None:
         super().__init__(name="schlange.Dispatcher", interval=interval)
         self.service = service
         self.holder = holder
         self.key = key
         self.ttl = ttl
+        self.lookahead = lookahead
+        self.batch_size = batch_size
+        # When tasks are due for dispatch: ready_at minus lookahead.
+        self.deadlines = background.Deadlines()
+
+    def notify_ready(self, ready_at: datetime.datetime) -> None:
+        # A later deadline than the earliest cannot cut the current
+        # sleep short; it is picked up after the earlier one.
+        if self.deadlines.push(ready_at - datetime.timedelta(seconds=self.lookahead)):
+            self.wake()
+
+    def sleep_time(self) -> float:
+        return self.deadlines.sleep_time(self._now(), self.interval)
 
     def work(self) -> None:
         if not self.service.acquire_lease(self.key, self.holder, self.ttl):
+            # The leader dispatches; sleep the interval until this
+            # process is it.
+            self.deadlines.clear()
+            return
+        self._seed()
+        if not self.deadlines.pop_due(self._now()):
             return
-        for task in self.service.executable_tasks():
-            LOGGER.debug("dispatching task: id=%s", task.id)
+        self._dispatch()
+        # Tasks left due, e.g. after an IO error, wait for the next
+        # tick; only a later ready_at shortens the sleep.
+        self._seed(after=self._now())
+
+    def _seed(self, after: datetime.datetime | None = None) -> None:
+        ready_at = self.service.next_ready_at()
+        if ready_at is None:
+            return
+        deadline = ready_at - datetime.timedelta(seconds=self.lookahead)
+        if after is None or deadline > after:
+            self.deadlines.push(deadline)
+
+    def _dispatch(self) -> None:
+        while True:
+            # Each batch is listed right before it is published, so it
+            # reflects the tasks' latest state and version.
+            tasks = self.service.executable_tasks(self.lookahead, self.batch_size)
+            if not tasks:
+                return
+            LOGGER.debug("dispatching tasks: count=%d", len(tasks))
             try:
-                self.service.begin_execution(task.id)
-                LOGGER.info("dispatched task: id=%s", task.id)
+                dispatched = self.service.begin_executions(tasks, self.lookahead)
             except IOError as err:
-                LOGGER.error("failed to dispatch task: id=%s, err=%r", task.id, err)
-            except (
-                core.TaskNotFoundError,
-                core.TaskNotActiveError,
-                core.TaskNotReadyError,
-                core.TaskExecutionNotEndedYetError,
-                core.TaskUpdatedConcurrentlyError,
-            ) as err:
-                LOGGER.debug("failed to dispatch task: id=%s, err=%r", task.id, err)
+                LOGGER.error(
+                    "failed to dispatch tasks: ids=%s, err=%r",
+                    [task.id for task in tasks],
+                    err,
+                )
+                return
+            for task in dispatched:
+                LOGGER.info("dispatched task: id=%s", task.id)
+            if len(dispatched) < len(tasks):
+                LOGGER.warning(
+                    "tasks changed before commit, published uncommitted: count=%d",
+                    len(tasks) - len(dispatched),
+                )
+            if len(tasks) < self.batch_size or not dispatched:
+                return
+            # Each batch takes a publish and a commit; keep the lease
+            # from expiring under a long backlog.
+            if not self.service.acquire_lease(self.key, self.holder, self.ttl):
+                return
+
+    def _now(self) -> datetime.datetime:
+        return datetime.datetime.now(datetime.UTC)
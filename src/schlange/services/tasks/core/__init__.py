@@ -4,6 +4,7 @@ from .cleanup_policy import CleanupPolicy
 from .errors import (
     Error,
     TaskAlreadyExistsError,
+    TaskExecutionNotBegunYetError,
     TaskExecutionNotEndedYetError,
     TaskExecutionNotFoundError,
     TaskNotActiveError,
@@ -14,6 +15,7 @@ from .errors import (
 )
 from .lease_service import LeaseService
 from .message_queue import MessageQueue, TaskExecutionRequest
+from .new_task import NewTask
 from .task import Task
 from .task_execution import TaskExecution
 from .task_handler import TaskHandler
@@ -30,10 +32,12 @@ __all__ = [
     "Error",
     "LeaseService",
     "MessageQueue",
+    "NewTask",
     "RetryPolicy",
     "Task",
     "TaskAlreadyExistsError",
     "TaskExecution",
+    "TaskExecutionNotBegunYetError",
     "TaskExecutionNotFoundError",
     "TaskExecutionNotEndedYetError",
     "TaskExecutionRequest",
@@ -30,5 +30,9 @@ class TaskExecutionNotFoundError(Error):
     pass
 
 
+class TaskExecutionNotBegunYetError(TaskExecutionNotFoundError):
+    """The execution is the next one, published but not committed yet."""
+
+
 class TaskExecutionNotEndedYetError(Error):
     pass
@@ -1,21 +1,32 @@
 import dataclasses
-from typing import Protocol
-
-from schlange.internal import core as internal_core
+from typing import List, Optional, Protocol
 
 
 @dataclasses.dataclass
 class TaskExecutionRequest:
-    """Request to execute a task, handed to the message queue port."""
+    """
+    Request to execute a task, handed to the message queue port. It
+    carries no args; the consumer reads them from the task, so they
+    are stored once.
+    """
 
     task_id: str
     seq_num: int
     kind: str
-    args: internal_core.DTO
     visibility_timeout: float
+    # Seconds until the execution should start.
+    delay: float = 0.0
+    # Executions of higher priority are claimed first.
+    priority: int = 0
+    # Executions of a group are claimed one at a time, in publish order.
+    group_id: Optional[str] = None
 
 
 class MessageQueue(Protocol):
     """Driven port for publishing task execution requests."""
 
     def publish(self, request: TaskExecutionRequest) -> None: ...
+
+    def publish_many(self, requests: List[TaskExecutionRequest]) -> None:
+        """Publishes all requests at once, all or nothing."""
+        ...
@@ -0,0 +1,19 @@
+import dataclasses
+from typing import Optional
+
+from schlange.internal import core as internal_core
+
+
+@dataclasses.dataclass
+class NewTask:
+    """A task to be created; the service assigns timestamps, and an id if unset."""
+
+    args: internal_core.DTO
+    kind: str
+    delay: float
+    visibility_timeout: float
+    retry_policy: internal_core.RetryPolicy
+    id: Optional[str] = None
+    schedule_id: Optional[str] = None
+    priority: int = 0
+    group_id: Optional[str] = None
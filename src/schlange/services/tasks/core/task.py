@@ -5,6 +5,7 @@ from typing import List, Optional
 from schlange.internal import core as internal_core
 
 from .errors import (
+    TaskExecutionNotBegunYetError,
     TaskExecutionNotEndedYetError,
     TaskExecutionNotFoundError,
     TaskNotActiveError,
@@ -27,6 +28,13 @@ class Task(internal_core.Aggregate):
     visibility_timeout: float
     executions: List[TaskExecution]
     schedule_id: Optional[str]
+    # Higher priorities are dispatched and claimed first.
+    priority: int = 0
+    # Executions of a group run one at a time, in dispatch order.
+    group_id: Optional[str] = None
+    # Seq num of executions[0]. Repositories may load only the last
+    # execution; the ones before it have all ended.
+    execution_offset: int = 0
 
     @classmethod
     def create(
@@ -39,6 +47,8 @@ class Task(internal_core.Aggregate):
         retry_policy: internal_core.RetryPolicy,
         visibility_timeout: float,
         schedule_id: Optional[str],
+        priority: int = 0,
+        group_id: Optional[str] = None,
     ) -> "Task":
         return cls(
             id=id,
@@ -52,6 +62,8 @@ class Task(internal_core.Aggregate):
             visibility_timeout=visibility_timeout,
             executions=[],
             schedule_id=schedule_id,
+            priority=priority,
+            group_id=group_id,
         )
 
     def ready(self, now: datetime.datetime) -> bool:
@@ -61,22 +73,37 @@ class Task(internal_core.Aggregate):
     def last_execution(self) -> Optional[TaskExecution]:
         return self.executions[-1] if self.executions else None
 
-    def begin_execution(self, now: datetime.datetime) -> None:
-        """Begins a new execution record. Task must be active and ready."""
+    @property
+    def execution_count(self) -> int:
+        return self.execution_offset + len(self.executions)
+
+    def begin_execution(self, now: datetime.datetime, lookahead: float = 0.0) -> None:
+        """
+        Begins a new execution record. Task must be active and ready
+        within ``lookahead`` seconds; an execution begun ahead of time
+        is timestamped at ``ready_at``.
+        """
         if self.state is not TaskState.ACTIVE:
             raise TaskNotActiveError()
-        if not self.ready(now):
+        if not self.ready(now + datetime.timedelta(seconds=lookahead)):
             raise TaskNotReadyError()
         if self.last_execution is not None and not self.last_execution.ended:
             raise TaskExecutionNotEndedYetError()
         self.executions.append(
-            TaskExecution.begin(seq_num=len(self.executions), timestamp=now)
+            TaskExecution.begin(
+                seq_num=self.execution_count, timestamp=max(now, self.ready_at)
+            )
         )
 
     def end_execution(
         self, seq_num: int, now: datetime.datetime, error: Optional[str]
     ) -> None:
         """Ends an execution by seq_num. No-op if the execution has already ended."""
+        if 0 <= seq_num < self.execution_offset:
+            return  # not loaded, so ended long ago — duplicate report
+        if seq_num == self.execution_count:
+            # Published before the dispatcher committed it.
+            raise TaskExecutionNotBegunYetError()
         execution = self.get_execution(seq_num)
         if execution.ended:
             return  # duplicate report from redelivery — no-op
@@ -85,11 +112,20 @@ class Task(internal_core.Aggregate):
             self.state = TaskState.SUCCEEDED
             return
         try:
-            delay = self.retry_policy.delay(attempts=len(self.executions))
+            delay = self.retry_policy.delay(attempts=self.execution_count)
             self.ready_at = now + datetime.timedelta(seconds=delay)
         except internal_core.TooManyAttemptsError:
             self.state = TaskState.FAILED
 
+    def execution_ended(self, seq_num: int) -> bool:
+        """Whether the execution with ``seq_num`` has ended."""
+        if 0 <= seq_num < self.execution_offset:
+            return True  # not loaded, so ended long ago
+        if seq_num == self.execution_count:
+            # Published before the dispatcher committed it.
+            raise TaskExecutionNotBegunYetError()
+        return self.get_execution(seq_num).ended
+
     def get_execution(self, seq_num: int) -> TaskExecution:
         for execution in self.executions:
             if execution.seq_num == seq_num:
@@ -102,3 +138,4 @@ class Task(internal_core.Aggregate):
         self.state = TaskState.ACTIVE
         self.ready_at = now + datetime.timedelta(seconds=delay)
         self.executions = []
+        self.execution_offset = 0
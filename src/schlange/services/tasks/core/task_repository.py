@@ -1,4 +1,5 @@
-from typing import List, Protocol
+import datetime
+from typing import List, Optional, Protocol
 
 from .task import Task
 from .task_specification import TaskSpecification
@@ -9,10 +10,50 @@ class TaskRepository(Protocol):
     def create_task(self, task: Task) -> None:
         pass
 
-    def get_task(self, task_id: str) -> Task:
+    def create_tasks(self, tasks: List[Task]) -> List[bool]:
+        """
+        Creates the tasks in one write. A task whose id is taken is
+        skipped and reported False, in input order, without failing
+        the others.
+        """
+        pass
+
+    def get_task(self, task_id: str, all_executions: bool = False) -> Task:
+        """
+        Loads only the task's last execution unless ``all_executions``
+        is True; see ``Task.execution_offset``.
+        """
+        pass
+
+    def list_tasks(
+        self, spec: TaskSpecification, all_executions: bool = False
+    ) -> List[Task]:
+        pass
+
+    def delete_tasks_where(self, spec: TaskSpecification, limit: int) -> int:
+        """
+        Deletes up to ``limit`` tasks satisfying ``spec``, with their
+        executions, in one write, and returns how many. The write may be
+        lost in a crash, like ``update_task`` with synchronous False;
+        the tasks are then deleted again.
+        """
         pass
 
-    def list_tasks(self, spec: TaskSpecification) -> List[Task]:
+    def list_executable_tasks(
+        self, ready_as_of: datetime.datetime, limit: Optional[int] = None
+    ) -> List[Task]:
+        """
+        Lists up to ``limit`` active tasks without an execution in
+        progress that are ready as of ``ready_as_of``, highest priority
+        first, then earliest ready first.
+        """
+        pass
+
+    def next_ready_at(self) -> Optional[datetime.datetime]:
+        """
+        Returns the earliest ``ready_at`` of the active tasks without an
+        execution in progress, or None if there are none.
+        """
         pass
 
     def delete_task(self, task_id: str) -> None:
@@ -24,6 +65,15 @@ class TaskRepository(Protocol):
         method returns. If False, the write may be lost in a crash;
         crash recovery is expected to re-execute any lost work.
         In both cases, the write is visible to other connections
-        once the method returns.
+        once the method returns. Only the last execution is written,
+        as only it can have changed since the task was loaded.
+        """
+        pass
+
+    def update_tasks(self, tasks: List[Task], synchronous: bool) -> List[bool]:
+        """
+        Updates the tasks in one write, like ``update_task``. A task
+        updated concurrently is skipped and reported False, in input
+        order, without failing the others.
         """
         pass
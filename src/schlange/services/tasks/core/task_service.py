@@ -1,13 +1,19 @@
 import dataclasses
 import datetime
 import uuid
-from typing import List, Optional
+from typing import Callable, List, Optional
 
 from schlange.internal import core as internal_core
 
 from .cleanup_policy import CleanupPolicy
+from .errors import (
+    TaskExecutionNotEndedYetError,
+    TaskNotActiveError,
+    TaskNotReadyError,
+)
 from .lease_service import LeaseService
 from .message_queue import MessageQueue, TaskExecutionRequest
+from .new_task import NewTask
 from .task import Task
 from .task_repository import TaskRepository
 from .task_specification import TaskSpecification
@@ -20,6 +26,14 @@ class TaskService:
     task_repository: TaskRepository
     message_queue: MessageQueue
     lease_service: LeaseService
+    # Called with a task's ready_at whenever this process makes a task
+    # ready to run: on create, reactivation and retry.
+    ready_listeners: List[Callable[[datetime.datetime], None]] = dataclasses.field(
+        default_factory=list
+    )
+
+    def subscribe_ready(self, listener: Callable[[datetime.datetime], None]) -> None:
+        self.ready_listeners.append(listener)
 
     def create_task(
         self,
@@ -30,6 +44,8 @@ class TaskService:
         retry_policy: internal_core.RetryPolicy,
         id: Optional[str] = None,
         schedule_id: Optional[str] = None,
+        priority: int = 0,
+        group_id: Optional[str] = None,
     ) -> Task:
         """
         Raises:
@@ -47,24 +63,62 @@ class TaskService:
             retry_policy=retry_policy,
             visibility_timeout=visibility_timeout,
             schedule_id=schedule_id,
+            priority=priority,
+            group_id=group_id,
         )
         self.task_repository.create_task(task)
+        self._notify_ready(task)
         return task
 
+    def create_tasks(self, new_tasks: List[NewTask]) -> List[Optional[Task]]:
+        """Creates tasks in one transaction.
+
+        Returns the created tasks in input order, with None for each
+        task whose id already exists; the others are created anyway.
+
+        Raises:
+            IOError: IO error occurred during the operation.
+        """
+        now = self._now()
+        tasks = [
+            Task.create(
+                now=now,
+                id=new_task.id if new_task.id is not None else str(uuid.uuid4()),
+                kind=new_task.kind,
+                args=new_task.args,
+                delay=new_task.delay,
+                retry_policy=new_task.retry_policy,
+                visibility_timeout=new_task.visibility_timeout,
+                schedule_id=new_task.schedule_id,
+                priority=new_task.priority,
+                group_id=new_task.group_id,
+            )
+            for new_task in new_tasks
+        ]
+        if not tasks:
+            return []
+        created = self.task_repository.create_tasks(tasks)
+        result = [task if ok else None for task, ok in zip(tasks, created)]
+        # Only the earliest matters to listeners.
+        ready = [task for task in result if task is not None]
+        if ready:
+            self._notify_ready(min(ready, key=lambda task: task.ready_at))
+        return result
+
     def task(self, task_id: str) -> Task:
         """
         Raises:
             IOError: IO error occurred during the operation.
             TaskNotFoundError: Task was not found.
         """
-        return self.task_repository.get_task(task_id)
+        return self.task_repository.get_task(task_id, all_executions=True)
 
     def list_tasks(self, spec: TaskSpecification) -> List[Task]:
         """
         Raises:
             IOError: IO error occurred during the operation.
         """
-        return self.task_repository.list_tasks(spec)
+        return self.task_repository.list_tasks(spec, all_executions=True)
 
     def delete_task(self, task_id: str) -> None:
         """
@@ -74,9 +128,12 @@ class TaskService:
         """
         self.task_repository.delete_task(task_id)
 
-    def begin_execution(self, task_id: str) -> None:
+    def begin_execution(self, task_id: str, lookahead: float = 0.0) -> None:
         """Begins an execution for a task and publishes the execution request.
 
+        A task that becomes ready within ``lookahead`` seconds is
+        published with a delay, so it is delivered at its ``ready_at``.
+
         Raises:
             IOError: IO error occurred during the operation.
             TaskNotFoundError: Task was not found.
@@ -86,20 +143,58 @@ class TaskService:
             TaskUpdatedConcurrentlyError: Task was updated by another transaction.
         """
         task = self.task_repository.get_task(task_id)
-        task.begin_execution(now=self._now())
-        execution = task.last_execution
-        assert execution is not None
-        self.message_queue.publish(
-            TaskExecutionRequest(
-                task_id=task.id,
-                seq_num=execution.seq_num,
-                kind=task.kind,
-                args=task.args,
-                visibility_timeout=task.visibility_timeout,
-            )
-        )
+        now = self._now()
+        task.begin_execution(now=now, lookahead=lookahead)
+        self.message_queue.publish(self._execution_request(task, now))
         self.task_repository.update_task(task, synchronous=False)
 
+    def begin_executions(self, tasks: List[Task], lookahead: float = 0.0) -> List[Task]:
+        """Begins executions for loaded tasks as one batch.
+
+        Publishes all execution requests at once, then commits all
+        tasks in one transaction, keeping publish-before-commit. Tasks
+        that can no longer begin an execution are skipped. A task
+        updated between loading and the commit is published but not
+        committed, like a crash before the commit; load the tasks right
+        before calling this. Returns the tasks committed.
+
+        Raises:
+            IOError: IO error occurred during the operation.
+        """
+        now = self._now()
+        begun = []
+        for task in tasks:
+            try:
+                task.begin_execution(now=now, lookahead=lookahead)
+            except (
+                TaskNotActiveError,
+                TaskNotReadyError,
+                TaskExecutionNotEndedYetError,
+            ):
+                continue
+            begun.append(task)
+        if not begun:
+            return []
+        self.message_queue.publish_many(
+            [self._execution_request(task, now) for task in begun]
+        )
+        updated = self.task_repository.update_tasks(begun, synchronous=False)
+        return [task for task, ok in zip(begun, updated) if ok]
+
+    def execution_task(self, task_id: str, seq_num: int) -> Task:
+        """
+        Loads the task of a begun execution, e.g. for its args.
+
+        Raises:
+            IOError: IO error occurred during the operation.
+            TaskNotFoundError: Task was not found.
+            TaskExecutionNotFoundError: Execution was not found.
+            TaskExecutionNotBegunYetError: Execution is not committed yet.
+        """
+        task = self.task_repository.get_task(task_id)
+        task.execution_ended(seq_num)  # raises unless it has begun
+        return task
+
     def end_execution(self, task_id: str, seq_num: int, error: Optional[str]) -> Task:
         """
         Raises:
@@ -111,17 +206,37 @@ class TaskService:
         task = self.task_repository.get_task(task_id)
         task.end_execution(seq_num=seq_num, now=self._now(), error=error)
         self.task_repository.update_task(task, synchronous=True)
+        if task.state is TaskState.ACTIVE:
+            self._notify_ready(task)
         return task
 
-    def executable_tasks(self) -> List[Task]:
-        return self.task_repository.list_tasks(
-            TaskSpecification(
-                state=TaskState.ACTIVE,
-                ready_as_of=self._now(),
-                execution_in_progress=False,
-            )
+    def executable_tasks(
+        self, lookahead: float = 0.0, limit: Optional[int] = None
+    ) -> List[Task]:
+        """
+        Lists up to ``limit`` tasks that can begin an execution within
+        ``lookahead`` seconds, highest priority first, then earliest
+        ready first.
+
+        Raises:
+            IOError: IO error occurred during the operation.
+        """
+        return self.task_repository.list_executable_tasks(
+            ready_as_of=self._now() + datetime.timedelta(seconds=lookahead),
+            limit=limit,
         )
 
+    def next_ready_at(self) -> Optional[datetime.datetime]:
+        """
+        Returns when the earliest task that can begin an execution is
+        ready, or None if there is none. Unlike ``executable_tasks``,
+        this loads no tasks.
+
+        Raises:
+            IOError: IO error occurred during the operation.
+        """
+        return self.task_repository.next_ready_at()
+
     def reactivate_task(self, task_id: str, delay: float) -> Task:
         """
         Raises:
@@ -132,30 +247,58 @@ class TaskService:
         task = self.task_repository.get_task(task_id)
         task.reactivate(now=self._now(), delay=delay)
         self.task_repository.update_task(task, synchronous=True)
+        self._notify_ready(task)
         return task
 
-    def deletable_tasks(self, cleanup_policy: CleanupPolicy) -> List[Task]:
+    def delete_deletable_tasks(self, cleanup_policy: CleanupPolicy, limit: int) -> int:
         """
+        Deletes up to ``limit`` tasks that ``cleanup_policy`` lets go,
+        failed ones first, without loading them. Returns how many were
+        deleted; fewer than ``limit`` means none are left.
+
         Raises:
             IOError: IO error occurred during the operation.
         """
-        failed_deadline = cleanup_policy.failed_deadline(self._now())
-        succeeded_deadline = cleanup_policy.succeeded_deadline(self._now())
-        return self.task_repository.list_tasks(
+        now = self._now()
+        deleted = self.task_repository.delete_tasks_where(
             TaskSpecification(
                 state=TaskState.FAILED,
-                last_execution_ended_before=failed_deadline,
-            ),
-        ) + self.task_repository.list_tasks(
-            TaskSpecification(
-                state=TaskState.SUCCEEDED,
-                last_execution_ended_before=succeeded_deadline,
+                last_execution_ended_before=cleanup_policy.failed_deadline(now),
             ),
+            limit,
         )
+        if deleted < limit:
+            deleted += self.task_repository.delete_tasks_where(
+                TaskSpecification(
+                    state=TaskState.SUCCEEDED,
+                    last_execution_ended_before=cleanup_policy.succeeded_deadline(now),
+                ),
+                limit - deleted,
+            )
+        return deleted
 
     def acquire_lease(self, key: str, holder: str, ttl: float) -> bool:
         """Acquire or renew a lease via the lease service port."""
         return self.lease_service.acquire_lease(key=key, holder=holder, ttl=ttl)
 
+    def _notify_ready(self, task: Task) -> None:
+        for listener in self.ready_listeners:
+            listener(task.ready_at)
+
+    def _execution_request(
+        self, task: Task, now: datetime.datetime
+    ) -> TaskExecutionRequest:
+        execution = task.last_execution
+        assert execution is not None
+        return TaskExecutionRequest(
+            task_id=task.id,
+            seq_num=execution.seq_num,
+            kind=task.kind,
+            visibility_timeout=task.visibility_timeout,
+            delay=max(0.0, (task.ready_at - now).total_seconds()),
+            priority=task.priority,
+            group_id=task.group_id,
+        )
+
     def _now(self) -> datetime.datetime:
         return datetime.datetime.now(datetime.UTC)
@@ -1,3 +1,5 @@
+from typing import Any, Sequence
+
 from schlange.internal import core as internal_core
 from schlange.internal import sqlite
 from schlange.services.tasks import core
@@ -5,8 +7,11 @@ from schlange.services.tasks import core
 
 class DataMapper(sqlite.DataMapper):
 
-    def dump_task_execution(self, execution: core.TaskExecution) -> internal_core.DTO:
+    def dump_task_execution(
+        self, task_id: str, execution: core.TaskExecution
+    ) -> internal_core.DTO:
         return {
+            "task_id": task_id,
             "seq_num": execution.seq_num,
             "begun_at": self.dump_timestamp(execution.begun_at),
             "ended_at": (
@@ -17,16 +22,14 @@ class DataMapper(sqlite.DataMapper):
             "error": execution.error,
         }
 
-    def load_task_execution(self, dto: internal_core.DTO) -> core.TaskExecution:
+    def load_task_execution(self, row: Sequence[Any]) -> core.TaskExecution:
+        """Loads (seq_num, begun_at, ended_at, error) columns."""
+        seq_num, begun_at, ended_at, error = row
         return core.TaskExecution(
-            seq_num=dto["seq_num"],
-            begun_at=self.load_timestamp(dto["begun_at"]),
-            ended_at=(
-                self.load_timestamp(dto["ended_at"])
-                if dto.get("ended_at") is not None
-                else None
-            ),
-            error=dto["error"],
+            seq_num=seq_num,
+            begun_at=self.load_timestamp(begun_at),
+            ended_at=self.load_timestamp(ended_at) if ended_at is not None else None,
+            error=error,
         )
 
     def load_task_state(self, s: str) -> core.TaskState:
@@ -35,4 +35,73 @@ MIGRATIONS: list[Migration] = [
             """,
         ]
     ),
+    Migration(
+        statements=[
+            """
+            ALTER TABLE tasks ADD COLUMN priority INTEGER NOT NULL DEFAULT 0
+            """,
+        ]
+    ),
+    Migration(
+        statements=[
+            """
+            ALTER TABLE tasks ADD COLUMN group_id TEXT
+            """,
+        ]
+    ),
+    # Executions move out of the tasks row into an append-only table,
+    # so beginning or ending one writes a single execution row instead
+    # of re-serializing the whole history.
+    Migration(
+        statements=[
+            """
+            CREATE TABLE task_executions (
+                task_id TEXT NOT NULL,
+                seq_num INTEGER NOT NULL,
+                begun_at REAL NOT NULL,
+                ended_at REAL,
+                error TEXT,
+                PRIMARY KEY (task_id, seq_num)
+            )
+            """,
+            """
+            INSERT INTO task_executions (task_id, seq_num, begun_at, ended_at, error)
+            SELECT tasks.id,
+                   json_extract(value, '$.seq_num'),
+                   json_extract(value, '$.begun_at'),
+                   json_extract(value, '$.ended_at'),
+                   json_extract(value, '$.error')
+            FROM tasks, json_each(tasks.executions)
+            """,
+            """
+            ALTER TABLE tasks ADD COLUMN execution_count INTEGER NOT NULL DEFAULT 0
+            """,
+            """
+            UPDATE tasks SET execution_count = json_array_length(executions)
+            """,
+            """
+            ALTER TABLE tasks DROP COLUMN executions
+            """,
+            """
+            CREATE TRIGGER tasks_delete_executions AFTER DELETE ON tasks
+            BEGIN
+                DELETE FROM task_executions WHERE task_id = OLD.id;
+            END
+            """,
+        ]
+    ),
+    # The Dispatcher sleeps until the earliest task it could begin, so
+    # index only those; in-flight tasks would sit at the front of an
+    # index over all active tasks. Nothing else reads the old index.
+    Migration(
+        statements=[
+            """
+            CREATE INDEX idx_ready_at_where_pending ON tasks (ready_at)
+            WHERE state = 'ACTIVE' AND execution_in_progress = 0
+            """,
+            """
+            DROP INDEX idx_ready_at_where_active
+            """,
+        ]
+    ),
 ]
@@ -1,32 +1,43 @@
+import datetime
 import json
 import sqlite3
-from typing import List
+from typing import Any, List, Optional
 
 from schlange.internal import sqlite
 from schlange.services.tasks import core
 
 from .data_mapper import DataMapper
 
+# A taken id, or a schedule that already has an active task, inserts
+# nothing; callers check the rowcount.
 SQL_CREATE_TASK = """
     INSERT INTO tasks (id, version, created_at, args, state, ready_at, retry_policy,
-        executions, last_execution_ended_at, execution_in_progress, schedule_id, kind,
-        visibility_timeout)
+        execution_count, last_execution_ended_at, execution_in_progress, schedule_id,
+        kind, visibility_timeout, priority, group_id)
     VALUES (:id, :version, :created_at, :args, :state, :ready_at, :retry_policy,
-        :executions, :last_execution_ended_at, :execution_in_progress,
-        :schedule_id, :kind, :visibility_timeout)
+        :execution_count, :last_execution_ended_at, :execution_in_progress,
+        :schedule_id, :kind, :visibility_timeout, :priority, :group_id)
+    ON CONFLICT DO NOTHING
 """
 
-SQL_GET_TASK_BY_ID = """
-    SELECT id, version, created_at, args, state, ready_at, retry_policy, executions,
-        schedule_id, kind, visibility_timeout
+# Tasks are read with their last execution only, one primary key seek
+# each; the rest of the history is loaded on request.
+SQL_SELECT_TASKS = """
+    SELECT id, version, created_at, args, state, ready_at, retry_policy,
+        schedule_id, kind, visibility_timeout, priority, group_id, execution_count,
+        e.seq_num, e.begun_at, e.ended_at, e.error
     FROM tasks
+    LEFT JOIN task_executions e
+        ON e.task_id = tasks.id AND e.seq_num = tasks.execution_count - 1
+"""
+
+SQL_GET_TASK_BY_ID = f"""
+    {SQL_SELECT_TASKS}
     WHERE id = :id
 """
 
-SQL_GET_TASKS_BY_SPEC = """
-    SELECT id, version, created_at, args, state, ready_at, retry_policy, executions,
-        schedule_id, kind, visibility_timeout
-    FROM tasks
+SQL_GET_TASKS_BY_SPEC = f"""
+    {SQL_SELECT_TASKS}
     WHERE
         coalesce(state = :state, true) AND
         coalesce(ready_at <= :ready_as_of, true) AND
@@ -35,6 +46,46 @@ SQL_GET_TASKS_BY_SPEC = """
     ORDER BY ready_at, id
 """
 
+# Ready tasks are found on idx_ready_at_where_pending and sorted by
+# priority; LIMIT -1 means no limit.
+SQL_GET_EXECUTABLE_TASKS = f"""
+    {SQL_SELECT_TASKS}
+    WHERE state = 'ACTIVE' AND execution_in_progress = 0 AND ready_at <= :ready_as_of
+    ORDER BY priority DESC, ready_at, id
+    LIMIT :limit
+"""
+
+SQL_GET_NEXT_READY_AT = """
+    SELECT min(ready_at)
+    FROM tasks
+    WHERE state = 'ACTIVE' AND execution_in_progress = 0
+"""
+
+# The set terms of a specification, ANDed together. Unlike the
+# coalesce() filters above, plain comparisons let the planner use the
+# partial indexes, e.g. to find terminal tasks by last_execution_ended_at.
+SQL_SPEC_TERMS = {
+    "state": "state = :state",
+    "ready_as_of": "ready_at <= :ready_as_of",
+    "last_execution_ended_before": (
+        "last_execution_ended_at <= :last_execution_ended_before"
+    ),
+    "execution_in_progress": "execution_in_progress = :execution_in_progress",
+}
+
+# Deletes one bounded chunk; the tasks_delete_executions trigger drops
+# the chunk's executions in the same transaction.
+SQL_DELETE_TASKS_WHERE = """
+    DELETE
+    FROM tasks
+    WHERE rowid IN (
+        SELECT rowid
+        FROM tasks
+        WHERE {where}
+        LIMIT :limit
+    )
+"""
+
 SQL_DELETE_TASK_BY_ID = """
     DELETE
     FROM tasks
@@ -50,15 +101,38 @@ SQL_UPDATE_TASK_BY_ID = """
         state = :state,
         ready_at = :ready_at,
         retry_policy = :retry_policy,
-        executions = :executions,
+        execution_count = :execution_count,
         last_execution_ended_at = :last_execution_ended_at,
         execution_in_progress = :execution_in_progress,
         schedule_id = :schedule_id,
         kind = :kind,
-        visibility_timeout = :visibility_timeout
+        visibility_timeout = :visibility_timeout,
+        priority = :priority,
+        group_id = :group_id
     WHERE id = :id AND version = :version
 """
 
+SQL_GET_EXECUTIONS = """
+    SELECT seq_num, begun_at, ended_at, error
+    FROM task_executions
+    WHERE task_id = :task_id
+    ORDER BY seq_num
+"""
+
+SQL_SAVE_EXECUTION = """
+    INSERT INTO task_executions (task_id, seq_num, begun_at, ended_at, error)
+    VALUES (:task_id, :seq_num, :begun_at, :ended_at, :error)
+    ON CONFLICT (task_id, seq_num) DO UPDATE
+    SET ended_at = excluded.ended_at, error = excluded.error
+"""
+
+# Drops executions cleared by reactivation; a primary key range seek
+# that finds nothing on every other update.
+SQL_DELETE_EXECUTIONS_FROM = """
+    DELETE FROM task_executions
+    WHERE task_id = :task_id AND seq_num >= :execution_count
+"""
+
 
 class TaskRepository:
 
@@ -68,83 +142,134 @@ class TaskRepository:
 
     def create_task(self, task: core.Task) -> None:
         with self.db.transaction() as tx:
-            try:
-                tx.execute(
-                    SQL_CREATE_TASK,
-                    {
-                        "id": task.id,
-                        "version": task.version,
-                        "created_at": self.data_mapper.dump_timestamp(task.created_at),
-                        "args": json.dumps(task.args),
-                        "state": self.data_mapper.dump_task_state(task.state),
-                        "ready_at": self.data_mapper.dump_timestamp(task.ready_at),
-                        "retry_policy": json.dumps(
-                            self.data_mapper.dump_retry_policy(task.retry_policy)
-                        ),
-                        "executions": json.dumps(
-                            [
-                                self.data_mapper.dump_task_execution(execution)
-                                for execution in task.executions
-                            ]
-                        ),
-                        "last_execution_ended_at": (
-                            self.data_mapper.dump_timestamp(
-                                task.last_execution.ended_at
-                            )
-                            if task.last_execution is not None
-                            and task.last_execution.ended_at is not None
-                            else None
-                        ),
-                        "execution_in_progress": (
-                            1
-                            if task.last_execution is not None
-                            and not task.last_execution.ended
-                            else 0
-                        ),
-                        "schedule_id": task.schedule_id,
-                        "kind": task.kind,
-                        "visibility_timeout": task.visibility_timeout,
-                    },
-                )
-            except sqlite3.IntegrityError:
+            if not self._insert(tx, task):
                 raise core.TaskAlreadyExistsError()
 
-    def get_task(self, task_id: str) -> core.Task:
+    def create_tasks(self, tasks: List[core.Task]) -> List[bool]:
+        with self.db.transaction() as tx:
+            return [self._insert(tx, task) for task in tasks]
+
+    def _insert(self, tx: sqlite.Transaction, task: core.Task) -> bool:
+        inserted = tx.execute(
+            SQL_CREATE_TASK,
+            {
+                "id": task.id,
+                "version": task.version,
+                "created_at": self.data_mapper.dump_timestamp(task.created_at),
+                "args": json.dumps(task.args),
+                "state": self.data_mapper.dump_task_state(task.state),
+                "ready_at": self.data_mapper.dump_timestamp(task.ready_at),
+                "retry_policy": json.dumps(
+                    self.data_mapper.dump_retry_policy(task.retry_policy)
+                ),
+                "execution_count": task.execution_count,
+                "last_execution_ended_at": (
+                    self.data_mapper.dump_timestamp(task.last_execution.ended_at)
+                    if task.last_execution is not None
+                    and task.last_execution.ended_at is not None
+                    else None
+                ),
+                "execution_in_progress": (
+                    1
+                    if task.last_execution is not None and not task.last_execution.ended
+                    else 0
+                ),
+                "schedule_id": task.schedule_id,
+                "kind": task.kind,
+                "visibility_timeout": task.visibility_timeout,
+                "priority": task.priority,
+                "group_id": task.group_id,
+            },
+        )
+        if not inserted:
+            return False
+        tx.execute_many(
+            SQL_SAVE_EXECUTION,
+            (
+                self.data_mapper.dump_task_execution(task.id, execution)
+                for execution in task.executions
+            ),
+        )
+        return True
+
+    def get_task(self, task_id: str, all_executions: bool = False) -> core.Task:
         with self.db.transaction(read_only=True) as tx:
             try:
                 row = tx.query_row(SQL_GET_TASK_BY_ID, {"id": task_id})
             except sqlite.NoRowsError:
                 raise core.TaskNotFoundError()
-            return self._collect_task(row)
+            task = self._collect_task(row)
+            if all_executions:
+                self._load_executions(tx, task)
+            return task
 
-    def list_tasks(self, spec: core.TaskSpecification) -> List[core.Task]:
+    def list_tasks(
+        self, spec: core.TaskSpecification, all_executions: bool = False
+    ) -> List[core.Task]:
+        with self.db.transaction(read_only=True) as tx:
+            rows = tx.query(SQL_GET_TASKS_BY_SPEC, self._spec_params(spec))
+            tasks = [self._collect_task(row) for row in rows]
+            if all_executions:
+                for task in tasks:
+                    self._load_executions(tx, task)
+            return tasks
+
+    def delete_tasks_where(self, spec: core.TaskSpecification, limit: int) -> int:
+        params = {
+            name: value
+            for name, value in self._spec_params(spec).items()
+            if value is not None
+        }
+        where = " AND ".join(SQL_SPEC_TERMS[name] for name in params) or "true"
+        with self.db.transaction(synchronous=False) as tx:
+            return tx.execute(
+                SQL_DELETE_TASKS_WHERE.format(where=where), {**params, "limit": limit}
+            )
+
+    def list_executable_tasks(
+        self, ready_as_of: datetime.datetime, limit: Optional[int] = None
+    ) -> List[core.Task]:
         with self.db.transaction(read_only=True) as tx:
             rows = tx.query(
-                SQL_GET_TASKS_BY_SPEC,
+                SQL_GET_EXECUTABLE_TASKS,
                 {
-                    "state": spec.state.value if spec.state is not None else None,
-                    "ready_as_of": (
-                        self.data_mapper.dump_timestamp(spec.ready_as_of)
-                        if spec.ready_as_of is not None
-                        else None
-                    ),
-                    "last_execution_ended_before": (
-                        self.data_mapper.dump_timestamp(
-                            spec.last_execution_ended_before
-                        )
-                        if spec.last_execution_ended_before is not None
-                        else None
-                    ),
-                    "execution_in_progress": (
-                        1
-                        if spec.execution_in_progress is True
-                        else 0 if spec.execution_in_progress is False else None
-                    ),
+                    "ready_as_of": self.data_mapper.dump_timestamp(ready_as_of),
+                    "limit": -1 if limit is None else limit,
                 },
             )
             return [self._collect_task(row) for row in rows]
 
+    def next_ready_at(self) -> Optional[datetime.datetime]:
+        with self.db.transaction(read_only=True) as tx:
+            ready_at = tx.query_row(SQL_GET_NEXT_READY_AT)[0]
+            if ready_at is None:
+                return None
+            return self.data_mapper.load_timestamp(ready_at)
+
+    def _spec_params(self, spec: core.TaskSpecification) -> dict[str, Any]:
+        return {
+            "state": spec.state.value if spec.state is not None else None,
+            "ready_as_of": (
+                self.data_mapper.dump_timestamp(spec.ready_as_of)
+                if spec.ready_as_of is not None
+                else None
+            ),
+            "last_execution_ended_before": (
+                self.data_mapper.dump_timestamp(spec.last_execution_ended_before)
+                if spec.last_execution_ended_before is not None
+                else None
+            ),
+            "execution_in_progress": (
+                1
+                if spec.execution_in_progress is True
+                else 0 if spec.execution_in_progress is False else None
+            ),
+        }
+
     def _collect_task(self, row: sqlite3.Row) -> core.Task:
+        executions = []
+        if row[13] is not None:
+            executions.append(self.data_mapper.load_task_execution(row[13:17]))
         return core.Task(
             id=row[0],
             version=row[1],
@@ -153,14 +278,22 @@ class TaskRepository:
             state=self.data_mapper.load_task_state(row[4]),
             ready_at=self.data_mapper.load_timestamp(row[5]),
             retry_policy=self.data_mapper.load_retry_policy(json.loads(row[6])),
-            visibility_timeout=row[10],
-            executions=[
-                self.data_mapper.load_task_execution(dto) for dto in json.loads(row[7])
-            ],
-            schedule_id=row[8],
-            kind=row[9],
+            visibility_timeout=row[9],
+            executions=executions,
+            schedule_id=row[7],
+            kind=row[8],
+            priority=row[10],
+            group_id=row[11],
+            execution_offset=row[12] - len(executions),
         )
 
+    def _load_executions(self, tx: sqlite.Transaction, task: core.Task) -> None:
+        task.executions = [
+            self.data_mapper.load_task_execution(row)
+            for row in tx.query(SQL_GET_EXECUTIONS, {"task_id": task.id})
+        ]
+        task.execution_offset = 0
+
     def delete_task(self, task_id: str) -> None:
         with self.db.transaction() as tx:
             rows_affected = tx.execute(SQL_DELETE_TASK_BY_ID, {"id": task_id})
@@ -169,40 +302,54 @@ class TaskRepository:
 
     def update_task(self, task: core.Task, synchronous: bool) -> None:
         with self.db.transaction(synchronous=synchronous) as tx:
-            rows_affected = tx.execute(
-                SQL_UPDATE_TASK_BY_ID,
-                {
-                    "id": task.id,
-                    "version": task.version,
-                    "created_at": self.data_mapper.dump_timestamp(task.created_at),
-                    "args": json.dumps(task.args),
-                    "state": self.data_mapper.dump_task_state(task.state),
-                    "ready_at": self.data_mapper.dump_timestamp(task.ready_at),
-                    "retry_policy": json.dumps(
-                        self.data_mapper.dump_retry_policy(task.retry_policy)
-                    ),
-                    "executions": json.dumps(
-                        [
-                            self.data_mapper.dump_task_execution(execution)
-                            for execution in task.executions
-                        ]
-                    ),
-                    "last_execution_ended_at": (
-                        self.data_mapper.dump_timestamp(task.last_execution.ended_at)
-                        if task.last_execution is not None
-                        and task.last_execution.ended_at is not None
-                        else None
-                    ),
-                    "execution_in_progress": (
-                        1
-                        if task.last_execution is not None
-                        and not task.last_execution.ended
-                        else 0
-                    ),
-                    "schedule_id": task.schedule_id,
-                    "kind": task.kind,
-                    "visibility_timeout": task.visibility_timeout,
-                },
-            )
-            if not rows_affected:
+            if not self._update(tx, task):
                 raise core.TaskUpdatedConcurrentlyError()
+
+    def update_tasks(self, tasks: List[core.Task], synchronous: bool) -> List[bool]:
+        with self.db.transaction(synchronous=synchronous) as tx:
+            return [self._update(tx, task) for task in tasks]
+
+    def _update(self, tx: sqlite.Transaction, task: core.Task) -> bool:
+        rows_affected = tx.execute(
+            SQL_UPDATE_TASK_BY_ID,
+            {
+                "id": task.id,
+                "version": task.version,
+                "created_at": self.data_mapper.dump_timestamp(task.created_at),
+                "args": json.dumps(task.args),
+                "state": self.data_mapper.dump_task_state(task.state),
+                "ready_at": self.data_mapper.dump_timestamp(task.ready_at),
+                "retry_policy": json.dumps(
+                    self.data_mapper.dump_retry_policy(task.retry_policy)
+                ),
+                "execution_count": task.execution_count,
+                "last_execution_ended_at": (
+                    self.data_mapper.dump_timestamp(task.last_execution.ended_at)
+                    if task.last_execution is not None
+                    and task.last_execution.ended_at is not None
+                    else None
+                ),
+                "execution_in_progress": (
+                    1
+                    if task.last_execution is not None and not task.last_execution.ended
+                    else 0
+                ),
+                "schedule_id": task.schedule_id,
+                "kind": task.kind,
+                "visibility_timeout": task.visibility_timeout,
+                "priority": task.priority,
+                "group_id": task.group_id,
+            },
+        )
+        if not rows_affected:
+            return False
+        tx.execute(
+            SQL_DELETE_EXECUTIONS_FROM,
+            {"task_id": task.id, "execution_count": task.execution_count},
+        )
+        if task.last_execution is not None:
+            tx.execute(
+                SQL_SAVE_EXECUTION,
+                self.data_mapper.dump_task_execution(task.id, task.last_execution),
+            )
+        return True
@@ -0,0 +1,61 @@
+import datetime
+import unittest
+
+from schlange.internal import background
+
+NOW = datetime.datetime(2026, 1, 1, tzinfo=datetime.UTC)
+
+
+def _at(seconds):
+    return NOW + datetime.timedelta(seconds=seconds)
+
+
+class DeadlinesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.deadlines = background.Deadlines()
+
+    def test_sleeps_maximum_without_deadlines(self):
+        self.assertEqual(self.deadlines.sleep_time(NOW, 5.0), 5.0)
+
+    def test_sleeps_until_earliest_deadline(self):
+        self.deadlines.push(_at(3))
+        self.deadlines.push(_at(1))
+        self.deadlines.push(_at(2))
+        self.assertEqual(self.deadlines.sleep_time(NOW, 5.0), 1.0)
+
+    def test_sleep_is_bounded(self):
+        self.deadlines.push(_at(60))
+        self.assertEqual(self.deadlines.sleep_time(NOW, 5.0), 5.0)
+        self.deadlines.push(_at(-1))
+        self.assertEqual(self.deadlines.sleep_time(NOW, 5.0), 0.0)
+
+    def test_push_reports_new_earliest(self):
+        self.assertTrue(self.deadlines.push(_at(2)))
+        self.assertFalse(self.deadlines.push(_at(3)))
+        self.assertFalse(self.deadlines.push(_at(2)))
+        self.assertTrue(self.deadlines.push(_at(1)))
+
+    def test_keeps_only_earliest(self):
+        for seconds in [3, 3, 1, 2]:
+            self.deadlines.push(_at(seconds))
+        self.assertEqual(self.deadlines.earliest(), _at(1))
+        self.assertEqual(self.deadlines.deadline, _at(1))
+
+    def test_pop_due_drops_deadline_up_to_now(self):
+        self.deadlines.push(_at(1))
+        self.assertFalse(self.deadlines.pop_due(NOW))
+        self.deadlines.push(_at(0))
+        self.assertTrue(self.deadlines.pop_due(NOW))
+        self.assertIsNone(self.deadlines.earliest())
+        self.assertFalse(self.deadlines.pop_due(NOW))
+
+    def test_clear(self):
+        self.deadlines.push(_at(0))
+        self.deadlines.clear()
+        self.assertIsNone(self.deadlines.earliest())
+        self.assertFalse(self.deadlines.pop_due(NOW))
+
+
+if __name__ == "__main__":
+    unittest.main()
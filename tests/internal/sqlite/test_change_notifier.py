@@ -0,0 +1,88 @@
+import pathlib
+import tempfile
+import threading
+import unittest
+
+from schlange.internal import sqlite
+from schlange.internal.sqlite import Migration
+
+
+class ChangeNotifierTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = pathlib.Path(self.dir.name) / "db.sqlite"
+        self.db_ctx = sqlite.Database.open(path=self.path, read_pool_capacity=1)
+        self.db = self.db_ctx.__enter__()
+        self.db.migrate(
+            [Migration(statements=["CREATE TABLE things (id INTEGER PRIMARY KEY)"])]
+        )
+        self.changed = threading.Event()
+        self.notifier = sqlite.ChangeNotifier(path=self.path, interval=0.01)
+        self.notifier.subscribe(self.changed.set)
+
+    def tearDown(self):
+        self.db_ctx.__exit__(None, None, None)
+        self.dir.cleanup()
+
+    def test_notifies_on_commit_by_another_process(self):
+        with self.notifier:
+            self._wait_for_first_poll()
+            self._commit_as_another_process(1)
+            self.assertTrue(self.changed.wait(timeout=5))
+
+    def test_skips_commits_made_by_this_process(self):
+        with self.notifier:
+            self._wait_for_first_poll()
+            with self.db.transaction() as tx:
+                tx.execute("INSERT INTO things (id) VALUES (1)")
+            with self.db.transaction(synchronous=False) as tx:
+                tx.execute("INSERT INTO things (id) VALUES (2)")
+            self.assertFalse(self.changed.wait(timeout=0.1))
+            self._commit_as_another_process(3)
+            self.assertTrue(self.changed.wait(timeout=5))
+
+    def test_does_not_notify_without_commits(self):
+        with self.notifier:
+            self._wait_for_first_poll()
+            with self.db.transaction(read_only=True) as tx:
+                tx.query_row("SELECT count(*) FROM things")
+            self.assertFalse(self.changed.wait(timeout=0.1))
+
+    def test_skips_group_commits_made_by_this_process(self):
+        with sqlite.Database.open(
+            path=self.path, read_pool_capacity=1, group_commit_window=0.0
+        ) as db:
+            with self.notifier:
+                self._wait_for_first_poll()
+                with db.transaction() as tx:
+                    tx.execute("INSERT INTO things (id) VALUES (1)")
+                self.assertFalse(self.changed.wait(timeout=0.1))
+
+    def test_notifies_on_foreign_commit_between_local_commits(self):
+        self.notifier.interval = 3600
+        with self.notifier:
+            self._wait_for_first_poll()
+            self._commit_locally(1)
+            self._commit_as_another_process(2)
+            self._commit_locally(3)
+            self.notifier.wake()
+            self.assertTrue(self.changed.wait(timeout=5))
+
+    def _commit_locally(self, id):
+        with self.db.transaction() as tx:
+            tx.execute("INSERT INTO things (id) VALUES (:id)", {"id": id})
+
+    def _commit_as_another_process(self, id):
+        # Commits through a bare Connection are not counted as local.
+        with sqlite.Connection.open(path=self.path, synchronous_full=False) as conn:
+            with conn.transaction() as tx:
+                tx.execute("INSERT INTO things (id) VALUES (:id)", {"id": id})
+
+    def _wait_for_first_poll(self):
+        while self.notifier.data_version is None:
+            self.notifier.stopping.wait(0.01)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import pathlib
+import sqlite3
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from schlange.internal import sqlite
+from schlange.internal.sqlite import Migration
+
+
+class GroupCommitTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = pathlib.Path(self.dir.name) / "db.sqlite"
+        self.db_ctx = sqlite.Database.open(
+            path=self.path, read_pool_capacity=1, group_commit_window=0.05
+        )
+        self.db = self.db_ctx.__enter__()
+        self.db.migrate(
+            [Migration(statements=["CREATE TABLE things (id INTEGER PRIMARY KEY)"])]
+        )
+
+    def tearDown(self):
+        self.db_ctx.__exit__(None, None, None)
+        self.dir.cleanup()
+
+    def _ids(self):
+        with self.db.transaction(read_only=True) as tx:
+            return sorted(row[0] for row in tx.query("SELECT id FROM things"))
+
+    def _insert_concurrently(self, ids, insert):
+        errors = {}
+
+        def run(i):
+            try:
+                insert(i)
+            except Exception as e:
+                errors[i] = e
+
+        threads = [threading.Thread(target=run, args=(i,)) for i in ids]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return errors
+
+    def test_concurrent_writers_share_commits(self):
+        assert self.db.group_committer is not None
+        commit = mock.patch.object(
+            self.db.group_committer,
+            "_commit",
+            wraps=self.db.group_committer._commit,
+        )
+
+        def insert(i):
+            with self.db.transaction() as tx:
+                tx.execute("INSERT INTO things (id) VALUES (?)", (i,))
+
+        with commit as commit_mock:
+            errors = self._insert_concurrently(range(16), insert)
+        self.assertEqual(errors, {})
+        self.assertEqual(self._ids(), list(range(16)))
+        self.assertLess(commit_mock.call_count, 16)
+
+    def test_failing_writer_rolls_back_only_its_own_writes(self):
+        def insert(i):
+            with self.db.transaction() as tx:
+                tx.execute("INSERT INTO things (id) VALUES (?)", (i,))
+                if i == 3:
+                    tx.execute("INSERT INTO things (id) VALUES (?)", (i,))
+
+        errors = self._insert_concurrently(range(1, 6), insert)
+        self.assertEqual(list(errors), [3])
+        self.assertIsInstance(errors[3], sqlite3.IntegrityError)
+        self.assertEqual(self._ids(), [1, 2, 4, 5])
+
+    def test_writes_are_committed_when_transaction_returns(self):
+        with self.db.transaction() as tx:
+            tx.execute("INSERT INTO things (id) VALUES (1)")
+        with sqlite.Connection.open(path=self.path, synchronous_full=False) as conn:
+            with conn.transaction(read_only=True) as tx:
+                self.assertEqual(tx.query_row("SELECT count(*) FROM things")[0], 1)
+
+    def test_unsynchronous_writes_bypass_group_commit(self):
+        assert self.db.group_committer is not None
+        with mock.patch.object(self.db.group_committer, "transaction") as grouped:
+            with self.db.transaction(synchronous=False) as tx:
+                tx.execute("INSERT INTO things (id) VALUES (1)")
+        grouped.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
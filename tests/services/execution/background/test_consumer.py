@@ -0,0 +1,90 @@
+import json
+import unittest
+from unittest import mock
+
+from schlange.api import messaging as messaging_api
+from schlange.services.execution import background as execution_background
+from schlange.services.execution import core as execution_core
+from schlange.services.messaging import core as messaging_core
+
+
+def _message(message_id="m1", version=1):
+    return messaging_api.Message(
+        id=message_id,
+        queue="test_kind",
+        payload=json.dumps(
+            {"task_id": "t1", "seq_num": 0, "kind": "test_kind"}
+        ).encode(),
+        visibility_timeout=30.0,
+        delivery_count=1,
+        version=version,
+    )
+
+
+def _consumer(messaging_server, execution_service, wait_time=1.0):
+    return execution_background.Consumer(
+        queue="test_kind",
+        wait_time=wait_time,
+        messaging_server=messaging_server,
+        execution_service=execution_service,
+    )
+
+
+class ConsumerWorkTest(unittest.TestCase):
+
+    def test_work_long_polls_with_wait_time(self):
+        server = mock.MagicMock()
+        server.claim_message.side_effect = messaging_core.NoMessagesAvailable()
+        consumer = _consumer(server, mock.MagicMock(), wait_time=2.5)
+        consumer.work()
+        server.claim_message.assert_called_once_with(
+            messaging_api.ClaimMessageRequest(queue="test_kind", wait_time=2.5)
+        )
+
+    def test_work_acks_executed_message(self):
+        server = mock.MagicMock()
+        server.claim_message.side_effect = [
+            messaging_api.ClaimMessageResponse(message=_message()),
+            messaging_core.NoMessagesAvailable(),
+        ]
+        consumer = _consumer(server, mock.MagicMock())
+        consumer.work()
+        server.ack_message.assert_called_once_with(
+            messaging_api.AckMessageRequest(message_id="m1", version=1)
+        )
+
+    def test_work_tracks_message_in_heartbeat_while_executing(self):
+        server = mock.MagicMock()
+        message = _message()
+        server.claim_message.side_effect = [
+            messaging_api.ClaimMessageResponse(message=message),
+            messaging_core.NoMessagesAvailable(),
+        ]
+        execution_service = mock.MagicMock()
+        consumer = _consumer(server, execution_service)
+        tracked = []
+        execution_service.execute.side_effect = lambda **_: tracked.append(
+            consumer.heartbeat.message
+        )
+        consumer.work()
+        self.assertEqual(tracked, [message])
+        self.assertIsNone(consumer.heartbeat.message)
+
+    def test_work_requeues_aborted_message(self):
+        server = mock.MagicMock()
+        server.claim_message.side_effect = [
+            messaging_api.ClaimMessageResponse(message=_message()),
+            messaging_core.NoMessagesAvailable(),
+        ]
+        execution_service = mock.MagicMock()
+        execution_service.execute.side_effect = execution_core.AbortedError()
+        consumer = _consumer(server, execution_service)
+        consumer.work()
+        server.requeue_message.assert_called_once_with(
+            messaging_api.RequeueMessageRequest(message_id="m1", version=1)
+        )
+        server.ack_message.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+import threading
+import time
+import unittest
+from unittest import mock
+
+from schlange.api import messaging as messaging_api
+from schlange.services.execution import background as execution_background
+
+
+def _message(visibility_timeout):
+    return messaging_api.Message(
+        id="m1",
+        queue="test_kind",
+        payload=b"{}",
+        visibility_timeout=visibility_timeout,
+        delivery_count=1,
+        version=3,
+    )
+
+
+class HeartbeatTest(unittest.TestCase):
+
+    def test_extends_visibility_while_tracking(self):
+        server = mock.MagicMock()
+        extended = threading.Semaphore(0)
+        server.change_message_visibility.side_effect = lambda _: extended.release()
+        with execution_background.Heartbeat("test_kind", server) as heartbeat:
+            with heartbeat.tracking(_message(visibility_timeout=0.02)):
+                self.assertTrue(extended.acquire(timeout=5))
+                self.assertTrue(extended.acquire(timeout=5))
+        server.change_message_visibility.assert_called_with(
+            messaging_api.ChangeMessageVisibilityRequest(
+                message_id="m1", version=3, visibility_timeout=0.02
+            )
+        )
+
+    def test_stops_extending_after_tracking_ends(self):
+        server = mock.MagicMock()
+        with execution_background.Heartbeat("test_kind", server) as heartbeat:
+            with heartbeat.tracking(_message(visibility_timeout=0.2)):
+                pass
+            time.sleep(0.2)
+        server.change_message_visibility.assert_not_called()
+
+    def test_stop_while_idle_returns_promptly(self):
+        heartbeat = execution_background.Heartbeat("test_kind", mock.MagicMock())
+        heartbeat.start()
+        started_at = time.monotonic()
+        heartbeat.stop()
+        self.assertLess(time.monotonic() - started_at, 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
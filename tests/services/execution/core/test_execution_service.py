@@ -11,10 +11,22 @@ from schlange.services.execution.core import (
 )
 
 
+def _execution(task_id="task-1", seq_num=0, args=None):
+    return TaskExecution(task_id=task_id, seq_num=seq_num, args=args or {})
+
+
+def _make_task_service():
+    task_service = mock.Mock(spec=["get_execution", "end_execution"])
+    task_service.get_execution.side_effect = lambda task_id, seq_num: _execution(
+        task_id, seq_num
+    )
+    task_service.end_execution.return_value = None
+    return task_service
+
+
 def _make_service(handlers, task_service=None):
     if task_service is None:
-        task_service = mock.Mock(spec=["end_execution"])
-        task_service.end_execution.return_value = None
+        task_service = _make_task_service()
     return ExecutionService(handlers=handlers, task_service=task_service)
 
 
@@ -23,7 +35,7 @@ class ExecuteTaskTest(unittest.TestCase):
         handler = mock.Mock(spec=["__call__"])
         service = _make_service(handlers={"test_kind": handler})
 
-        service.execute(task_id="task-1", seq_num=0, kind="test_kind", args={"a": 1})
+        service.execute(task_id="task-1", seq_num=0, kind="test_kind")
 
         handler.assert_called_once()
         service.task_service.end_execution.assert_called_once_with("task-1", 0, None)
@@ -32,73 +44,168 @@ class ExecuteTaskTest(unittest.TestCase):
         handler = mock.Mock(spec=["__call__"], side_effect=ValueError("boom"))
         service = _make_service(handlers={"test_kind": handler})
 
-        service.execute(task_id="task-1", seq_num=2, kind="test_kind", args={"a": 1})
+        service.execute(task_id="task-1", seq_num=2, kind="test_kind")
 
         handler.assert_called_once()
         service.task_service.end_execution.assert_called_once_with("task-1", 2, "boom")
 
     def test_execute_with_unregistered_kind_raises_not_found_error(self):
         handler = mock.Mock(spec=["__call__"])
-        task_service = mock.Mock(spec=["end_execution"])
+        task_service = _make_task_service()
         service = ExecutionService(
             handlers={"test_kind": handler}, task_service=task_service
         )
 
         with self.assertRaises(NotFoundError):
-            service.execute(task_id="task-1", seq_num=0, kind="unknown_kind", args={})
+            service.execute(task_id="task-1", seq_num=0, kind="unknown_kind")
 
         handler.assert_not_called()
         task_service.end_execution.assert_not_called()
 
     def test_execute_when_end_execution_raises_aborted_error_propagates(self):
         handler = mock.Mock(spec=["__call__"])
-        task_service = mock.Mock(spec=["end_execution"])
-        task_service.end_execution.side_effect = AbortedError("conflict")
+        task_service = _make_task_service()
+        task_service.end_execution.side_effect = AbortedError("updated concurrently")
         service = ExecutionService(
-            handlers={"test_kind": handler}, task_service=task_service
+            handlers={"test_kind": handler},
+            task_service=task_service,
+            retry_attempts=3,
+            retry_backoff=0.0,
         )
 
         with self.assertRaises(AbortedError):
-            service.execute(task_id="task-1", seq_num=0, kind="test_kind", args={})
+            service.execute(task_id="task-1", seq_num=0, kind="test_kind")
+        self.assertEqual(task_service.end_execution.call_count, 3)
 
     def test_execute_when_end_execution_raises_not_found_error_propagates(self):
         handler = mock.Mock(spec=["__call__"])
-        task_service = mock.Mock(spec=["end_execution"])
+        task_service = _make_task_service()
         task_service.end_execution.side_effect = NotFoundError("missing")
         service = ExecutionService(
             handlers={"test_kind": handler}, task_service=task_service
         )
 
         with self.assertRaises(NotFoundError):
-            service.execute(task_id="task-1", seq_num=0, kind="test_kind", args={})
+            service.execute(task_id="task-1", seq_num=0, kind="test_kind")
 
     def test_execute_when_end_execution_raises_failed_precondition_propagates(
         self,
     ):
         handler = mock.Mock(spec=["__call__"])
-        task_service = mock.Mock(spec=["end_execution"])
+        task_service = _make_task_service()
         task_service.end_execution.side_effect = FailedPreconditionError("wrong state")
         service = ExecutionService(
-            handlers={"test_kind": handler}, task_service=task_service
+            handlers={"test_kind": handler},
+            task_service=task_service,
+            retry_attempts=3,
+            retry_backoff=0.0,
         )
 
         with self.assertRaises(FailedPreconditionError):
-            service.execute(task_id="task-1", seq_num=0, kind="test_kind", args={})
+            service.execute(task_id="task-1", seq_num=0, kind="test_kind")
+        self.assertEqual(task_service.end_execution.call_count, 1)
+
+    def test_execute_retries_end_execution_on_conflict(self):
+        handler = mock.Mock(spec=["__call__"])
+        task_service = _make_task_service()
+        task_service.end_execution.side_effect = [
+            AbortedError("updated concurrently"),
+            AbortedError("updated concurrently"),
+            None,
+        ]
+        service = ExecutionService(
+            handlers={"test_kind": handler},
+            task_service=task_service,
+            retry_backoff=0.0,
+        )
+
+        service.execute(task_id="task-1", seq_num=0, kind="test_kind")
+
+        handler.assert_called_once()
+        self.assertEqual(task_service.end_execution.call_count, 3)
+
+    def test_execute_waits_for_execution_to_be_committed_before_handler(self):
+        handler = mock.Mock(spec=["__call__"])
+        task_service = _make_task_service()
+        task_service.get_execution.side_effect = [
+            AbortedError("not committed yet"),
+            _execution(),
+        ]
+        service = ExecutionService(
+            handlers={"test_kind": handler},
+            task_service=task_service,
+            retry_backoff=0.0,
+        )
+
+        service.execute(task_id="task-1", seq_num=0, kind="test_kind")
+
+        self.assertEqual(task_service.get_execution.call_count, 2)
+        handler.assert_called_once()
+        task_service.end_execution.assert_called_once_with("task-1", 0, None)
+
+    def test_execute_uncommitted_execution_raises_aborted_without_handler(self):
+        handler = mock.Mock(spec=["__call__"])
+        task_service = _make_task_service()
+        task_service.get_execution.side_effect = AbortedError("not committed yet")
+        service = ExecutionService(
+            handlers={"test_kind": handler},
+            task_service=task_service,
+            retry_attempts=3,
+            retry_backoff=0.0,
+        )
+
+        with self.assertRaises(AbortedError):
+            service.execute(task_id="task-1", seq_num=0, kind="test_kind")
 
-    def test_handler_receives_correct_task_execution_data(self):
+        self.assertEqual(task_service.get_execution.call_count, 3)
+        handler.assert_not_called()
+        task_service.end_execution.assert_not_called()
+
+    def test_execute_ended_execution_skips_handler(self):
+        handler = mock.Mock(spec=["__call__"])
+        task_service = _make_task_service()
+        task_service.get_execution.side_effect = None
+        task_service.get_execution.return_value = None
+        service = ExecutionService(
+            handlers={"test_kind": handler}, task_service=task_service
+        )
+
+        service.execute(task_id="task-1", seq_num=0, kind="test_kind")
+
+        handler.assert_not_called()
+        task_service.end_execution.assert_not_called()
+
+    def test_execute_when_task_is_gone_raises_not_found_without_handler(self):
+        handler = mock.Mock(spec=["__call__"])
+        task_service = _make_task_service()
+        task_service.get_execution.side_effect = NotFoundError("missing")
+        service = ExecutionService(
+            handlers={"test_kind": handler}, task_service=task_service
+        )
+
+        with self.assertRaises(NotFoundError):
+            service.execute(task_id="task-1", seq_num=0, kind="test_kind")
+
+        handler.assert_not_called()
+
+    def test_handler_receives_loaded_task_execution(self):
         received: list[TaskExecution] = []
 
         def capture(execution: TaskExecution) -> None:
             received.append(execution)
 
-        service = _make_service(handlers={"test_kind": capture})
-
-        service.execute(
-            task_id="task-7",
-            seq_num=3,
-            kind="test_kind",
-            args={"x": 1, "y": 2},
+        task_service = _make_task_service()
+        task_service.get_execution.side_effect = None
+        task_service.get_execution.return_value = _execution(
+            "task-7", 3, {"x": 1, "y": 2}
         )
+        service = _make_service(
+            handlers={"test_kind": capture}, task_service=task_service
+        )
+
+        service.execute(task_id="task-7", seq_num=3, kind="test_kind")
+
+        task_service.get_execution.assert_called_once_with("task-7", 3)
 
         self.assertEqual(len(received), 1)
         execution = received[0]
@@ -0,0 +1,43 @@
+import datetime
+import unittest
+import uuid
+
+from schlange.services.messaging import core
+from schlange.services.messaging import memory as messaging_memory
+from tests.services.messaging.sqlite import test_messaging_store
+
+
+class StoreTest(test_messaging_store.StoreTest):
+    """Runs the SQLite store's contract tests against the memory store."""
+
+    def setUp(self):
+        self.store = messaging_memory.Store()
+        self.now = self._now()
+        self.store.create_queue("orders", None, 5, self.now)
+
+    def tearDown(self):
+        pass
+
+    def test_returned_messages_are_copies(self):
+        message_id = str(uuid.uuid4())
+        self.store.publish_message(message_id, "orders", b"hello", 30.0, self.now)
+        claimed = self.store.claim_message("orders", self.now)
+        claimed.version += 1
+        self.store.delete_message(message_id, claimed.version)
+        self.assertEqual(self.store.find_message(message_id).version, 1)
+
+    def test_superseded_heap_entries_are_skipped(self):
+        message_id = str(uuid.uuid4())
+        self.store.publish_message(message_id, "orders", b"hello", 1.0, self.now)
+        claimed = self.store.claim_message("orders", self.now)
+        self.store.requeue_message(claimed.id, claimed.version, self.now)
+        requeued = self.store.claim_message("orders", self.now)
+        self.store.delete_message(requeued.id, requeued.version)
+        later = self.now + datetime.timedelta(seconds=2)
+        with self.assertRaises(core.NoMessagesAvailable):
+            self.store.claim_message("orders", later)
+        self.assertEqual(self.store.heaps["orders"], {})
+
+
+if __name__ == "__main__":
+    unittest.main()
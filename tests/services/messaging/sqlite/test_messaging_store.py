@@ -1,3 +1,4 @@
+import dataclasses
 import datetime
 import pathlib
 import tempfile
@@ -70,6 +71,45 @@ class StoreTest(unittest.TestCase):
                 str(uuid.uuid4()), "nope", b"hello", 30.0, self.now
             )
 
+    def test_publish_messages(self):
+        messages = [
+            core.Message(
+                id=str(uuid.uuid4()),
+                queue="orders",
+                payload=payload,
+                visibility_timeout=30.0,
+                delivery_count=0,
+                visible_at=self.now,
+                created_at=self.now,
+                version=0,
+            )
+            for payload in [b"one", b"two"]
+        ]
+        self.store.publish_messages(messages)
+        for expected in messages:
+            message = self.store.find_message(expected.id)
+            self.assertEqual(message.payload, expected.payload)
+            self.assertEqual(message.version, 0)
+
+    def test_publish_messages_unknown_queue_publishes_nothing(self):
+        messages = [
+            core.Message(
+                id=str(uuid.uuid4()),
+                queue=queue,
+                payload=b"hello",
+                visibility_timeout=30.0,
+                delivery_count=0,
+                visible_at=self.now,
+                created_at=self.now,
+                version=0,
+            )
+            for queue in ["orders", "nope"]
+        ]
+        with self.assertRaises(core.QueueNotFoundError):
+            self.store.publish_messages(messages)
+        with self.assertRaises(core.NoMessagesAvailable):
+            self.store.claim_message("orders", self.now)
+
     def test_claim_message_available(self):
         message_id = str(uuid.uuid4())
         self.store.publish_message(message_id, "orders", b"hello", 30.0, self.now)
@@ -152,6 +192,151 @@ class StoreTest(unittest.TestCase):
             self.store.claim_message("orders", self.now)
         self.assertEqual(claimed_a.id, message_id)
 
+    def test_claim_messages_returns_up_to_max_count_in_fifo_order(self):
+        ids = []
+        for i in range(3):
+            message_id = str(uuid.uuid4())
+            created_at = self.now + datetime.timedelta(seconds=i)
+            self.store.publish_message(message_id, "orders", b"m", 30.0, created_at)
+            ids.append(message_id)
+        later = self.now + datetime.timedelta(seconds=3)
+        claimed = self.store.claim_messages("orders", 2, later)
+        self.assertEqual([m.id for m in claimed], ids[:2])
+        self.assertEqual([m.version for m in claimed], [1, 1])
+        self.assertEqual([m.delivery_count for m in claimed], [1, 1])
+        rest = self.store.claim_messages("orders", 2, later)
+        self.assertEqual([m.id for m in rest], ids[2:])
+
+    def test_claim_messages_empty_returns_empty_list(self):
+        self.assertEqual(self.store.claim_messages("orders", 10, self.now), [])
+
+    def test_claim_messages_skips_invisible(self):
+        visible_id = str(uuid.uuid4())
+        self.store.publish_message(str(uuid.uuid4()), "orders", b"one", 30.0, self.now)
+        self.store.claim_message("orders", self.now)
+        self.store.publish_message(visible_id, "orders", b"two", 30.0, self.now)
+        claimed = self.store.claim_messages("orders", 10, self.now)
+        self.assertEqual([m.id for m in claimed], [visible_id])
+
+    def _publish_priorities(self, priorities: list[int]) -> list[str]:
+        ids = []
+        for i, priority in enumerate(priorities):
+            message_id = str(uuid.uuid4())
+            created_at = self.now + datetime.timedelta(seconds=i)
+            self.store.publish_message(
+                message_id, "orders", b"m", 30.0, created_at, priority=priority
+            )
+            ids.append(message_id)
+        return ids
+
+    def test_claim_message_takes_highest_priority_first(self):
+        low, high = self._publish_priorities([0, 5])
+        later = self.now + datetime.timedelta(seconds=2)
+        claimed = self.store.claim_message("orders", later)
+        self.assertEqual(claimed.id, high)
+        self.assertEqual(claimed.priority, 5)
+        self.assertEqual(self.store.claim_message("orders", later).id, low)
+        self.assertEqual(self.store.find_message(high).priority, 5)
+
+    def test_claim_messages_orders_by_priority_then_fifo(self):
+        ids = self._publish_priorities([0, 1, 0, 1, -1])
+        later = self.now + datetime.timedelta(seconds=5)
+        claimed = self.store.claim_messages("orders", 4, later)
+        self.assertEqual([m.id for m in claimed], [ids[1], ids[3], ids[0], ids[2]])
+        rest = self.store.claim_messages("orders", 4, later)
+        self.assertEqual([m.id for m in rest], [ids[4]])
+
+    def test_claim_skips_priority_without_visible_messages(self):
+        low, high = self._publish_priorities([0, 1])
+        later = self.now + datetime.timedelta(seconds=2)
+        self.store.claim_message("orders", later)
+        self.assertEqual(self.store.claim_message("orders", later).id, low)
+
+    def _publish_groups(self, groups: list[str | None], queue="orders") -> list[str]:
+        ids = []
+        for i, group_id in enumerate(groups):
+            message_id = str(uuid.uuid4())
+            created_at = self.now + datetime.timedelta(seconds=i)
+            self.store.publish_message(
+                message_id, queue, b"m", 30.0, created_at, group_id=group_id
+            )
+            ids.append(message_id)
+        return ids
+
+    def test_group_is_claimed_one_message_at_a_time_in_order(self):
+        ids = self._publish_groups(["a", "a", "b", None, "a"])
+        later = self.now + datetime.timedelta(seconds=5)
+        claimed = self.store.claim_messages("orders", 10, later)
+        self.assertEqual([m.id for m in claimed], [ids[0], ids[2], ids[3]])
+        self.assertEqual(claimed[0].group_id, "a")
+        self.assertEqual(self.store.claim_messages("orders", 10, later), [])
+        self.store.delete_message(claimed[0].id, claimed[0].version)
+        self.assertEqual(self.store.claim_message("orders", later).id, ids[1])
+
+    def test_requeued_group_head_stays_first(self):
+        ids = self._publish_groups(["a", "a"])
+        later = self.now + datetime.timedelta(seconds=2)
+        claimed = self.store.claim_message("orders", later)
+        self.store.requeue_message(claimed.id, claimed.version, later)
+        self.assertEqual(
+            [m.id for m in self.store.claim_messages("orders", 10, later)], ids[:1]
+        )
+
+    def test_group_head_moved_to_dlq_releases_next(self):
+        self.store.create_queue("payments.dlq", None, 5, self.now)
+        self.store.create_queue("payments", "payments.dlq", 1, self.now)
+        ids = self._publish_groups(["a", "a"], queue="payments")
+        later = self.now + datetime.timedelta(seconds=2)
+        claimed = self.store.claim_message("payments", later)
+        self.store.requeue_message(claimed.id, claimed.version, later)
+        self.assertEqual(self.store.claim_message("payments", later).id, ids[1])
+        self.assertEqual(self.store.claim_message("payments.dlq", later).id, ids[0])
+
+    def test_purged_group_head_releases_next(self):
+        ids = self._publish_groups(["a", "a"])
+        created_before = self.now + datetime.timedelta(seconds=1)
+        self.assertEqual(self.store.purge_messages("orders", created_before, 10), 1)
+        later = self.now + datetime.timedelta(seconds=2)
+        self.assertEqual(self.store.claim_message("orders", later).id, ids[1])
+
+    def test_publish_messages_parks_group_behind_earlier_messages(self):
+        messages = [
+            core.Message(
+                id=str(uuid.uuid4()),
+                queue="orders",
+                payload=b"m",
+                visibility_timeout=30.0,
+                delivery_count=0,
+                created_at=self.now,
+                visible_at=self.now,
+                version=0,
+                group_id="a",
+            )
+            for _ in range(2)
+        ]
+        self.store.publish_messages(messages)
+        claimed = self.store.claim_messages("orders", 10, self.now)
+        self.assertEqual([m.id for m in claimed], [messages[0].id])
+
+    def test_get_queue_stats_counts_parked_messages_as_delayed(self):
+        self._publish_groups(["a", "a", "a"])
+        self.assertEqual(
+            self._stats(seconds=3), {"visible": 1, "delayed": 2, "published": 3}
+        )
+
+    def test_get_queue_stats_follows_parked_messages(self):
+        self._publish_groups(["a", "a", "a"])
+        later = self.now + datetime.timedelta(seconds=3)
+        claimed = self.store.claim_message("orders", later)
+        self.store.delete_message(claimed.id, claimed.version)
+        self.assertEqual(self._stats(seconds=3).get("delayed"), 1)
+        self.store.create_queue("orders.dlq", None, 5, self.now)
+        self.store.redrive_messages("orders", "orders.dlq", 10, later)
+        self.assertNotIn("delayed", self._stats(seconds=3))
+        self.assertEqual(self._stats("orders.dlq", seconds=3).get("delayed"), 1)
+        self.store.purge_messages("orders.dlq", None, 10)
+        self.assertNotIn("delayed", self._stats("orders.dlq", seconds=3))
+
     def test_delete_message(self):
         message_id = str(uuid.uuid4())
         self.store.publish_message(message_id, "orders", b"hello", 30.0, self.now)
@@ -171,6 +356,62 @@ class StoreTest(unittest.TestCase):
     def test_delete_message_nonexistent_is_noop(self):
         self.store.delete_message("does-not-exist", 0)
 
+    def test_delete_messages_reports_version_conflicts(self):
+        for _ in range(2):
+            self.store.publish_message(
+                str(uuid.uuid4()), "orders", b"hello", 30.0, self.now
+            )
+        first, second = self.store.claim_messages("orders", 2, self.now)
+        result = self.store.delete_messages(
+            [(first.id, first.version), (second.id, second.version + 999)]
+        )
+        self.assertEqual(result, [True, False])
+        with self.assertRaises(core.MessageNotFoundError):
+            self.store.find_message(first.id)
+        self.assertEqual(self.store.find_message(second.id).version, second.version)
+
+    def test_requeue_messages_below_limit_makes_visible_again(self):
+        message_id = str(uuid.uuid4())
+        self.store.publish_message(message_id, "orders", b"hello", 30.0, self.now)
+        claimed = self.store.claim_message("orders", self.now)
+        result = self.store.requeue_messages([(claimed.id, claimed.version)], self.now)
+        self.assertEqual(result, [True])
+        requeued = self.store.claim_message("orders", self.now)
+        self.assertEqual(requeued.id, message_id)
+        self.assertEqual(requeued.delivery_count, 2)
+
+    def test_requeue_messages_at_limit_routes_to_dlq_or_drops(self):
+        self.store.create_queue("payments-dlq", None, 3, self.now)
+        self.store.create_queue("payments", "payments-dlq", 1, self.now)
+        self.store.create_queue("events", None, 1, self.now)
+        moved_id = str(uuid.uuid4())
+        dropped_id = str(uuid.uuid4())
+        self.store.publish_message(moved_id, "payments", b"pay", 30.0, self.now)
+        self.store.publish_message(dropped_id, "events", b"evt", 30.0, self.now)
+        moved = self.store.claim_message("payments", self.now)
+        dropped = self.store.claim_message("events", self.now)
+        result = self.store.requeue_messages(
+            [(moved.id, moved.version), (dropped.id, dropped.version)], self.now
+        )
+        self.assertEqual(result, [True, True])
+        message = self.store.find_message(moved_id)
+        self.assertEqual(message.queue, "payments-dlq")
+        self.assertEqual(message.delivery_count, 0)
+        with self.assertRaises(core.MessageNotFoundError):
+            self.store.find_message(dropped_id)
+
+    def test_requeue_messages_wrong_version_is_reported(self):
+        self.store.publish_message(
+            str(uuid.uuid4()), "orders", b"hello", 30.0, self.now
+        )
+        claimed = self.store.claim_message("orders", self.now)
+        result = self.store.requeue_messages(
+            [(claimed.id, claimed.version + 999), ("does-not-exist", 0)], self.now
+        )
+        self.assertEqual(result, [False, False])
+        with self.assertRaises(core.NoMessagesAvailable):
+            self.store.claim_message("orders", self.now)
+
     def test_requeue_message_makes_visible_again(self):
         message_id = str(uuid.uuid4())
         self.store.publish_message(message_id, "orders", b"hello", 30.0, self.now)
@@ -188,38 +429,345 @@ class StoreTest(unittest.TestCase):
         with self.assertRaises(core.NoMessagesAvailable):
             self.store.claim_message("orders", self.now)
 
-    def test_move_message_to_dlq_preserves_payload_resets_delivery_count(self):
-        self.store.create_queue("orders-dlq", None, 3, self.now)
+    def test_requeue_message_at_limit_moves_to_dlq(self):
+        self.store.create_queue("payments-dlq", None, 3, self.now)
+        self.store.create_queue("payments", "payments-dlq", 1, self.now)
         message_id = str(uuid.uuid4())
-        self.store.publish_message(message_id, "orders", b"hello", 30.0, self.now)
-        claimed = self.store.claim_message("orders", self.now)
-        self.store.move_message_to_dlq(
-            claimed.id, claimed.version, "orders-dlq", self.now
-        )
+        self.store.publish_message(message_id, "payments", b"pay", 30.0, self.now)
+        claimed = self.store.claim_message("payments", self.now)
+        self.store.requeue_message(claimed.id, claimed.version, self.now)
         message = self.store.find_message(message_id)
-        self.assertEqual(message.queue, "orders-dlq")
-        self.assertEqual(message.payload, b"hello")
+        self.assertEqual(message.queue, "payments-dlq")
+        self.assertEqual(message.payload, b"pay")
         self.assertEqual(message.delivery_count, 0)
         self.assertEqual(message.version, claimed.version + 1)
-        dlq_msg = self.store.claim_message("orders-dlq", self.now)
+        dlq_msg = self.store.claim_message("payments-dlq", self.now)
         self.assertEqual(dlq_msg.id, message_id)
         self.assertEqual(dlq_msg.delivery_count, 1)
 
-    def test_move_message_to_dlq_wrong_version_is_noop(self):
-        self.store.create_queue("orders-dlq", None, 3, self.now)
+    def test_requeue_message_at_limit_without_dlq_drops(self):
+        self.store.create_queue("events", None, 1, self.now)
         message_id = str(uuid.uuid4())
-        self.store.publish_message(message_id, "orders", b"hello", 30.0, self.now)
+        self.store.publish_message(message_id, "events", b"evt", 30.0, self.now)
+        claimed = self.store.claim_message("events", self.now)
+        self.store.requeue_message(claimed.id, claimed.version, self.now)
+        with self.assertRaises(core.MessageNotFoundError):
+            self.store.find_message(message_id)
+
+    def test_requeue_message_at_limit_wrong_version_is_noop(self):
+        self.store.create_queue("payments-dlq", None, 3, self.now)
+        self.store.create_queue("payments", "payments-dlq", 1, self.now)
+        message_id = str(uuid.uuid4())
+        self.store.publish_message(message_id, "payments", b"pay", 30.0, self.now)
+        claimed = self.store.claim_message("payments", self.now)
+        self.store.requeue_message(claimed.id, claimed.version + 999, self.now)
+        message = self.store.find_message(message_id)
+        self.assertEqual(message.queue, "payments")
+        self.assertEqual(message.version, claimed.version)
+
+    def test_change_message_visibility_extends_claim(self):
+        message_id = str(uuid.uuid4())
+        self.store.publish_message(message_id, "orders", b"hello", 1.0, self.now)
         claimed = self.store.claim_message("orders", self.now)
-        self.store.move_message_to_dlq(
-            claimed.id, claimed.version + 999, "orders-dlq", self.now
-        )
+        later = self.now + datetime.timedelta(seconds=60)
+        self.store.change_message_visibility(claimed.id, claimed.version, later)
+        with self.assertRaises(core.NoMessagesAvailable):
+            self.store.claim_message("orders", self.now + datetime.timedelta(seconds=2))
         message = self.store.find_message(message_id)
-        self.assertEqual(message.queue, "orders")
+        self.assertEqual(message.visible_at, later)
+        self.assertEqual(message.version, claimed.version)
+
+    def test_change_message_visibility_wrong_version_is_noop(self):
+        message_id = str(uuid.uuid4())
+        self.store.publish_message(message_id, "orders", b"hello", 1.0, self.now)
+        claimed = self.store.claim_message("orders", self.now)
+        self.store.change_message_visibility(
+            claimed.id,
+            claimed.version + 999,
+            self.now + datetime.timedelta(seconds=60),
+        )
+        reclaimed = self.store.claim_message(
+            "orders", self.now + datetime.timedelta(seconds=2)
+        )
+        self.assertEqual(reclaimed.id, message_id)
 
     def test_find_message_not_found_raises(self):
         with self.assertRaises(core.MessageNotFoundError):
             self.store.find_message("does-not-exist")
 
+    def _stats(self, queue: str = "orders", seconds: float = 0.0) -> dict[str, int]:
+        stats = self.store.get_queue_stats(
+            queue, self.now + datetime.timedelta(seconds=seconds)
+        )
+        return {
+            k: v for k, v in dataclasses.asdict(stats).items() if v and k != "queue"
+        }
+
+    def test_get_queue_stats_of_new_queue(self):
+        stats = self.store.get_queue_stats("orders", self.now)
+        self.assertEqual(
+            stats,
+            core.QueueStats(
+                queue="orders",
+                visible=0,
+                in_flight=0,
+                delayed=0,
+                published=0,
+                acked=0,
+                requeued=0,
+                dead_lettered=0,
+                expired=0,
+            ),
+        )
+
+    def test_get_queue_stats_unknown_queue_raises(self):
+        with self.assertRaises(core.QueueNotFoundError):
+            self.store.get_queue_stats("nope", self.now)
+
+    def test_get_queue_stats_splits_depth_by_state(self):
+        for _ in range(3):
+            self.store.publish_message(
+                str(uuid.uuid4()), "orders", b"hello", 10.0, self.now
+            )
+        self.store.publish_message(
+            str(uuid.uuid4()),
+            "orders",
+            b"later",
+            10.0,
+            self.now,
+            visible_at=self.now + datetime.timedelta(seconds=60),
+        )
+        self.store.claim_message("orders", self.now)
+        self.assertEqual(
+            self._stats(), {"visible": 2, "in_flight": 1, "delayed": 1, "published": 4}
+        )
+        # The claim's visibility timeout lapses before the delay does.
+        self.assertEqual(
+            self._stats(seconds=20), {"visible": 3, "delayed": 1, "published": 4}
+        )
+
+    def test_get_queue_stats_counts_every_priority(self):
+        self._publish_priorities([0, 0, 2, 2])
+        self.store.claim_messages("orders", 3, self.now + datetime.timedelta(seconds=4))
+        self.assertEqual(
+            self._stats(seconds=4), {"visible": 1, "in_flight": 3, "published": 4}
+        )
+
+    def test_get_queue_stats_counts_acks_and_requeues(self):
+        for _ in range(2):
+            self.store.publish_message(
+                str(uuid.uuid4()), "orders", b"hello", 10.0, self.now
+            )
+        first, second = self.store.claim_messages("orders", 2, self.now)
+        self.store.delete_message(first.id, first.version)
+        self.store.delete_message(first.id, first.version)
+        self.store.requeue_message(second.id, second.version, self.now)
+        self.assertEqual(
+            self._stats(),
+            {"visible": 1, "published": 2, "acked": 1, "requeued": 1},
+        )
+
+    def test_get_queue_stats_counts_dead_letters(self):
+        self.store.create_queue("payments.dlq", None, 5, self.now)
+        self.store.create_queue("payments", "payments.dlq", 1, self.now)
+        self.store.create_queue("refunds", None, 1, self.now)
+        for queue in ["payments", "refunds"]:
+            self.store.publish_message(
+                str(uuid.uuid4()), queue, b"hello", 10.0, self.now
+            )
+            claimed = self.store.claim_message(queue, self.now)
+            self.store.requeue_message(claimed.id, claimed.version, self.now)
+        self.assertEqual(self._stats("payments"), {"published": 1, "dead_lettered": 1})
+        self.assertEqual(self._stats("payments.dlq"), {"visible": 1})
+        self.assertEqual(self._stats("refunds"), {"published": 1, "dead_lettered": 1})
+
+    def test_redrive_messages_moves_visible_messages(self):
+        self.store.create_queue("orders.dlq", None, 5, self.now)
+        for _ in range(3):
+            self.store.publish_message(
+                str(uuid.uuid4()), "orders.dlq", b"hello", 10.0, self.now
+            )
+        self.store.claim_message("orders.dlq", self.now)
+        self.assertEqual(
+            self.store.redrive_messages("orders.dlq", "orders", 10, self.now), 2
+        )
+        redriven = self.store.claim_messages("orders", 10, self.now)
+        self.assertEqual(len(redriven), 2)
+        self.assertEqual(redriven[0].delivery_count, 1)
+
+    def test_redrive_messages_respects_max_count(self):
+        self.store.create_queue("orders.dlq", None, 5, self.now)
+        for _ in range(3):
+            self.store.publish_message(
+                str(uuid.uuid4()), "orders.dlq", b"hello", 10.0, self.now
+            )
+        self.assertEqual(
+            self.store.redrive_messages("orders.dlq", "orders", 2, self.now), 2
+        )
+        self.assertEqual(
+            self.store.redrive_messages("orders.dlq", "orders", 2, self.now), 1
+        )
+
+    def test_redrive_messages_keeps_priority(self):
+        self.store.create_queue("orders.dlq", None, 5, self.now)
+        for priority in [0, 3, 0]:
+            self.store.publish_message(
+                str(uuid.uuid4()),
+                "orders.dlq",
+                b"hello",
+                10.0,
+                self.now,
+                priority=priority,
+            )
+        self.assertEqual(
+            self.store.redrive_messages("orders.dlq", "orders", 2, self.now), 2
+        )
+        redriven = self.store.claim_messages("orders", 10, self.now)
+        self.assertEqual([m.priority for m in redriven], [3, 0])
+
+    def test_redrive_messages_moves_whole_groups_in_order(self):
+        self.store.create_queue("orders.dlq", None, 5, self.now)
+        ids = self._publish_groups(["a", "a", "b"], queue="orders.dlq")
+        later = self.now + datetime.timedelta(seconds=3)
+        self.assertEqual(
+            self.store.redrive_messages("orders.dlq", "orders", 10, later), 3
+        )
+        claimed = self.store.claim_messages("orders", 10, later)
+        self.assertEqual([m.id for m in claimed], [ids[0], ids[2]])
+
+    def test_redrive_messages_unknown_target_raises(self):
+        self.store.publish_message(
+            str(uuid.uuid4()), "orders", b"hello", 10.0, self.now
+        )
+        with self.assertRaises(core.QueueNotFoundError):
+            self.store.redrive_messages("orders", "nope", 10, self.now)
+
+    def test_purge_messages_respects_created_before_and_max_count(self):
+        later = self.now + datetime.timedelta(seconds=10)
+        for created_at in [self.now, self.now, self.now, later]:
+            self.store.publish_message(
+                str(uuid.uuid4()), "orders", b"hello", 10.0, created_at
+            )
+        self.assertEqual(self.store.purge_messages("orders", later, 2), 2)
+        self.assertEqual(self.store.purge_messages("orders", later, 2), 1)
+        self.assertEqual(self.store.purge_messages("orders", None, 2), 1)
+        with self.assertRaises(core.NoMessagesAvailable):
+            self.store.claim_message("orders", later)
+
+    def _publish_expiring(self, seconds: list[float | None]) -> list[str]:
+        ids = []
+        for ttl in seconds:
+            message_id = str(uuid.uuid4())
+            expires_at = None
+            if ttl is not None:
+                expires_at = self.now + datetime.timedelta(seconds=ttl)
+            self.store.publish_message(
+                message_id, "orders", b"m", 30.0, self.now, expires_at=expires_at
+            )
+            ids.append(message_id)
+        return ids
+
+    def test_claim_skips_expired_messages(self):
+        ids = self._publish_expiring([1, None, 10])
+        later = self.now + datetime.timedelta(seconds=1)
+        claimed = self.store.claim_messages("orders", 10, later)
+        self.assertEqual([m.id for m in claimed], ids[1:])
+        self.assertEqual(
+            claimed[1].expires_at, self.now + datetime.timedelta(seconds=10)
+        )
+        self.assertIsNone(claimed[0].expires_at)
+
+    def test_delete_expired_messages_deletes_claimed_and_unclaimed(self):
+        ids = self._publish_expiring([1, 2, 3, None])
+        self.store.claim_message("orders", self.now)
+        later = self.now + datetime.timedelta(seconds=2)
+        self.assertEqual(self.store.delete_expired_messages(later, 10), 2)
+        for message_id in ids[:2]:
+            with self.assertRaises(core.MessageNotFoundError):
+                self.store.find_message(message_id)
+        self.assertEqual(self.store.find_message(ids[2]).id, ids[2])
+        self.assertEqual(self._stats(seconds=2)["expired"], 2)
+
+    def test_delete_expired_messages_respects_max_count(self):
+        self._publish_expiring([1, 2, 3])
+        later = self.now + datetime.timedelta(seconds=3)
+        self.assertEqual(self.store.delete_expired_messages(later, 2), 2)
+        self.assertEqual(self.store.delete_expired_messages(later, 2), 1)
+        self.assertEqual(self.store.delete_expired_messages(later, 2), 0)
+
+    def test_deleted_expired_group_head_releases_next(self):
+        message_id = str(uuid.uuid4())
+        self.store.publish_message(
+            message_id,
+            "orders",
+            b"m",
+            30.0,
+            self.now,
+            group_id="a",
+            expires_at=self.now,
+        )
+        ids = self._publish_groups(["a"])
+        self.assertEqual(self.store.claim_messages("orders", 10, self.now), [])
+        self.assertEqual(self.store.delete_expired_messages(self.now, 10), 1)
+        self.assertEqual(self.store.claim_message("orders", self.now).id, ids[0])
+
+
+class OffloadedPayloadStoreTest(StoreTest):
+    """Runs the contract tests with every non-empty payload offloaded."""
+
+    def setUp(self):
+        super().setUp()
+        self.store = messaging_sqlite.Store(self.db, payload_offload_threshold=0)
+
+    def _payload_count(self) -> int:
+        with self.db.transaction(read_only=True) as tx:
+            return tx.query_row("SELECT count(*) FROM payloads")[0]
+
+    def test_offloaded_payload_is_not_stored_inline(self):
+        message_id = str(uuid.uuid4())
+        self.store.publish_message(message_id, "orders", b"hello", 30.0, self.now)
+        with self.db.transaction(read_only=True) as tx:
+            row = tx.query_row(
+                "SELECT payload, payload_id FROM messages WHERE id = :id",
+                {"id": message_id},
+            )
+        self.assertEqual(row[0], b"")
+        self.assertIsNotNone(row[1])
+        self.assertEqual(self.store.claim_message("orders", self.now).payload, b"hello")
+
+    def test_payload_at_threshold_stays_inline(self):
+        self.store.payload_offload_threshold = 5
+        self.store.publish_message(
+            str(uuid.uuid4()), "orders", b"hello", 30.0, self.now
+        )
+        self.assertEqual(self._payload_count(), 0)
+
+    def test_identical_payloads_are_stored_once(self):
+        for _ in range(3):
+            self.store.publish_message(
+                str(uuid.uuid4()), "orders", b"hello", 30.0, self.now
+            )
+        self.assertEqual(self._payload_count(), 1)
+
+    def test_payload_released_with_last_message(self):
+        for _ in range(2):
+            self.store.publish_message(
+                str(uuid.uuid4()), "orders", b"hello", 30.0, self.now
+            )
+        first, second = self.store.claim_messages("orders", 2, self.now)
+        self.store.delete_message(first.id, first.version)
+        self.assertEqual(self._payload_count(), 1)
+        self.store.delete_message(second.id, second.version)
+        self.assertEqual(self._payload_count(), 0)
+
+    def test_payload_released_when_dropped_at_delivery_limit(self):
+        self.store.create_queue("payments", None, 1, self.now)
+        message_id = str(uuid.uuid4())
+        self.store.publish_message(message_id, "payments", b"hello", 30.0, self.now)
+        claimed = self.store.claim_message("payments", self.now)
+        self.store.requeue_message(claimed.id, claimed.version, self.now)
+        self.assertEqual(self._payload_count(), 0)
+
 
 if __name__ == "__main__":
     unittest.main()
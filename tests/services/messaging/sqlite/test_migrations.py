@@ -0,0 +1,80 @@
+import datetime
+import hashlib
+import pathlib
+import tempfile
+import unittest
+
+from schlange.internal import sqlite
+from schlange.services.messaging import sqlite as messaging_sqlite
+
+SCHEMA_V1_MIGRATIONS = messaging_sqlite.MIGRATIONS[:3]
+
+
+class SchemaV2MigrationTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        db_path = pathlib.Path(self.dir.name) / "messaging.db"
+        self.db_ctx = sqlite.Database.open(db_path, read_pool_capacity=1)
+        self.db = self.db_ctx.__enter__()
+        self.db.migrate(migrations=SCHEMA_V1_MIGRATIONS)
+        self.store = messaging_sqlite.Store(self.db)
+
+    def tearDown(self):
+        self.db_ctx.__exit__(None, None, None)
+        self.dir.cleanup()
+
+    def test_migration_keeps_messages_and_their_order(self):
+        created_at = datetime.datetime(2026, 1, 2, 3, 4, 5, 123456, datetime.UTC)
+        epoch = created_at.timestamp()
+        digest = hashlib.sha256(b"large").digest()
+        with self.db.transaction() as tx:
+            tx.execute(
+                "INSERT INTO queues"
+                " (name, dead_letter_queue, max_delivery_count, created_at)"
+                " VALUES ('orders', NULL, 5, :epoch)",
+                {"epoch": epoch},
+            )
+            tx.execute(
+                "INSERT INTO payloads (digest, data) VALUES (:digest, :data)",
+                {"digest": digest, "data": b"large"},
+            )
+            # Inserted out of created_at order and visible at the same
+            # time: claims can only order them by seq.
+            for id, payload, payload_digest, offset in [
+                ("b", b"", digest, 1),
+                ("a", b"small", None, 0),
+            ]:
+                tx.execute(
+                    "INSERT INTO messages"
+                    " (id, queue, payload, payload_digest, visibility_timeout,"
+                    "  delivery_count, visible_at, created_at, version)"
+                    " VALUES (:id, 'orders', :payload, :payload_digest, 30.0,"
+                    "  0, :visible_at, :created_at, 0)",
+                    {
+                        "id": id,
+                        "payload": payload,
+                        "payload_digest": payload_digest,
+                        "visible_at": epoch,
+                        "created_at": epoch + offset,
+                    },
+                )
+
+        self.db.migrate(migrations=messaging_sqlite.MIGRATIONS)
+
+        message = self.store.find_message("a")
+        self.assertEqual(message.created_at, created_at)
+        self.assertEqual(message.visible_at, created_at)
+        self.assertEqual(message.payload, b"small")
+        self.assertEqual(message.priority, 0)
+        self.assertEqual(self.store.find_message("b").payload, b"large")
+        now = created_at + datetime.timedelta(seconds=2)
+        claimed = self.store.claim_messages("orders", 10, now)
+        self.assertEqual([m.id for m in claimed], ["a", "b"])
+        self.store.delete_messages([(m.id, m.version) for m in claimed])
+        with self.db.transaction(read_only=True) as tx:
+            self.assertEqual(tx.query_row("SELECT count(*) FROM payloads")[0], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
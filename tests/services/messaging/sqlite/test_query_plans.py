@@ -0,0 +1,288 @@
+import pathlib
+import tempfile
+import unittest
+
+from schlange.internal import sqlite
+from schlange.services.messaging import sqlite as messaging_sqlite
+from schlange.services.messaging.sqlite import store
+
+MESSAGE_COUNT = 1_000_000
+
+# 1M messages over two queues and two priorities, an eighth of them in
+# 1000 groups with all but the first message of each parked and a tenth
+# expiring; most of "orders" is in flight, so a claim that walked the
+# queue in created_at order would visit them all.
+SQL_POPULATE = """
+    WITH RECURSIVE seq(i) AS (
+        SELECT 0
+        UNION ALL
+        SELECT i + 1 FROM seq WHERE i < :count - 1
+    )
+    INSERT INTO messages
+        (id, queue, payload, visibility_timeout, delivery_count,
+         visible_at, created_at, version, priority, group_id, parked,
+         expires_at)
+    SELECT printf('%032x', i),
+           CASE i % 4 WHEN 0 THEN 'payments' ELSE 'orders' END,
+           x'00',
+           30.0,
+           i % 3,
+           CASE WHEN i < :count * 3 / 5 THEN 2000000000000000 + i
+                ELSE 1000000000000000 + i END,
+           1000000000000000 + i,
+           0,
+           i % 5 = 0,
+           CASE i % 8 WHEN 1 THEN printf('account-%d', i / 8 % 1000) END,
+           i % 8 = 1 AND i >= 8000,
+           CASE i % 10 WHEN 3 THEN 1000000000000000 + i * 1000 END
+    FROM seq
+"""
+
+PARAMS = {
+    "id": "00000000000000000000000000000001",
+    "message_id": "00000000000000000000000000000001",
+    "version": 0,
+    "queue": "orders",
+    "payload": b"",
+    "payload_digest": None,
+    "visibility_timeout": 30.0,
+    "created_at": 1500000000000000,
+    "visible_at": 1500000000000000,
+    "now": 1500000000000000,
+    "max_count": 10,
+    "priority": 0,
+    "group_id": None,
+    "expires_at": None,
+    "target_queue": "orders",
+    "created_before": None,
+}
+
+
+class QueryPlanTest(unittest.TestCase):
+    """
+    Pins the plans of the broker's hot statements against a large,
+    analyzed table, so an index or query change that falls back to a
+    scan or a temp sort fails here rather than under load.
+    """
+
+    db: sqlite.Database
+
+    @classmethod
+    def setUpClass(cls):
+        cls.dir = tempfile.TemporaryDirectory()
+        db_path = pathlib.Path(cls.dir.name) / "messaging.db"
+        cls.db_ctx = sqlite.Database.open(db_path, read_pool_capacity=1)
+        cls.db = cls.db_ctx.__enter__()
+        cls.db.migrate(migrations=messaging_sqlite.MIGRATIONS)
+        with cls.db.transaction(synchronous=False) as tx:
+            tx.execute("""
+                INSERT INTO queues
+                    (name, dead_letter_queue, max_delivery_count, created_at)
+                VALUES
+                    ('orders.dlq', NULL, 5, 0),
+                    ('orders', 'orders.dlq', 5, 0),
+                    ('payments', NULL, 5, 0)
+                """)
+            tx.execute(SQL_POPULATE, {"count": MESSAGE_COUNT})
+            tx.execute("ANALYZE")
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.db_ctx.__exit__(None, None, None)
+        cls.dir.cleanup()
+
+    def _plan(self, sql: str) -> list[str]:
+        with self.db.transaction(read_only=True) as tx:
+            return [row[3] for row in tx.query(f"EXPLAIN QUERY PLAN {sql}", PARAMS)]
+
+    def test_priorities_are_found_with_one_seek_each(self):
+        self.assertEqual(
+            self._plan(store.SQL_FIND_PRIORITIES),
+            [
+                "CO-ROUTINE bands",
+                "SETUP",
+                "SEARCH messages USING COVERING INDEX idx_messages_claim"
+                " (queue=? AND parked=?)",
+                "RECURSIVE STEP",
+                "SCAN bands",
+                "CORRELATED SCALAR SUBQUERY 2",
+                "SEARCH messages USING COVERING INDEX idx_messages_claim"
+                " (queue=? AND parked=? AND priority<?)",
+                "SCAN bands",
+            ],
+        )
+
+    def test_claim_seeks_visible_messages_on_claim_index(self):
+        self.assertEqual(
+            self._plan(store.SQL_CLAIM),
+            [
+                "SEARCH messages USING INTEGER PRIMARY KEY (rowid=?)",
+                "SCALAR SUBQUERY 1",
+                "SEARCH messages USING INDEX idx_messages_claim"
+                " (queue=? AND parked=? AND priority=? AND visible_at<?)",
+                "CORRELATED SCALAR SUBQUERY 2",
+                "SEARCH payloads USING INTEGER PRIMARY KEY (rowid=?)",
+            ],
+        )
+
+    def test_claim_many_seeks_visible_messages_on_claim_index(self):
+        self.assertEqual(
+            self._plan(store.SQL_CLAIM_MANY),
+            [
+                "SEARCH messages USING INTEGER PRIMARY KEY (rowid=?)",
+                "LIST SUBQUERY 1",
+                "SEARCH messages USING INDEX idx_messages_claim"
+                " (queue=? AND parked=? AND priority=? AND visible_at<?)",
+                "CORRELATED SCALAR SUBQUERY 2",
+                "SEARCH payloads USING INTEGER PRIMARY KEY (rowid=?)",
+            ],
+        )
+
+    def test_publish_maintains_only_expected_indexes(self):
+        self.assertEqual(
+            self._plan(store.SQL_PUBLISH),
+            [
+                "SCALAR SUBQUERY 1",
+                "SEARCH payloads USING COVERING INDEX idx_payloads_digest (digest=?)",
+                "SCALAR SUBQUERY 2",
+                "SEARCH messages USING COVERING INDEX idx_messages_group"
+                " (queue=? AND group_id=?)",
+            ],
+        )
+        with self.db.transaction(read_only=True) as tx:
+            indexes = sorted(row[1] for row in tx.query("PRAGMA index_list(messages)"))
+        # idx_messages_payload_id and idx_messages_group are partial:
+        # inline payloads and ungrouped messages skip them.
+        self.assertEqual(
+            indexes,
+            [
+                "idx_messages_claim",
+                "idx_messages_expires_at",
+                "idx_messages_group",
+                "idx_messages_id",
+                "idx_messages_payload_id",
+            ],
+        )
+
+    def test_payload_release_looks_up_by_payload_id(self):
+        with self.db.transaction(read_only=True) as tx:
+            plan = [
+                row[3]
+                for row in tx.query(
+                    "EXPLAIN QUERY PLAN"
+                    " SELECT 1 FROM messages WHERE payload_id = :payload_id",
+                    {"payload_id": 1},
+                )
+            ]
+        self.assertEqual(
+            plan,
+            [
+                "SEARCH messages USING COVERING INDEX idx_messages_payload_id"
+                " (payload_id=?)"
+            ],
+        )
+
+    def test_group_promotion_looks_up_by_group(self):
+        with self.db.transaction(read_only=True) as tx:
+            plan = [
+                row[3]
+                for row in tx.query(
+                    "EXPLAIN QUERY PLAN"
+                    " SELECT min(seq) FROM messages"
+                    " WHERE queue = :queue AND group_id = :group_id",
+                    {"queue": "orders", "group_id": "account-1"},
+                )
+            ]
+        self.assertEqual(
+            plan,
+            [
+                "SEARCH messages USING COVERING INDEX idx_messages_group"
+                " (queue=? AND group_id=?)"
+            ],
+        )
+
+    def test_queue_stats_count_only_messages_not_yet_visible(self):
+        self.assertEqual(
+            self._plan(store.SQL_COUNT_NOT_VISIBLE),
+            [
+                "MATERIALIZE bands",
+                "SETUP",
+                "SEARCH messages USING COVERING INDEX idx_messages_claim"
+                " (queue=? AND parked=?)",
+                "RECURSIVE STEP",
+                "SCAN bands",
+                "CORRELATED SCALAR SUBQUERY 2",
+                "SEARCH messages USING COVERING INDEX idx_messages_claim"
+                " (queue=? AND parked=? AND priority<?)",
+                "SCAN bands",
+                "SEARCH messages USING INDEX idx_messages_claim"
+                " (queue=? AND parked=? AND priority=? AND visible_at>?)",
+            ],
+        )
+
+    def test_redrive_seeks_visible_messages_on_claim_index(self):
+        self.assertEqual(
+            self._plan(store.SQL_REDRIVE),
+            [
+                "SEARCH messages USING INTEGER PRIMARY KEY (rowid=?)",
+                "LIST SUBQUERY 1",
+                "SEARCH messages USING INDEX idx_messages_claim"
+                " (queue=? AND parked=? AND priority=? AND visible_at<?)",
+            ],
+        )
+
+    def test_purge_walks_queue_on_claim_index(self):
+        self.assertEqual(
+            self._plan(store.SQL_PURGE),
+            [
+                "SEARCH messages USING INTEGER PRIMARY KEY (rowid=?)",
+                "LIST SUBQUERY 1",
+                "SEARCH messages USING INDEX idx_messages_claim (queue=?)",
+            ],
+        )
+
+    def test_expiry_sweep_seeks_expired_messages(self):
+        self.assertEqual(
+            self._plan(store.SQL_DELETE_EXPIRED),
+            [
+                "SEARCH messages USING INTEGER PRIMARY KEY (rowid=?)",
+                "LIST SUBQUERY 1",
+                "SEARCH messages USING COVERING INDEX idx_messages_expires_at"
+                " (expires_at<?)",
+            ],
+        )
+
+    def test_ack_looks_up_by_id(self):
+        self.assertEqual(
+            self._plan(store.SQL_DELETE_MESSAGE),
+            ["SEARCH messages USING INDEX idx_messages_id (id=?)"],
+        )
+
+    def test_change_visibility_looks_up_by_id(self):
+        self.assertEqual(
+            self._plan(store.SQL_CHANGE_VISIBILITY),
+            ["SEARCH messages USING INDEX idx_messages_id (id=?)"],
+        )
+
+    def test_drop_at_delivery_limit_looks_up_message_and_queue(self):
+        self.assertEqual(
+            self._plan(store.SQL_DROP_AT_DELIVERY_LIMIT),
+            [
+                "SEARCH messages USING INDEX idx_messages_id (id=?)",
+                "CORRELATED SCALAR SUBQUERY 1",
+                "SEARCH queues USING INDEX sqlite_autoindex_queues_1 (name=?)",
+            ],
+        )
+
+    def test_requeue_or_move_to_dlq_looks_up_message_and_queue(self):
+        self.assertEqual(
+            self._plan(store.SQL_REQUEUE_OR_MOVE_TO_DLQ),
+            [
+                "SEARCH messages USING INDEX idx_messages_id (id=?)",
+                "SEARCH queues USING INDEX sqlite_autoindex_queues_1 (name=?)",
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
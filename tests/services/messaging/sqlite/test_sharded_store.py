@@ -0,0 +1,125 @@
+import contextlib
+import pathlib
+import tempfile
+import unittest
+import uuid
+
+from schlange.internal import sqlite
+from schlange.services.messaging import core
+from schlange.services.messaging import sqlite as messaging_sqlite
+from tests.services.messaging.sqlite import test_messaging_store
+
+
+class ShardedStoreTest(test_messaging_store.StoreTest):
+    """Runs the SQLite store's contract tests against three shards."""
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.stack = contextlib.ExitStack()
+        self.shards = []
+        for i in range(3):
+            db_path = pathlib.Path(self.dir.name) / f"messaging.{i}.db"
+            db = self.stack.enter_context(
+                sqlite.Database.open(db_path, read_pool_capacity=4)
+            )
+            db.migrate(migrations=messaging_sqlite.MIGRATIONS)
+            self.shards.append(messaging_sqlite.Store(db))
+        self.store = messaging_sqlite.ShardedStore(self.shards)
+        self.now = self._now()
+        self.store.create_queue("orders", None, 5, self.now)
+
+    def tearDown(self):
+        self.stack.close()
+        self.dir.cleanup()
+
+    def _shard_of(self, queue: str) -> int:
+        for i, shard in enumerate(self.shards):
+            try:
+                shard.find_queue(queue)
+            except core.QueueNotFoundError:
+                continue
+            return i
+        self.fail(f"queue {queue} not in any shard")
+
+    def test_queues_spread_over_shards(self):
+        for i in range(10):
+            self.store.create_queue(f"kind-{i}", None, 5, self.now)
+        shards = {self._shard_of(f"kind-{i}") for i in range(10)}
+        self.assertGreater(len(shards), 1)
+
+    def test_queue_lives_in_its_dlq_shard(self):
+        for i in range(10):
+            self.store.create_queue(f"kind-{i}.dlq", None, 5, self.now)
+            self.store.create_queue(f"kind-{i}", f"kind-{i}.dlq", 5, self.now)
+            self.assertEqual(
+                self._shard_of(f"kind-{i}"), self._shard_of(f"kind-{i}.dlq")
+            )
+
+    def test_create_queue_duplicate_in_other_shard_raises(self):
+        self.store.create_queue("orders.dlq", None, 5, self.now)
+        self.store.create_queue("payments", "orders.dlq", 5, self.now)
+        fresh = messaging_sqlite.ShardedStore(self.shards)
+        with self.assertRaises(core.QueueAlreadyExistsError):
+            fresh.create_queue("payments", None, 5, self.now)
+
+    def test_redrive_messages_across_shards_raises(self):
+        self.store.create_queue("payments", None, 5, self.now)
+        self.assertNotEqual(self._shard_of("payments"), self._shard_of("orders"))
+        with self.assertRaises(core.Error):
+            self.store.redrive_messages("payments", "orders", 10, self.now)
+
+    def test_publish_messages_across_shards(self):
+        queues = [f"kind-{i}" for i in range(10)]
+        for queue in queues:
+            self.store.create_queue(queue, None, 5, self.now)
+        messages = [
+            core.Message(
+                id=str(uuid.uuid4()),
+                queue=queue,
+                payload=b"hello",
+                visibility_timeout=30.0,
+                delivery_count=0,
+                created_at=self.now,
+                visible_at=self.now,
+                version=0,
+            )
+            for queue in queues
+        ]
+        self.store.publish_messages(messages)
+        for queue in queues:
+            self.assertEqual(self.store.claim_message(queue, self.now).queue, queue)
+
+    def test_settles_messages_claimed_by_another_process(self):
+        self.store.create_queue("payments", None, 5, self.now)
+        ids = [str(uuid.uuid4()), str(uuid.uuid4())]
+        self.store.publish_message(ids[0], "orders", b"a", 30.0, self.now)
+        self.store.publish_message(ids[1], "payments", b"b", 30.0, self.now)
+        claimed = [
+            self.store.claim_message("orders", self.now),
+            self.store.claim_message("payments", self.now),
+        ]
+        fresh = messaging_sqlite.ShardedStore(self.shards)
+        self.assertEqual(
+            fresh.delete_messages([(m.id, m.version) for m in claimed]),
+            [True, True],
+        )
+        for message_id in ids:
+            with self.assertRaises(core.MessageNotFoundError):
+                fresh.find_message(message_id)
+
+    def test_message_cache_is_bounded(self):
+        store = messaging_sqlite.ShardedStore(self.shards, message_cache_size=2)
+        for _ in range(3):
+            store.publish_message(str(uuid.uuid4()), "orders", b"m", 30.0, self.now)
+        claimed = store.claim_messages("orders", 3, self.now)
+        self.assertEqual(list(store.message_shards), [m.id for m in claimed[1:]])
+        # Evicted messages are found by probing the shards.
+        self.assertEqual(
+            store.delete_messages([(m.id, m.version) for m in claimed]),
+            [True, True, True],
+        )
+        self.assertEqual(len(store.message_shards), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,10 @@
+import datetime
 import pathlib
 import tempfile
+import threading
+import time
 import unittest
+from unittest import mock
 
 from schlange.internal import sqlite
 from schlange.services.messaging import core
@@ -27,6 +31,20 @@ class ServiceTest(unittest.TestCase):
         with self.assertRaises(core.QueueAlreadyExistsError):
             self.service.declare_queue("orders", None, 5)
 
+    def test_find_queue_is_cached_after_declare(self):
+        self.service.declare_queue("orders", None, 5)
+        self.service.store = mock.Mock()
+        queue = self.service.find_queue("orders")
+        self.assertEqual(queue.name, "orders")
+        self.assertEqual(queue.max_delivery_count, 5)
+        self.service.store.find_queue.assert_not_called()
+
+    def test_find_queue_loads_and_caches_undeclared_queue(self):
+        now = datetime.datetime.now(datetime.UTC)
+        messaging_sqlite.Store(self.db).create_queue("orders", None, 5, now)
+        self.assertEqual(self.service.find_queue("orders").name, "orders")
+        self.assertIn("orders", self.service.queues)
+
     def test_declare_queue_unknown_dlq_raises(self):
         with self.assertRaises(core.QueueNotFoundError):
             self.service.declare_queue("payments", "nope", 5)
@@ -40,6 +58,46 @@ class ServiceTest(unittest.TestCase):
         with self.assertRaises(core.NoMessagesAvailable):
             self.service.claim_message("orders")
 
+    def test_claim_message_wait_time_expires_without_publish(self):
+        self.service.declare_queue("orders", None, 5)
+        started_at = time.monotonic()
+        with self.assertRaises(core.NoMessagesAvailable):
+            self.service.claim_message("orders", wait_time=0.1)
+        self.assertGreaterEqual(time.monotonic() - started_at, 0.1)
+
+    def test_claim_message_wakes_on_publish(self):
+        self.service.declare_queue("orders", None, 5)
+        publisher = threading.Timer(
+            0.05, self.service.publish_message, args=("orders", b"hello", 30.0)
+        )
+        publisher.start()
+        try:
+            started_at = time.monotonic()
+            claimed = self.service.claim_message("orders", wait_time=10.0)
+            waited = time.monotonic() - started_at
+        finally:
+            publisher.join()
+        self.assertEqual(claimed.payload, b"hello")
+        self.assertLess(waited, 5.0)
+
+    def test_claim_messages_wakes_on_publish_messages(self):
+        self.service.declare_queue("orders", None, 5)
+        publisher = threading.Timer(
+            0.05,
+            self.service.publish_messages,
+            args=([core.NewMessage("orders", b"hello", 30.0)],),
+        )
+        publisher.start()
+        try:
+            claimed = self.service.claim_messages("orders", 10, wait_time=10.0)
+        finally:
+            publisher.join()
+        self.assertEqual([m.payload for m in claimed], [b"hello"])
+
+    def test_claim_messages_wait_time_expires_with_empty_list(self):
+        self.service.declare_queue("orders", None, 5)
+        self.assertEqual(self.service.claim_messages("orders", 10, wait_time=0.05), [])
+
     def test_publish_then_claim_roundtrip(self):
         self.service.declare_queue("orders", None, 5)
         message_id = self.service.publish_message("orders", b"hello", 30.0)
@@ -48,6 +106,68 @@ class ServiceTest(unittest.TestCase):
         self.assertEqual(claimed.payload, b"hello")
         self.assertEqual(claimed.delivery_count, 1)
 
+    def test_publish_messages_then_claim_in_order(self):
+        self.service.declare_queue("orders", None, 5)
+        ids = self.service.publish_messages(
+            [core.NewMessage("orders", bytes([i]), 30.0) for i in range(3)]
+        )
+        self.assertEqual(len(ids), 3)
+        claimed = [self.service.claim_message("orders") for _ in ids]
+        self.assertEqual([m.id for m in claimed], ids)
+        self.assertEqual([m.payload for m in claimed], [b"\x00", b"\x01", b"\x02"])
+
+    def test_publish_messages_empty_returns_empty_list(self):
+        self.assertEqual(self.service.publish_messages([]), [])
+
+    def test_claim_messages_roundtrip(self):
+        self.service.declare_queue("orders", None, 5)
+        ids = [self.service.publish_message("orders", b"hello", 30.0) for _ in range(3)]
+        claimed = self.service.claim_messages("orders", 5)
+        self.assertEqual({m.id for m in claimed}, set(ids))
+        self.assertEqual(self.service.claim_messages("orders", 5), [])
+
+    def test_publish_message_with_delay_is_claimable_after_delay(self):
+        self.service.declare_queue("orders", None, 5)
+        message_id = self.service.publish_message("orders", b"hello", 30.0, delay=0.1)
+        with self.assertRaises(core.NoMessagesAvailable):
+            self.service.claim_message("orders")
+        started_at = time.monotonic()
+        claimed = self.service.claim_message("orders", wait_time=10.0)
+        self.assertEqual(claimed.id, message_id)
+        self.assertLess(time.monotonic() - started_at, 1.0)
+
+    def test_publish_messages_with_delay(self):
+        self.service.declare_queue("orders", None, 5)
+        now_id, delayed_id = self.service.publish_messages(
+            [
+                core.NewMessage("orders", b"now", 30.0),
+                core.NewMessage("orders", b"later", 30.0, delay=3600),
+            ]
+        )
+        self.assertEqual(
+            [m.id for m in self.service.claim_messages("orders", 2)], [now_id]
+        )
+        delayed = self.service.find_message(delayed_id)
+        self.assertGreater(delayed.visible_at, delayed.created_at)
+
+    def test_change_message_visibility_keeps_message_claimable_by_version(self):
+        self.service.declare_queue("orders", None, 5)
+        self.service.publish_message("orders", b"hello", 0.05)
+        claimed = self.service.claim_message("orders")
+        self.service.change_message_visibility(claimed.id, claimed.version, 60.0)
+        time.sleep(0.1)
+        with self.assertRaises(core.NoMessagesAvailable):
+            self.service.claim_message("orders")
+        self.service.ack_message(claimed.id, claimed.version)
+        with self.assertRaises(core.MessageNotFoundError):
+            self.service.find_message(claimed.id)
+
+    def test_claim_messages_zero_max_count_claims_nothing(self):
+        self.service.declare_queue("orders", None, 5)
+        self.service.publish_message("orders", b"hello", 30.0)
+        self.assertEqual(self.service.claim_messages("orders", 0), [])
+        self.assertEqual(len(self.service.claim_messages("orders", 1)), 1)
+
     def test_requeue_message_routes_to_dlq_at_max_delivery_count(self):
         self.service.declare_queue("orders-dlq", None, 3)
         self.service.declare_queue("orders", "orders-dlq", 2)
@@ -67,6 +187,23 @@ class ServiceTest(unittest.TestCase):
         dlq_msg = self.service.claim_message("orders-dlq")
         self.assertEqual(dlq_msg.id, message_id)
 
+    def test_ack_messages_and_requeue_messages_settle_a_batch(self):
+        self.service.declare_queue("orders-dlq", None, 3)
+        self.service.declare_queue("orders", "orders-dlq", 1)
+        for i in range(4):
+            self.service.publish_message("orders", bytes([i]), 30.0)
+        claimed = self.service.claim_messages("orders", 4)
+        acked = self.service.ack_messages([(m.id, m.version) for m in claimed[:2]])
+        self.assertEqual(acked, [True, True])
+        requeued = self.service.requeue_messages(
+            [(m.id, m.version) for m in claimed[2:]]
+        )
+        self.assertEqual(requeued, [True, True])
+        dead = self.service.claim_messages("orders-dlq", 4)
+        self.assertEqual({m.id for m in dead}, {m.id for m in claimed[2:]})
+        self.assertEqual(self.service.ack_messages([]), [])
+        self.assertEqual(self.service.requeue_messages([]), [])
+
     def test_requeue_message_below_max_makes_visible_again(self):
         self.service.declare_queue("orders", None, 5)
         message_id = self.service.publish_message("orders", b"hello", 30.0)
@@ -88,6 +225,89 @@ class ServiceTest(unittest.TestCase):
         with self.assertRaises(core.NoMessagesAvailable):
             self.service.claim_message("orders")
 
+    def _dead_letter(self, count: int) -> None:
+        self.service.declare_queue("orders.dlq", None, 5)
+        self.service.declare_queue("orders", "orders.dlq", 1)
+        for _ in range(count):
+            self.service.publish_message("orders", b"hello", 30.0)
+        for message in self.service.claim_messages("orders", count):
+            self.service.requeue_message(message.id, message.version)
+
+    def test_redrive_messages_moves_dlq_back_in_chunks(self):
+        self._dead_letter(5)
+        self.service.bulk_chunk_size = 2
+        with mock.patch.object(
+            self.service.store,
+            "redrive_messages",
+            wraps=self.service.store.redrive_messages,
+        ) as redrive:
+            self.assertEqual(self.service.redrive_messages("orders.dlq", "orders"), 5)
+        self.assertEqual(redrive.call_count, 3)
+        redriven = self.service.claim_messages("orders", 10)
+        self.assertEqual(len(redriven), 5)
+        self.assertTrue(all(m.delivery_count == 1 for m in redriven))
+        stats = self.service.get_queue_stats("orders.dlq")
+        self.assertEqual((stats.visible, stats.dead_lettered), (0, 0))
+
+    def test_redrive_messages_stops_at_limit(self):
+        self._dead_letter(5)
+        self.service.bulk_chunk_size = 2
+        self.assertEqual(self.service.redrive_messages("orders.dlq", "orders", 3), 3)
+        self.assertEqual(self.service.get_queue_stats("orders.dlq").visible, 2)
+
+    def test_redrive_messages_into_itself_raises(self):
+        self._dead_letter(1)
+        with self.assertRaises(core.InvalidArgumentError):
+            self.service.redrive_messages("orders.dlq", "orders.dlq")
+
+    def test_redrive_messages_stops_at_initial_backlog(self):
+        self._dead_letter(5)
+        self.service.bulk_chunk_size = 2
+        # A source refilled as fast as it drains never runs dry.
+        with mock.patch.object(
+            self.service.store,
+            "redrive_messages",
+            side_effect=lambda queue, target, max_count, now: max_count,
+        ) as redrive:
+            self.assertEqual(self.service.redrive_messages("orders.dlq", "orders"), 5)
+        self.assertEqual(redrive.call_count, 3)
+
+    def test_redrive_messages_unknown_queue_raises(self):
+        self.service.declare_queue("orders", None, 5)
+        with self.assertRaises(core.QueueNotFoundError):
+            self.service.redrive_messages("nope", "orders")
+        with self.assertRaises(core.QueueNotFoundError):
+            self.service.redrive_messages("orders", "nope")
+
+    def test_purge_queue_deletes_in_chunks(self):
+        self.service.declare_queue("orders", None, 5)
+        for _ in range(5):
+            self.service.publish_message("orders", b"hello", 30.0)
+        self.service.claim_message("orders")
+        self.service.bulk_chunk_size = 2
+        self.assertEqual(self.service.purge_queue("orders"), 5)
+        self.assertEqual(self.service.get_queue_stats("orders").visible, 0)
+        self.assertEqual(self.service.get_queue_stats("orders").in_flight, 0)
+
+    def test_purge_queue_keeps_messages_newer_than_older_than(self):
+        self.service.declare_queue("orders", None, 5)
+        self.service.publish_message("orders", b"hello", 30.0)
+        self.assertEqual(self.service.purge_queue("orders", older_than=60), 0)
+        self.assertEqual(self.service.purge_queue("orders", older_than=0), 1)
+
+    def test_delete_expired_messages_deletes_in_chunks(self):
+        self.service.declare_queue("orders", None, 5)
+        expired = datetime.datetime.now(datetime.UTC)
+        for _ in range(5):
+            self.service.publish_message("orders", b"stale", 30.0, expires_at=expired)
+        fresh = self.service.publish_message(
+            "orders", b"fresh", 30.0, expires_at=expired + datetime.timedelta(hours=1)
+        )
+        self.service.bulk_chunk_size = 2
+        self.assertEqual(self.service.delete_expired_messages(), 5)
+        self.assertEqual(self.service.get_queue_stats("orders").expired, 5)
+        self.assertEqual(self.service.claim_message("orders").id, fresh)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,3 +1,4 @@
+import datetime
 import unittest
 from unittest import mock
 
@@ -11,9 +12,19 @@ def _schedule(schedule_id):
     return schedule
 
 
+def _service():
+    service = mock.MagicMock()
+    service.next_ready_at.return_value = _in(0)
+    return service
+
+
+def _in(seconds):
+    return datetime.datetime.now(datetime.UTC) + datetime.timedelta(seconds=seconds)
+
+
 class ScheduleWorkerWorkTest(unittest.TestCase):
     def test_work_noops_when_acquire_fails(self):
-        service = mock.MagicMock()
+        service = _service()
         service.acquire_lease.return_value = False
         service.fireable_schedules.return_value = [_schedule("s1"), _schedule("s2")]
         worker = schedules_background.ScheduleWorker(
@@ -25,7 +36,7 @@ class ScheduleWorkerWorkTest(unittest.TestCase):
         service.fire_schedule.assert_not_called()
 
     def test_work_fires_schedules_when_acquire_succeeds(self):
-        service = mock.MagicMock()
+        service = _service()
         service.acquire_lease.return_value = True
         service.fireable_schedules.return_value = [_schedule("s1"), _schedule("s2")]
         worker = schedules_background.ScheduleWorker(
@@ -37,7 +48,7 @@ class ScheduleWorkerWorkTest(unittest.TestCase):
         self.assertEqual(service.fire_schedule.call_count, 2)
 
     def test_work_continues_after_io_error(self):
-        service = mock.MagicMock()
+        service = _service()
         service.acquire_lease.return_value = True
         service.fireable_schedules.return_value = [_schedule("s1"), _schedule("s2")]
         service.fire_schedule.side_effect = [IOError("boom"), mock.MagicMock()]
@@ -50,7 +61,7 @@ class ScheduleWorkerWorkTest(unittest.TestCase):
         self.assertEqual(service.fire_schedule.call_count, 2)
 
     def test_work_continues_after_domain_error(self):
-        service = mock.MagicMock()
+        service = _service()
         service.acquire_lease.return_value = True
         service.fireable_schedules.return_value = [_schedule("s1"), _schedule("s2")]
         service.fire_schedule.side_effect = [
@@ -66,7 +77,7 @@ class ScheduleWorkerWorkTest(unittest.TestCase):
         self.assertEqual(service.fire_schedule.call_count, 2)
 
     def test_work_acquires_lease_with_correct_key_holder_ttl(self):
-        service = mock.MagicMock()
+        service = _service()
         service.acquire_lease.return_value = False
         service.fireable_schedules.return_value = []
         worker = schedules_background.ScheduleWorker(
@@ -78,5 +89,40 @@ class ScheduleWorkerWorkTest(unittest.TestCase):
         service.acquire_lease.assert_called_once_with("k1", "h1", 7.0)
 
 
+class ScheduleWorkerSleepTest(unittest.TestCase):
+    def setUp(self):
+        self.service = _service()
+        self.service.acquire_lease.return_value = True
+        self.service.fireable_schedules.return_value = []
+        self.worker = schedules_background.ScheduleWorker(
+            schedule_service=self.service, holder="h", key="k", ttl=5.0, interval=10.0
+        )
+
+    def test_work_lists_nothing_before_next_ready_at(self):
+        self.service.next_ready_at.return_value = _in(5)
+        self.worker.work()
+        self.service.fireable_schedules.assert_not_called()
+        self.assertLessEqual(self.worker.sleep_time(), 5.0)
+        self.assertGreater(self.worker.sleep_time(), 4.0)
+
+    def test_work_sleeps_until_next_ready_at_after_firing(self):
+        self.service.next_ready_at.side_effect = [_in(0), _in(2)]
+        self.worker.work()
+        self.service.fireable_schedules.assert_called_once()
+        self.assertLessEqual(self.worker.sleep_time(), 2.0)
+        self.assertGreater(self.worker.sleep_time(), 1.0)
+
+    def test_created_schedule_wakes_worker(self):
+        self.worker.notify_ready(_in(0))
+        self.assertTrue(self.worker.woken.is_set())
+        self.assertEqual(self.worker.sleep_time(), 0.0)
+
+    def test_later_schedule_does_not_wake_worker(self):
+        self.worker.notify_ready(_in(30))
+        self.worker.woken.clear()
+        self.worker.notify_ready(_in(60))
+        self.assertFalse(self.worker.woken.is_set())
+
+
 if __name__ == "__main__":
     unittest.main()
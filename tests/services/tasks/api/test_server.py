@@ -30,6 +30,9 @@ class FakeMessageQueue:
     def publish(self, request: tasks_core.TaskExecutionRequest) -> None:
         self.published.append(request)
 
+    def publish_many(self, requests: List[tasks_core.TaskExecutionRequest]) -> None:
+        self.published.extend(requests)
+
 
 class TaskServerTest(unittest.TestCase):
 
@@ -77,7 +80,15 @@ class TaskServerTest(unittest.TestCase):
         self.assertIsInstance(task.id, str)
         self.assertEqual(
             {f.name for f in dataclasses.fields(task)},
-            {"id", "kind", "args", "state", "visibility_timeout"},
+            {
+                "id",
+                "kind",
+                "args",
+                "state",
+                "visibility_timeout",
+                "priority",
+                "group_id",
+            },
         )
 
     def test_create_task_with_duplicate_id_raises_already_exists(self):
@@ -93,6 +104,27 @@ class TaskServerTest(unittest.TestCase):
         with self.assertRaises(tasks_api.AlreadyExistsError):
             self.server.create_task(request)
 
+    def test_create_tasks_reports_existing_ids_per_item(self):
+        request = tasks_api.CreateTaskRequest(
+            kind="test_kind",
+            args={},
+            delay=0,
+            retry_policy=_retry_policy(),
+            visibility_timeout=30.0,
+        )
+        self.server.create_task(dataclasses.replace(request, id="taken"))
+        response = self.server.create_tasks(
+            tasks_api.CreateTasksRequest(
+                requests=[
+                    dataclasses.replace(request, id="taken"),
+                    dataclasses.replace(request, id="new"),
+                ]
+            )
+        )
+        self.assertIsNone(response.tasks[0])
+        self.assertIsInstance(response.tasks[1], tasks_api.Task)
+        self.assertEqual(response.tasks[1].id, "new")
+
     def test_get_task(self):
         created = self.server.create_task(
             tasks_api.CreateTaskRequest(
@@ -259,6 +291,73 @@ class TaskServerTest(unittest.TestCase):
                 )
             )
 
+    def test_end_execution_not_committed_yet_raises_conflict(self):
+        created = self.server.create_task(
+            tasks_api.CreateTaskRequest(
+                kind="test_kind",
+                args={},
+                delay=0,
+                retry_policy=_retry_policy(),
+                visibility_timeout=30.0,
+            )
+        )
+        # The next execution's message can arrive before its commit.
+        with self.assertRaises(tasks_api.ConflictError):
+            self.server.end_execution(
+                tasks_api.EndExecutionRequest(
+                    task_id=created.task.id,
+                    seq_num=0,
+                    error=None,
+                )
+            )
+
+    def test_get_execution_returns_args_and_whether_it_ended(self):
+        created = self.server.create_task(
+            tasks_api.CreateTaskRequest(
+                kind="test_kind",
+                args={"key": "value"},
+                delay=0,
+                retry_policy=_retry_policy(),
+                visibility_timeout=30.0,
+            )
+        )
+        seq_num = self._dispatch_and_get_seq_num(created.task.id)
+        request = tasks_api.GetExecutionRequest(
+            task_id=created.task.id, seq_num=seq_num
+        )
+        response = self.server.get_execution(request)
+        self.assertEqual(response.args, {"key": "value"})
+        self.assertFalse(response.ended)
+        self.server.end_execution(
+            tasks_api.EndExecutionRequest(
+                task_id=created.task.id,
+                seq_num=seq_num,
+                error=None,
+            )
+        )
+        self.assertTrue(self.server.get_execution(request).ended)
+
+    def test_get_execution_not_committed_yet_raises_conflict(self):
+        created = self.server.create_task(
+            tasks_api.CreateTaskRequest(
+                kind="test_kind",
+                args={},
+                delay=0,
+                retry_policy=_retry_policy(),
+                visibility_timeout=30.0,
+            )
+        )
+        with self.assertRaises(tasks_api.ConflictError):
+            self.server.get_execution(
+                tasks_api.GetExecutionRequest(task_id=created.task.id, seq_num=0)
+            )
+
+    def test_get_execution_unknown_task_raises_not_found(self):
+        with self.assertRaises(tasks_api.NotFoundError):
+            self.server.get_execution(
+                tasks_api.GetExecutionRequest(task_id="missing", seq_num=0)
+            )
+
     def test_list_tasks_with_spec_filters(self):
         delayed = self.server.create_task(
             tasks_api.CreateTaskRequest(
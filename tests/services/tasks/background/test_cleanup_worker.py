@@ -0,0 +1,41 @@
+import unittest
+from unittest import mock
+
+from schlange.services.tasks import background as tasks_background
+
+
+class CleanupWorkerTest(unittest.TestCase):
+    def _worker(self, service):
+        return tasks_background.CleanupWorker(
+            interval=60.0,
+            task_service=service,
+            cleanup_policy=mock.sentinel.policy,
+            chunk_size=2,
+        )
+
+    def test_deletes_chunks_until_one_is_short(self):
+        service = mock.MagicMock()
+        service.delete_deletable_tasks.side_effect = [2, 2, 1]
+        self._worker(service).work()
+        self.assertEqual(
+            service.delete_deletable_tasks.call_args_list,
+            [mock.call(mock.sentinel.policy, 2)] * 3,
+        )
+
+    def test_stops_between_chunks_when_cancelled(self):
+        service = mock.MagicMock()
+        service.delete_deletable_tasks.return_value = 2
+        worker = self._worker(service)
+        worker.cancel()
+        worker.work()
+        service.delete_deletable_tasks.assert_called_once()
+
+    def test_stops_after_io_error(self):
+        service = mock.MagicMock()
+        service.delete_deletable_tasks.side_effect = IOError("boom")
+        self._worker(service).work()
+        service.delete_deletable_tasks.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
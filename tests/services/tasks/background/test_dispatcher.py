@@ -1,3 +1,4 @@
+import datetime
 import unittest
 from unittest import mock
 
@@ -24,59 +25,200 @@ def _task(task_id):
     )
 
 
+def _in(seconds):
+    return datetime.datetime.now(datetime.UTC) + datetime.timedelta(seconds=seconds)
+
+
 class DispatcherWorkTest(unittest.TestCase):
+    def _dispatcher(self, service, **overrides):
+        kwargs = dict(holder="h", key="k", ttl=5.0, interval=1.0, lookahead=0.0)
+        kwargs.update(overrides)
+        if not isinstance(service.next_ready_at.return_value, datetime.datetime):
+            # A task is due unless the test says otherwise.
+            service.next_ready_at.return_value = _in(0)
+        return tasks_background.Dispatcher(service=service, **kwargs)
+
     def test_work_noops_when_acquire_fails(self):
         service = mock.MagicMock()
         service.acquire_lease.return_value = False
         service.executable_tasks.return_value = [_task("t1"), _task("t2")]
-        dispatcher = tasks_background.Dispatcher(
-            service=service, holder="h", key="k", ttl=5.0, interval=1.0
-        )
-        dispatcher.work()
-        service.begin_execution.assert_not_called()
+        self._dispatcher(service).work()
+        service.begin_executions.assert_not_called()
 
     def test_work_dispatches_tasks_when_acquire_succeeds(self):
         service = mock.MagicMock()
         service.acquire_lease.return_value = True
-        service.executable_tasks.return_value = [_task("t1"), _task("t2")]
-        dispatcher = tasks_background.Dispatcher(
-            service=service, holder="h", key="k", ttl=5.0, interval=1.0
-        )
-        dispatcher.work()
-        self.assertEqual(service.begin_execution.call_count, 2)
+        tasks = [_task("t1"), _task("t2")]
+        service.executable_tasks.return_value = tasks
+        self._dispatcher(service).work()
+        service.begin_executions.assert_called_once_with(tasks, 0.0)
 
-    def test_work_continues_after_io_error(self):
+    def test_work_dispatches_in_batches(self):
         service = mock.MagicMock()
         service.acquire_lease.return_value = True
-        service.executable_tasks.return_value = [_task("t1"), _task("t2")]
-        service.begin_execution.side_effect = [IOError("boom"), None]
-        dispatcher = tasks_background.Dispatcher(
-            service=service, holder="h", key="k", ttl=5.0, interval=1.0
+        tasks = [_task(f"t{i}") for i in range(5)]
+        service.executable_tasks.side_effect = [tasks[0:2], tasks[2:4], tasks[4:5]]
+        service.begin_executions.side_effect = lambda batch, lookahead: batch
+        self._dispatcher(service, batch_size=2).work()
+        self.assertEqual(
+            service.executable_tasks.call_args_list, [mock.call(0.0, 2)] * 3
+        )
+        self.assertEqual(
+            [c.args[0] for c in service.begin_executions.call_args_list],
+            [tasks[0:2], tasks[2:4], tasks[4:5]],
         )
-        dispatcher.work()
-        self.assertEqual(service.begin_execution.call_count, 2)
 
-    def test_work_continues_after_domain_error(self):
+    def test_work_renews_lease_between_batches(self):
         service = mock.MagicMock()
         service.acquire_lease.return_value = True
-        service.executable_tasks.return_value = [_task("t1"), _task("t2")]
-        service.begin_execution.side_effect = [tasks_core.TaskNotActiveError(), None]
-        dispatcher = tasks_background.Dispatcher(
-            service=service, holder="h", key="k", ttl=5.0, interval=1.0
-        )
-        dispatcher.work()
-        self.assertEqual(service.begin_execution.call_count, 2)
+        service.executable_tasks.side_effect = [[_task("t1")], [_task("t2")], []]
+        service.begin_executions.side_effect = lambda batch, lookahead: batch
+        self._dispatcher(service, batch_size=1).work()
+        self.assertEqual(service.acquire_lease.call_count, 3)
+
+    def test_work_stops_when_lease_is_lost_between_batches(self):
+        service = mock.MagicMock()
+        service.acquire_lease.side_effect = [True, False]
+        service.executable_tasks.return_value = [_task("t1")]
+        service.begin_executions.side_effect = lambda batch, lookahead: batch
+        self._dispatcher(service, batch_size=1).work()
+        service.begin_executions.assert_called_once()
+
+    def test_work_stops_after_io_error(self):
+        service = mock.MagicMock()
+        service.acquire_lease.return_value = True
+        service.executable_tasks.return_value = [_task("t1")]
+        service.begin_executions.side_effect = IOError("boom")
+        self._dispatcher(service, batch_size=1).work()
+        service.begin_executions.assert_called_once()
+
+    def test_work_stops_when_a_full_batch_dispatches_nothing(self):
+        service = mock.MagicMock()
+        service.acquire_lease.return_value = True
+        service.executable_tasks.return_value = [_task("t1")]
+        service.begin_executions.return_value = []
+        self._dispatcher(service, batch_size=1).work()
+        service.begin_executions.assert_called_once()
 
     def test_work_acquires_lease_with_correct_key_holder_ttl(self):
         service = mock.MagicMock()
         service.acquire_lease.return_value = False
         service.executable_tasks.return_value = []
-        dispatcher = tasks_background.Dispatcher(
-            service=service, holder="h1", key="k1", ttl=7.0, interval=1.0
-        )
-        dispatcher.work()
+        self._dispatcher(service, holder="h1", key="k1", ttl=7.0).work()
         service.acquire_lease.assert_called_once_with("k1", "h1", 7.0)
 
+    def test_work_dispatches_with_lookahead(self):
+        service = mock.MagicMock()
+        service.acquire_lease.return_value = True
+        tasks = [_task("t1")]
+        service.executable_tasks.return_value = tasks
+        self._dispatcher(service, lookahead=2.0).work()
+        service.executable_tasks.assert_called_once_with(2.0, 100)
+        service.begin_executions.assert_called_once_with(tasks, 2.0)
+
+
+class DispatcherSleepTest(unittest.TestCase):
+    def setUp(self):
+        self.service = mock.MagicMock()
+        self.service.acquire_lease.return_value = True
+        self.service.executable_tasks.return_value = []
+        self.dispatcher = tasks_background.Dispatcher(
+            service=self.service,
+            holder="h",
+            key="k",
+            ttl=5.0,
+            interval=10.0,
+            lookahead=0.0,
+        )
+
+    def test_work_lists_nothing_without_ready_tasks(self):
+        self.service.next_ready_at.return_value = None
+        self.dispatcher.work()
+        self.service.executable_tasks.assert_not_called()
+        self.assertEqual(self.dispatcher.sleep_time(), 10.0)
+
+    def test_work_sleeps_until_next_ready_at_without_listing(self):
+        self.service.next_ready_at.return_value = _in(5)
+        self.dispatcher.work()
+        self.service.executable_tasks.assert_not_called()
+        self.assertLessEqual(self.dispatcher.sleep_time(), 5.0)
+        self.assertGreater(self.dispatcher.sleep_time(), 4.0)
+
+    def test_idle_ticks_do_not_accumulate_deadlines(self):
+        ready_at = _in(86400)
+        self.service.next_ready_at.return_value = ready_at
+        for _ in range(100):
+            self.dispatcher.work()
+        self.assertEqual(self.dispatcher.deadlines.deadline, ready_at)
+
+    def test_work_sleeps_until_next_ready_at_after_dispatching(self):
+        self.service.next_ready_at.side_effect = [_in(0), _in(2)]
+        self.dispatcher.work()
+        self.service.executable_tasks.assert_called_once()
+        self.assertLessEqual(self.dispatcher.sleep_time(), 2.0)
+        self.assertGreater(self.dispatcher.sleep_time(), 1.0)
+
+    def test_work_waits_interval_for_tasks_left_due(self):
+        self.service.next_ready_at.side_effect = [_in(0), _in(0)]
+        self.dispatcher.work()
+        self.assertEqual(self.dispatcher.sleep_time(), 10.0)
+
+    def test_work_forgets_ready_tasks_without_lease(self):
+        self.service.acquire_lease.return_value = False
+        self.dispatcher.notify_ready(_in(0))
+        self.dispatcher.work()
+        self.service.next_ready_at.assert_not_called()
+        self.assertEqual(self.dispatcher.sleep_time(), 10.0)
+
+
+class DispatcherReadyTest(unittest.TestCase):
+    def setUp(self):
+        self.dispatcher = tasks_background.Dispatcher(
+            service=mock.MagicMock(),
+            holder="h",
+            key="k",
+            ttl=5.0,
+            interval=1.0,
+            lookahead=0.5,
+        )
+        self.dispatcher.service.next_ready_at.return_value = None
+
+    def test_sleeps_interval_without_known_ready_tasks(self):
+        self.assertEqual(self.dispatcher.sleep_time(), 1.0)
+
+    def test_ready_task_wakes_dispatcher(self):
+        self.dispatcher.notify_ready(_in(0))
+        self.assertTrue(self.dispatcher.woken.is_set())
+        self.assertEqual(self.dispatcher.sleep_time(), 0.0)
+
+    def test_later_ready_task_does_not_wake_dispatcher(self):
+        self.dispatcher.notify_ready(_in(30))
+        self.dispatcher.woken.clear()
+        self.dispatcher.notify_ready(_in(60))
+        self.assertFalse(self.dispatcher.woken.is_set())
+        self.dispatcher.notify_ready(_in(10))
+        self.assertTrue(self.dispatcher.woken.is_set())
+
+    def test_sleeps_until_earliest_ready_task_minus_lookahead(self):
+        self.dispatcher.notify_ready(_in(0.9))
+        self.dispatcher.notify_ready(_in(60))
+        self.assertLessEqual(self.dispatcher.sleep_time(), 0.4)
+        self.assertGreater(self.dispatcher.sleep_time(), 0.3)
+
+    def test_work_forgets_ready_tasks_it_dispatches(self):
+        self.dispatcher.service.acquire_lease.return_value = True
+        self.dispatcher.service.executable_tasks.return_value = []
+        self.dispatcher.notify_ready(_in(0.1))
+        self.dispatcher.work()
+        self.assertEqual(self.dispatcher.sleep_time(), 1.0)
+
+    def test_work_keeps_ready_tasks_beyond_lookahead(self):
+        self.dispatcher.service.acquire_lease.return_value = True
+        self.dispatcher.service.executable_tasks.return_value = []
+        self.dispatcher.notify_ready(_in(0.9))
+        self.dispatcher.work()
+        self.assertLess(self.dispatcher.sleep_time(), 1.0)
+
 
 if __name__ == "__main__":
     unittest.main()
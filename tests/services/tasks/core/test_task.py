@@ -140,6 +140,22 @@ class TaskEndExecutionTest(unittest.TestCase):
         with self.assertRaises(core.TaskExecutionNotFoundError):
             task.end_execution(seq_num=999, now=_now(), error=None)
 
+    def test_end_execution_of_next_seq_num_raises_not_begun_yet(self):
+        task = _create_task()
+        task.begin_execution(now=_now())
+        with self.assertRaises(core.TaskExecutionNotBegunYetError):
+            task.end_execution(seq_num=1, now=_now(), error=None)
+
+    def test_end_execution_counts_unloaded_executions_as_attempts(self):
+        task = _create_task(retry_policy=_immediate_retry_policy())
+        task.execution_offset = 2
+        task.begin_execution(now=_now())
+        self.assertEqual(task.last_execution.seq_num, 2)
+        task.end_execution(seq_num=1, now=_now(), error=None)
+        self.assertEqual(task.state, core.TaskState.ACTIVE)
+        task.end_execution(seq_num=2, now=_now(), error="boom")
+        self.assertEqual(task.state, core.TaskState.FAILED)
+
 
 class TaskGetExecutionTest(unittest.TestCase):
 
@@ -156,5 +172,30 @@ class TaskGetExecutionTest(unittest.TestCase):
             task.get_execution(0)
 
 
+class TaskExecutionEndedTest(unittest.TestCase):
+
+    def test_execution_ended_reports_in_progress_and_ended(self):
+        task = _create_task()
+        task.begin_execution(now=_now())
+        self.assertFalse(task.execution_ended(0))
+        task.end_execution(seq_num=0, now=_now(), error=None)
+        self.assertTrue(task.execution_ended(0))
+
+    def test_execution_ended_counts_unloaded_executions_as_ended(self):
+        task = _create_task()
+        task.execution_offset = 2
+        self.assertTrue(task.execution_ended(1))
+
+    def test_execution_ended_of_next_seq_num_raises_not_begun_yet(self):
+        task = _create_task()
+        with self.assertRaises(core.TaskExecutionNotBegunYetError):
+            task.execution_ended(0)
+
+    def test_execution_ended_unknown_seq_num_raises(self):
+        task = _create_task()
+        with self.assertRaises(core.TaskExecutionNotFoundError):
+            task.execution_ended(999)
+
+
 if __name__ == "__main__":
     unittest.main()
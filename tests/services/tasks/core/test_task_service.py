@@ -1,3 +1,4 @@
+import dataclasses
 import pathlib
 import tempfile
 import unittest
@@ -35,6 +36,9 @@ class FakeMessageQueue:
     def publish(self, request: tasks_core.TaskExecutionRequest) -> None:
         self.published.append(request)
 
+    def publish_many(self, requests: List[tasks_core.TaskExecutionRequest]) -> None:
+        self.published.extend(requests)
+
 
 class FakeLeaseService:
 
@@ -87,6 +91,41 @@ class TaskServiceDispatchTest(unittest.TestCase):
         self.assertIn(ready.id, ids)
         self.assertNotIn(delayed.id, ids)
 
+    def test_executable_tasks_includes_tasks_ready_within_lookahead(self):
+        soon = self._create_task(kind="soon", delay=5)
+        later = self._create_task(kind="later", delay=3600)
+        ids = {t.id for t in self.task_service.executable_tasks(lookahead=10)}
+        self.assertIn(soon.id, ids)
+        self.assertNotIn(later.id, ids)
+
+    def test_executable_tasks_orders_by_priority_then_ready_at(self):
+        first = self._create_task(kind="bulk")
+        urgent = self._create_task(kind="urgent", priority=10)
+        second = self._create_task(kind="bulk")
+        result = self.task_service.executable_tasks()
+        self.assertEqual([t.id for t in result], [urgent.id, first.id, second.id])
+
+    def test_executable_tasks_lists_up_to_limit(self):
+        first = self._create_task(kind="bulk")
+        urgent = self._create_task(kind="urgent", priority=10)
+        self._create_task(kind="bulk")
+        result = self.task_service.executable_tasks(limit=2)
+        self.assertEqual([t.id for t in result], [urgent.id, first.id])
+
+    def test_begin_execution_within_lookahead_publishes_delayed(self):
+        task = self._create_task(kind="test_kind", delay=5)
+        self.task_service.begin_execution(task.id, lookahead=10)
+        request = self.message_queue.published[0]
+        self.assertGreater(request.delay, 4)
+        self.assertLessEqual(request.delay, 5)
+        loaded = self.task_service.task(task.id)
+        self.assertEqual(loaded.last_execution.begun_at, task.ready_at)
+
+    def test_begin_execution_beyond_lookahead_raises(self):
+        task = self._create_task(kind="test_kind", delay=3600)
+        with self.assertRaises(tasks_core.TaskNotReadyError):
+            self.task_service.begin_execution(task.id, lookahead=10)
+
     def test_executable_tasks_excludes_tasks_with_outstanding_execution(self):
         task = self._create_task(kind="ready", delay=0)
         self.task_service.begin_execution(task.id)
@@ -123,8 +162,20 @@ class TaskServiceDispatchTest(unittest.TestCase):
         self.assertEqual(request.kind, "test_kind")
         self.assertEqual(request.task_id, task.id)
         self.assertEqual(request.seq_num, 0)
-        self.assertEqual(request.args, {"a": 1})
         self.assertEqual(request.visibility_timeout, task.visibility_timeout)
+        self.assertEqual(request.priority, 0)
+
+    def test_begin_execution_publishes_task_group(self):
+        task = self._create_task(kind="test_kind", group_id="account-1")
+        self.task_service.begin_execution(task.id)
+        self.assertEqual(self.message_queue.published[0].group_id, "account-1")
+        self.assertEqual(self.task_service.task(task.id).group_id, "account-1")
+
+    def test_begin_execution_publishes_task_priority(self):
+        task = self._create_task(kind="test_kind", priority=7)
+        self.task_service.begin_execution(task.id)
+        self.assertEqual(self.message_queue.published[0].priority, 7)
+        self.assertEqual(self.task_service.task(task.id).priority, 7)
 
     def test_begin_execution_uses_seq_num_per_task(self):
         task = self._create_task(
@@ -157,6 +208,111 @@ class TaskServiceDispatchTest(unittest.TestCase):
         with self.assertRaises(tasks_core.TaskNotActiveError):
             self.task_service.begin_execution(task.id)
 
+    def test_begin_executions_publishes_and_saves_batch(self):
+        first = self._create_task(kind="test_kind", args={"a": 1})
+        second = self._create_task(kind="test_kind", args={"a": 2})
+        dispatched = self.task_service.begin_executions(
+            self.task_service.executable_tasks()
+        )
+        self.assertEqual({t.id for t in dispatched}, {first.id, second.id})
+        self.assertEqual(
+            {(r.task_id, r.seq_num) for r in self.message_queue.published},
+            {(first.id, 0), (second.id, 0)},
+        )
+        for task in [first, second]:
+            self.assertFalse(self.task_service.task(task.id).last_execution.ended)
+        self.assertEqual(self.task_service.executable_tasks(), [])
+
+    def test_begin_executions_does_not_commit_tasks_updated_since_listing(self):
+        stale = self._create_task(kind="test_kind")
+        fresh = self._create_task(kind="test_kind")
+        tasks = self.task_service.executable_tasks()
+        self.task_service.begin_execution(stale.id)
+        dispatched = self.task_service.begin_executions(tasks)
+        self.assertEqual([t.id for t in dispatched], [fresh.id])
+        self.assertEqual(
+            self.task_service.task(stale.id).execution_count,
+            1,
+        )
+        # Published before the commit found the task changed.
+        self.assertEqual(
+            [r.task_id for r in self.message_queue.published].count(stale.id), 2
+        )
+
+    def test_begin_executions_skips_tasks_not_ready(self):
+        task = self._create_task(kind="test_kind", delay=3600)
+        loaded = self.task_service.task(task.id)
+        self.assertEqual(self.task_service.begin_executions([loaded]), [])
+        self.assertEqual(self.message_queue.published, [])
+
+    def test_ready_listeners_hear_created_and_retried_tasks(self):
+        ready = []
+        self.task_service.subscribe_ready(ready.append)
+        task = self._create_task(kind="test_kind")
+        self.task_service.begin_execution(task.id)
+        retried = self.task_service.end_execution(task.id, 0, error="boom")
+        self.assertEqual(ready, [task.ready_at, retried.ready_at])
+        self.task_service.begin_execution(task.id, lookahead=60)
+        self.task_service.end_execution(task.id, 1, error=None)
+        self.assertEqual(len(ready), 2)
+
+    def test_create_tasks_reports_existing_ids_and_creates_the_rest(self):
+        self._create_task(id="taken")
+        new_task = tasks_core.NewTask(
+            args={"key": "value"},
+            kind="test_kind",
+            delay=0,
+            visibility_timeout=30.0,
+            retry_policy=_retry_policy(),
+        )
+        created = self.task_service.create_tasks(
+            [
+                dataclasses.replace(new_task, id="a"),
+                dataclasses.replace(new_task, id="taken"),
+                dataclasses.replace(new_task, priority=5),
+            ]
+        )
+        self.assertEqual(created[0].id, "a")
+        self.assertIsNone(created[1])
+        self.assertEqual(self.task_service.task(created[2].id).priority, 5)
+        self.assertEqual(len(self.task_service.executable_tasks()), 3)
+
+    def test_create_tasks_notifies_earliest_ready_at(self):
+        ready = []
+        self.task_service.subscribe_ready(ready.append)
+        new_task = tasks_core.NewTask(
+            args={},
+            kind="test_kind",
+            delay=60,
+            visibility_timeout=30.0,
+            retry_policy=_retry_policy(),
+        )
+        created = self.task_service.create_tasks(
+            [new_task, dataclasses.replace(new_task, delay=1)]
+        )
+        self.assertEqual(ready, [created[1].ready_at])
+
+    def test_delete_deletable_tasks_deletes_failed_first_up_to_limit(self):
+        policy = tasks_core.CleanupPolicy(
+            delete_succeeded_after=-60, delete_failed_after=-60
+        )
+        for i, errors in enumerate([["boom", "boom"], [None], ["boom", "boom"]]):
+            task = self._create_task(
+                id=f"t{i}",
+                retry_policy=tasks_core.RetryPolicy(
+                    initial_delay=0, backoff_factor=2, max_delay=None, max_attempts=2
+                ),
+            )
+            for seq_num, error in enumerate(errors):
+                self.task_service.begin_execution(task.id)
+                self.task_service.end_execution(task.id, seq_num, error=error)
+        self._create_task(id="active")
+
+        self.assertEqual(self.task_service.delete_deletable_tasks(policy, 2), 2)
+        remaining = self.task_service.list_tasks(tasks_core.TaskSpecification())
+        self.assertEqual({t.id for t in remaining}, {"t1", "active"})
+        self.assertEqual(self.task_service.delete_deletable_tasks(policy, 2), 1)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -125,5 +125,223 @@ class TaskRepositoryExecutionInProgressTest(unittest.TestCase):
         self.assertNotIn(ended.id, ids)
 
 
+class TaskRepositoryCreateTasksTest(TaskRepositoryExecutionInProgressTest):
+
+    def _task(self, task_id):
+        return tasks_core.Task.create(
+            now=_now(),
+            id=task_id,
+            kind="test_kind",
+            args={},
+            delay=0,
+            retry_policy=_retry_policy(),
+            visibility_timeout=30.0,
+            schedule_id=None,
+        )
+
+    def test_create_tasks_skips_taken_ids(self):
+        self._create_task("taken")
+        created = self.repository.create_tasks(
+            [self._task("a"), self._task("taken"), self._task("b"), self._task("a")]
+        )
+        self.assertEqual(created, [True, False, True, False])
+        ids = {t.id for t in self.repository.list_tasks(tasks_core.TaskSpecification())}
+        self.assertEqual(ids, {"a", "b", "taken"})
+
+    def test_create_task_raises_on_taken_id(self):
+        self._create_task("taken")
+        with self.assertRaises(tasks_core.TaskAlreadyExistsError):
+            self.repository.create_task(self._task("taken"))
+
+
+class TaskRepositoryDeleteTasksWhereTest(TaskRepositoryExecutionInProgressTest):
+
+    def _succeed(self, task_id):
+        task = self._begin_and_save(self._create_task(task_id).id)
+        self._end_and_save(task_id, task.last_execution.seq_num, error=None)
+
+    def _spec(self):
+        import datetime
+
+        return tasks_core.TaskSpecification(
+            state=tasks_core.TaskState.SUCCEEDED,
+            last_execution_ended_before=_now() + datetime.timedelta(seconds=1),
+        )
+
+    def _ids(self):
+        return {
+            t.id for t in self.repository.list_tasks(tasks_core.TaskSpecification())
+        }
+
+    def test_deletes_matching_tasks_up_to_limit(self):
+        for task_id in ["a", "b", "c"]:
+            self._succeed(task_id)
+        self._create_task("active")
+        self.assertEqual(self.repository.delete_tasks_where(self._spec(), 2), 2)
+        self.assertEqual(len(self._ids()), 2)
+        self.assertEqual(self.repository.delete_tasks_where(self._spec(), 2), 1)
+        self.assertEqual(self._ids(), {"active"})
+
+    def test_deletes_executions(self):
+        self._succeed("a")
+        self.repository.delete_tasks_where(self._spec(), 10)
+        with self.db.transaction(read_only=True) as tx:
+            self.assertEqual(tx.query_row("SELECT count(*) FROM task_executions")[0], 0)
+
+    def test_seeks_terminal_tasks_by_end_time(self):
+        params = {"state": "SUCCEEDED", "last_execution_ended_before": 0.0}
+        where = " AND ".join(
+            tasks_sqlite.task_repository.SQL_SPEC_TERMS[k] for k in params
+        )
+        with self.db.transaction(read_only=True) as tx:
+            plan = [
+                row[3]
+                for row in tx.query(
+                    "EXPLAIN QUERY PLAN "
+                    + tasks_sqlite.task_repository.SQL_DELETE_TASKS_WHERE.format(
+                        where=where
+                    ),
+                    {**params, "limit": 10},
+                )
+            ]
+        self.assertIn(
+            "SEARCH tasks USING INDEX"
+            " idx_last_execution_ended_at_where_succeeded_or_failed"
+            " (last_execution_ended_at<?)",
+            plan,
+        )
+
+
+class TaskRepositoryExecutionsTest(TaskRepositoryExecutionInProgressTest):
+
+    def _fail_twice(self, task_id):
+        self._create_task(task_id)
+        for seq_num in range(2):
+            task = self.repository.get_task(task_id)
+            # The retry is a second away; begin it ahead of time.
+            task.begin_execution(now=_now(), lookahead=60)
+            self.repository.update_task(task, synchronous=False)
+            self._end_and_save(task_id, seq_num)
+
+    def _execution_rows(self, task_id):
+        with self.db.transaction(read_only=True) as tx:
+            return tx.query_row(
+                "SELECT count(*) FROM task_executions WHERE task_id = :id",
+                {"id": task_id},
+            )[0]
+
+    def test_get_task_loads_last_execution_only(self):
+        self._fail_twice("task")
+        task = self.repository.get_task("task")
+        self.assertEqual([e.seq_num for e in task.executions], [1])
+        self.assertEqual(task.execution_count, 2)
+        self.assertEqual(task.last_execution.error, "boom")
+
+    def test_get_task_loads_all_executions_when_asked(self):
+        self._fail_twice("task")
+        task = self.repository.get_task("task", all_executions=True)
+        self.assertEqual([e.seq_num for e in task.executions], [0, 1])
+        self.assertTrue(all(e.ended for e in task.executions))
+        self.assertEqual(task.execution_offset, 0)
+
+    def test_list_tasks_loads_all_executions_when_asked(self):
+        self._fail_twice("task")
+        self._create_task("fresh")
+        tasks = self.repository.list_tasks(
+            tasks_core.TaskSpecification(), all_executions=True
+        )
+        executions = {t.id: [e.seq_num for e in t.executions] for t in tasks}
+        self.assertEqual(executions, {"task": [0, 1], "fresh": []})
+
+    def test_reactivate_deletes_executions(self):
+        self._create_task("task")
+        self._begin_and_save("task")
+        self._end_and_save("task", 0)
+        task = self.repository.get_task("task")
+        task.state = tasks_core.TaskState.FAILED
+        task.reactivate(now=_now(), delay=0)
+        self.repository.update_task(task, synchronous=True)
+        self.assertEqual(self._execution_rows("task"), 0)
+        self.assertEqual(self._begin_and_save("task").last_execution.seq_num, 0)
+
+    def test_delete_task_deletes_executions(self):
+        self._fail_twice("task")
+        self.repository.delete_task("task")
+        self.assertEqual(self._execution_rows("task"), 0)
+
+
+class TaskRepositoryExecutableTasksTest(TaskRepositoryExecutionInProgressTest):
+
+    def test_lists_ready_pending_tasks_up_to_limit(self):
+        self._create_task("a")
+        self._create_task("b")
+        self._create_task("c")
+        self._begin_and_save(self._create_task("begun").id)
+        self._create_task("delayed", delay=3600)
+        tasks = self.repository.list_executable_tasks(ready_as_of=_now(), limit=2)
+        self.assertEqual([t.id for t in tasks], ["a", "b"])
+        tasks = self.repository.list_executable_tasks(ready_as_of=_now())
+        self.assertEqual([t.id for t in tasks], ["a", "b", "c"])
+
+
+class TaskRepositoryNextReadyAtTest(TaskRepositoryExecutionInProgressTest):
+
+    def test_next_ready_at_is_none_without_tasks(self):
+        self.assertIsNone(self.repository.next_ready_at())
+
+    def test_next_ready_at_skips_tasks_in_progress_and_ended(self):
+        self._begin_and_save(self._create_task("begun").id)
+        ended = self._begin_and_save(self._create_task("ended").id)
+        self._end_and_save(ended.id, ended.last_execution.seq_num, error=None)
+        later = self._create_task("later", delay=60)
+        self._create_task("latest", delay=120)
+        self.assertEqual(self.repository.next_ready_at(), later.ready_at)
+
+    def test_next_ready_at_seeks_pending_index(self):
+        with self.db.transaction(read_only=True) as tx:
+            plan = [
+                row[3]
+                for row in tx.query(
+                    "EXPLAIN QUERY PLAN "
+                    + tasks_sqlite.task_repository.SQL_GET_NEXT_READY_AT
+                )
+            ]
+        self.assertEqual(plan, ["SEARCH tasks USING INDEX idx_ready_at_where_pending"])
+
+
+class ExecutionsMigrationTest(unittest.TestCase):
+
+    def test_migration_moves_executions_out_of_tasks(self):
+        with tempfile.TemporaryDirectory() as dir:
+            db_path = pathlib.Path(dir) / "tasks.db"
+            with sqlite.Database.open(db_path, read_pool_capacity=1) as db:
+                db.migrate(migrations=tasks_sqlite.MIGRATIONS[:3])
+                with db.transaction() as tx:
+                    tx.execute(
+                        "INSERT INTO tasks (id, version, created_at, args, state,"
+                        " ready_at, retry_policy, executions, execution_in_progress,"
+                        " kind, visibility_timeout)"
+                        " VALUES ('task', 1, 0, '{}', 'ACTIVE', 0, :retry_policy,"
+                        " :executions, 1, 'test_kind', 30.0)",
+                        {
+                            "retry_policy": '{"initial_delay": 1,'
+                            ' "backoff_factor": 2, "max_attempts": 3}',
+                            "executions": '[{"seq_num": 0, "begun_at": 1.0,'
+                            ' "ended_at": 2.5, "error": "boom"},'
+                            ' {"seq_num": 1, "begun_at": 3.0,'
+                            ' "ended_at": null, "error": null}]',
+                        },
+                    )
+                db.migrate(migrations=tasks_sqlite.MIGRATIONS)
+                repository = tasks_sqlite.TaskRepository(db)
+                task = repository.get_task("task", all_executions=True)
+        self.assertEqual(
+            [(e.seq_num, e.begun_at.timestamp(), e.error) for e in task.executions],
+            [(0, 1.0, "boom"), (1, 3.0, None)],
+        )
+        self.assertEqual(task.executions[0].ended_at.timestamp(), 2.5)
+        self.assertFalse(task.last_execution.ended)
+
+
 if __name__ == "__main__":
     unittest.main()
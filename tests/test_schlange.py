@@ -1,7 +1,11 @@
+import pathlib
+import tempfile
 import unittest
 from unittest import mock
 
-from schlange.schlange import Schlange
+from schlange.schlange import MessagingBackend, Schlange, open_messaging_store
+from schlange.services.messaging import memory as messaging_memory
+from schlange.services.messaging import sqlite as messaging_sqlite
 
 
 def _make_schlange(**overrides):
@@ -11,6 +15,8 @@ def _make_schlange(**overrides):
         "dispatcher": mock.Mock(),
         "schedule_worker": mock.Mock(),
         "leases_reaper": mock.Mock(),
+        "messaging_reaper": mock.Mock(),
+        "change_notifiers": [mock.Mock()],
     }
     workers.update(overrides)
     s = Schlange(
@@ -26,6 +32,8 @@ def _make_schlange(**overrides):
         workers["dispatcher"],
         workers["schedule_worker"],
         workers["leases_reaper"],
+        workers["messaging_reaper"],
+        *workers["change_notifiers"],
     ]
     return s, individual
 
@@ -66,5 +74,51 @@ class SchlangeStopTest(unittest.TestCase):
         self.assertEqual(set(ctx.exception.exceptions), {first, second})
 
 
+class OpenMessagingStoreTest(unittest.TestCase):
+
+    def test_memory_backend_touches_no_files(self):
+        with tempfile.TemporaryDirectory() as dir:
+            path = pathlib.Path(dir) / "messaging.db"
+            with open_messaging_store(MessagingBackend.MEMORY, path, 1, 1) as store:
+                self.assertIsInstance(store, messaging_memory.Store)
+            self.assertFalse(path.exists())
+
+    def test_sqlite_backend_migrates_database(self):
+        with tempfile.TemporaryDirectory() as dir:
+            path = pathlib.Path(dir) / "messaging.db"
+            with open_messaging_store(MessagingBackend.SQLITE, path, 1, 1) as store:
+                self.assertIsInstance(store, messaging_sqlite.Store)
+            self.assertTrue(path.exists())
+
+    def test_sqlite_backend_opens_one_file_per_shard(self):
+        with tempfile.TemporaryDirectory() as dir:
+            path = pathlib.Path(dir) / "messaging.db"
+            with open_messaging_store(
+                MessagingBackend.SQLITE, path, 1, 1, shards=3
+            ) as store:
+                self.assertIsInstance(store, messaging_sqlite.ShardedStore)
+            self.assertEqual(
+                sorted(p.name for p in pathlib.Path(dir).glob("*.db")),
+                ["messaging.0.db", "messaging.1.db", "messaging.2.db"],
+            )
+
+
+class SchlangeNewTest(unittest.TestCase):
+
+    def test_consumer_interval_is_a_deprecated_alias_of_consumer_wait_time(self):
+        with tempfile.TemporaryDirectory() as dir:
+            path = pathlib.Path(dir)
+            with self.assertWarns(DeprecationWarning):
+                with Schlange.new(
+                    handlers={"test_kind": mock.Mock()},
+                    task_database_path=path / "tasks.db",
+                    schedule_database_path=path / "schedules.db",
+                    lease_database_path=path / "leases.db",
+                    messaging_backend=MessagingBackend.MEMORY,
+                    consumer_interval=0.25,
+                ) as s:
+                    self.assertEqual(s.consumers[0].wait_time, 0.25)
+
+
 if __name__ == "__main__":
     unittest.main()